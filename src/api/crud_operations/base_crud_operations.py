@@ -1,16 +1,24 @@
 from dataclasses import dataclass
+from datetime import datetime as dt, timedelta as td
 from typing import Any, NoReturn
 
+from celery import Task
 from fastapi import status
 from pydantic import BaseModel as BaseSchema
-from sqlalchemy import func, and_, asc
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, any_, event, func, and_, asc, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Query, Session, load_only, raiseload, selectinload, undefer
+from sqlalchemy.sql.elements import ColumnElement
 
+from src.config import get_settings
 from src.db.db_sqlalchemy import BaseModel
 from src.api.models.user import UserModel
 from src.utils.exceptions import JSONException
+from src.utils.response_cache.main import invalidate_cached_responses
 from src.utils.response_generation.main import get_text
 
+settings = get_settings()
+
 
 @dataclass
 class ModelOperation:
@@ -19,13 +27,21 @@ class ModelOperation:
     patch_schema: type(BaseSchema)
     db: Session
     user: UserModel | None = None
+    fields: tuple[str, ...] | None = None  # sparse fieldset, all columns are loaded if None
+    autocommit: bool = True  # False if the changes are committed by the caller, e.g. in the batch
+    bulk_operations: bool = False  # True if '_make_query_by_params' finds the objects of the bulk operations
 
     def get_max_id(self) -> int:
         """
         Gets the max object id for this model in the db.
         :return: max id as int.
         """
-        query, = self.db.query(self.model).with_entities(func.max(self.model.id)).first()
+        # Deleted objects keep their ids.
+        query, = (self.db
+                  .query(self.model)
+                  .with_entities(func.max(self.model.id))
+                  .execution_options(include_deleted=True)
+                  .first())
 
         if not query:
             query = 0
@@ -44,6 +60,7 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .filter(self.model.user_id == self.user.id)
                     .order_by(asc(self.model.id))
                     .all()
@@ -52,6 +69,7 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .order_by(asc(self.model.id))
                     .all()
                     )
@@ -68,6 +86,7 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .filter(and_(
                                  self.model.id == id_,
                                  self.model.user_id == self.user.id
@@ -79,10 +98,31 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .filter(self.model.id == id_)
                     .first()
                     )
 
+    def find_by_ids(self, ids: list[int]) -> list[BaseModel]:
+        """
+        Finds the objects by the given ids with one query.
+        But before that it checks the user's access.
+        If it's not superuser, it only looks for data associated with the user id.
+        :param ids: object ids.
+        :return: objects list ordered by id or an empty list if no objects were found.
+        """
+        # One array parameter instead of 'IN (...)', so the query is the same for any number of ids.
+        query = (self
+                 .db
+                 .query(self.model)
+                 .options(*self._get_load_options())
+                 .filter(self.model.id == any_(literal(ids, ARRAY(Integer))))
+                 )
+        if not self.check_user_access() and self._check_if_model_has_user_id():
+            query = query.filter(self.model.user_id == self.user.id)
+
+        return query.order_by(asc(self.model.id)).all()
+
     def find_by_id_or_404(self, id_: int) -> BaseModel:
         """
         Finds the object by the given id,
@@ -100,6 +140,34 @@ class ModelOperation:
         else:
             return found_obj
 
+    def find_changes(self, since: tuple[dt, int] | None, limit: int) -> list[BaseModel]:
+        """
+        Finds the objects changed or deleted after the given position in the ('updated_at', 'id') order.
+        But before that it checks the user's access.
+        If it's not superuser, it only looks for data associated with the user id.
+        :param since: change time and id of the last object the client has, or None to get all objects.
+        :param limit: max number of objects.
+        :return: objects list or an empty list if nothing has changed.
+        """
+        # 'updated_at' is the transaction start time, so the latest changes are returned
+        # after the lag, when the transactions that could have an earlier time are committed.
+        changed_before = func.now() - td(seconds=settings.CHANGES_SAFETY_LAG)
+        query = (self
+                 .db
+                 .query(self.model)
+                 .options(*self._get_load_options(),
+                          undefer(self.model.updated_at),
+                          undefer(self.model.deleted_at))
+                 .execution_options(include_deleted=True)
+                 .filter(self.model.updated_at <= changed_before)
+                 )
+        if since is not None:
+            query = query.filter(tuple_(self.model.updated_at, self.model.id) > tuple_(*since))
+        if not self.check_user_access() and self._check_if_model_has_user_id():
+            query = query.filter(self.model.user_id == self.user.id)
+
+        return query.order_by(asc(self.model.updated_at), asc(self.model.id)).limit(limit).all()
+
     def find_by_param(self, param_name: str, param_value: Any) -> BaseModel | None:
         """
         Finds the object by the given parameter.
@@ -114,6 +182,7 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .filter(and_(
                                  getattr(self.model, param_name) == param_value,
                                  self.model.user_id == self.user.id
@@ -125,6 +194,7 @@ class ModelOperation:
             return (self
                     .db
                     .query(self.model)
+                    .options(*self._get_load_options())
                     .filter(getattr(self.model, param_name) == param_value)
                     .first()
                     )
@@ -167,7 +237,7 @@ class ModelOperation:
         updated_obj: BaseModel = old_obj
 
         # Save new object data into db.
-        self.db.commit()
+        self._commit()
         self.db.refresh(updated_obj)
 
         return updated_obj
@@ -175,6 +245,7 @@ class ModelOperation:
     def delete_obj(self, id_: int) -> NoReturn:
         """
         Deletes object from db by the given id object.
+        The object is only marked as deleted, so clients can get it as deleted by the delta sync.
         If the user does not have access rights, then the error is raised.
         :param id_: object id.
         """
@@ -182,9 +253,9 @@ class ModelOperation:
         # This is where user access is checked.
         model_to_delete = self.find_by_id_or_404(id_)
 
-        # Delete object from db.
-        self.db.delete(model_to_delete)
-        self.db.commit()
+        # Mark object as deleted, it is excluded from all queries.
+        model_to_delete.deleted_at = func.now()
+        self._commit()
 
     def add_obj(self, new_data: BaseSchema) -> BaseModel:
         """
@@ -200,11 +271,50 @@ class ModelOperation:
 
         # Save new object into db.
         self.db.add(new_obj)
-        self.db.commit()
+        self._commit()
         self.db.refresh(new_obj)
 
         return new_obj
 
+    def count_objs(self, ids: list[int] | None, params: dict) -> int:
+        """
+        Counts the objects that 'update_objs' or 'delete_objs' would change (dry run).
+        :param ids: object ids or None.
+        :param params: search parameters like in 'find_all_by_params'.
+        :return: number of objects.
+        """
+        return (self
+                .db
+                .query(func.count(self.model.id))
+                .filter(self._make_bulk_condition(ids, params))
+                .execution_options(include_deleted=True)
+                .scalar()
+                )
+
+    def update_objs(self, ids: list[int] | None, params: dict, new_data: BaseSchema) -> list[int]:
+        """
+        Updates all found objects with the same new data by one 'UPDATE ... RETURNING id' statement,
+        objects are not loaded into the session.
+        If the user does not have access rights, then the objects are not found.
+        :param ids: object ids or None.
+        :param params: search parameters like in 'find_all_by_params'.
+        :param new_data: new data to update.
+        :return: ids of the updated objects.
+        """
+        return self._update_by_condition(self._make_bulk_condition(ids, params),
+                                         self._prepare_data_for_bulk_update_operation(new_data))
+
+    def delete_objs(self, ids: list[int] | None, params: dict) -> list[int]:
+        """
+        Deletes all found objects by one statement like 'delete_obj' does,
+        so they are only marked as deleted.
+        If the user does not have access rights, then the objects are not found.
+        :param ids: object ids or None.
+        :param params: search parameters like in 'find_all_by_params'.
+        :return: ids of the deleted objects.
+        """
+        return self._update_by_condition(self._make_bulk_condition(ids, params), {'deleted_at': func.now()})
+
     def check_user_access(self) -> bool:
         """
         Checks user role.
@@ -220,6 +330,104 @@ class ModelOperation:
                     return True
         return True
 
+    def _get_load_options(self) -> list:
+        """
+        Gets query options for the sparse fieldset:
+        only the requested columns are loaded, other columns are deferred.
+        Requested relationships are loaded for all found objects by one more query,
+        other relationships are never loaded (an error is raised if they are accessed).
+        :return: list of query options or an empty list if all data is needed.
+        """
+        if self.fields is None:
+            return []
+
+        columns: list = [getattr(self.model, name) for name in self.fields
+                         if name in self.model.__table__.columns]
+        # The primary key is always loaded.
+        options: list = [load_only(*columns or [self.model.id])]
+        for relationship_name in self.model.__mapper__.relationships.keys():
+            relationship = getattr(self.model, relationship_name)
+            options.append(selectinload(relationship) if relationship_name in self.fields
+                           else raiseload(relationship))
+        return options
+
+    def _make_bulk_condition(self, ids: list[int] | None, params: dict) -> ColumnElement:
+        """
+        Makes the WHERE condition of the bulk operations from the ids and the search parameters,
+        the condition of 'find_all_by_params' is reused, so the user access is checked the same way.
+        If neither ids nor parameters are given, then raises the error, so all objects are never changed by mistake.
+        :param ids: object ids or None.
+        :param params: search parameters like in 'find_all_by_params'.
+        :return: condition for the model table.
+        """
+        if not self.bulk_operations:
+            raise JSONException(
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+                message=get_text('err_bulk_not_supported').format(self.model_name)
+            )
+        if ids is None and all(value is None for value in params.values()):
+            raise JSONException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=get_text('err_bulk_no_condition')
+            )
+        query: Query = self._make_query_by_params(**params)
+        if ids is not None:
+            query = query.filter(self.model.id == any_(literal(ids, ARRAY(Integer))))
+        # Deleted objects are excluded from the ORM queries only, so the condition excludes them explicitly.
+        condition: ColumnElement = self.model.deleted_at.is_(None)
+        return and_(condition, query.whereclause) if query.whereclause is not None else condition
+
+    def _update_by_condition(self, condition: ColumnElement, values: dict) -> list[int]:
+        """
+        Updates the model table rows by one statement and commits the changes.
+        'updated_at' is set by the column 'onupdate'.
+        :return: ids of the updated rows.
+        """
+        updated_ids: list[int] = (self
+                                  .db
+                                  .execute(update(self.model.__table__)
+                                           .where(condition)
+                                           .values(**values)
+                                           .returning(self.model.id))
+                                  .scalars()
+                                  .all()
+                                  )
+        self._commit()
+        return sorted(updated_ids)
+
+    def _commit(self) -> NoReturn:
+        """
+        Commits the changes and invalidates cached responses of this model.
+        If 'autocommit' is off, the changes are only flushed,
+        so they are visible in the transaction and can be rolled back by the caller.
+        Then the caller commits and invalidates cached responses itself.
+        """
+        if not self.autocommit:
+            self.db.flush()
+            return
+        self.db.commit()
+        self._invalidate_cached_responses()
+
+    def _send_task_after_commit(self, task: Task, **kwargs) -> NoReturn:
+        """
+        Sends the celery task when the changes are committed, so the task sees them.
+        If 'autocommit' is off, then the task is sent after the commit of the caller
+        and is not sent if the changes are rolled back.
+        :param task: celery task.
+        :param kwargs: task arguments.
+        """
+        if self.autocommit:
+            task.delay(**kwargs)
+        else:
+            event.listen(self.db, 'after_commit', lambda session: task.delay(**kwargs), once=True)
+
+    def _invalidate_cached_responses(self) -> NoReturn:
+        """
+        Invalidates cached GET responses that contain data of this model.
+        Must be called after each commit of the changed data.
+        """
+        invalidate_cached_responses(self.model.__tablename__)
+
     def _prepare_data_for_update_operation(self,
                                            old_obj: BaseModel,
                                            new_data: BaseSchema
@@ -244,6 +452,20 @@ class ModelOperation:
             )
         return updated_data
 
+    def _prepare_data_for_bulk_update_operation(self, new_data: BaseSchema) -> dict:
+        """
+        Gets the changed values for the bulk update.
+        :param new_data: object update data.
+        :return: values by column name.
+        """
+        values: dict = new_data.dict(exclude_unset=True)  # remove fields where value is None
+        if not values:
+            raise JSONException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=get_text('err_patch_no_data')
+            )
+        return values
+
     def _check_param_name_in_model(self, param_name) -> NoReturn:
         """
         If the model does not have a given parameter name, then raises the error.
@@ -0,0 +1,116 @@
+from typing import Callable
+
+from fastapi import status
+from pydantic import BaseModel as BaseSchema, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.api.models.user import UserModel
+from src.api.schemes.batch.base_schemes import BatchOperationSchema
+from src.api.schemes.order.base_schemes import OrderPatchSchema, OrderPostSchema
+from src.api.schemes.schedule.base_schemes import SchedulePatchSchema, SchedulePostSchema
+from src.api.schemes.table.base_schemes import TablePatchSchema, TablePostSchema
+from src.api.schemes.user.base_schemes import UserPatchSchema, UserPostSchema
+from src.api.crud_operations.base_crud_operations import ModelOperation
+from src.api.crud_operations.order import OrderOperation
+from src.api.crud_operations.schedule import ScheduleOperation
+from src.api.crud_operations.table import TableOperation
+from src.api.crud_operations.user import UserOperation
+from src.api.crud_operations.utils.other import make_error_result
+from src.utils.exceptions import JSONException
+from src.utils.response_generation.main import get_text
+
+# Resource: (operation factory, post schema, patch schema).
+RESOURCE_OPERATIONS: dict[str, tuple[Callable[[Session, UserModel], ModelOperation],
+                                     type[BaseSchema],
+                                     type[BaseSchema]]] = {
+    'orders': (lambda db, user: OrderOperation(db=db, user=user), OrderPostSchema, OrderPatchSchema),
+    'tables': (lambda db, user: TableOperation(db=db, user=user), TablePostSchema, TablePatchSchema),
+    'schedules': (lambda db, user: ScheduleOperation(db=db, user=user),
+                  SchedulePostSchema,
+                  SchedulePatchSchema),
+    'users': (lambda db, user: UserOperation(db=db), UserPostSchema, UserPatchSchema)
+}
+# The same roles as the resource endpoints require.
+RESOURCE_ROLES: dict[str, tuple[str, ...]] = {
+    'orders': ('client', 'admin', 'superuser'),
+    'tables': ('admin', 'superuser'),
+    'schedules': ('admin', 'superuser'),
+    'users': ('superuser',)
+}
+
+
+class BatchOperation:
+    def __init__(self, db: Session, user: UserModel):
+        self.db = db
+        self.user = user
+
+    def execute(self, operations: list[BatchOperationSchema], atomic: bool) -> tuple[list[dict], bool]:
+        """
+        Executes the operations in one db transaction in the given order.
+        The model operations only flush their changes, the transaction is committed once at the end.
+        If 'atomic', then the first failed operation rolls back the whole transaction
+        and the next operations are not executed.
+        Else each operation is executed in its own savepoint,
+        so only the changes of the failed operations are rolled back.
+        :param operations: operations to execute.
+        :param atomic: all operations or nothing.
+        :return: result of each executed operation and True if the changes are committed.
+        """
+        results: list[dict] = []
+        # Cached responses are invalidated once for each changed model after the commit.
+        executed_operations: dict[type, ModelOperation] = {}
+
+        for operation in operations:
+            try:
+                if atomic:
+                    result, model_operation = self._execute_operation(operation)
+                else:
+                    with self.db.begin_nested():
+                        result, model_operation = self._execute_operation(operation)
+            except (JSONException, ValidationError, IntegrityError) as err:
+                results.append(make_error_result(err, operation.id))
+                if atomic:
+                    self.db.rollback()
+                    return results, False
+                continue
+
+            results.append(result)
+            executed_operations[type(model_operation)] = model_operation
+
+        self.db.commit()
+        for model_operation in executed_operations.values():
+            model_operation._invalidate_cached_responses()
+        return results, True
+
+    def _execute_operation(self, operation: BatchOperationSchema) -> tuple[dict, ModelOperation]:
+        """
+        Checks the user's role and executes the operation by the model operation of the resource.
+        :return: operation result and the model operation.
+        """
+        if self.user.role not in RESOURCE_ROLES[operation.resource]:
+            raise JSONException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                message=get_text('forbidden_request')
+            )
+
+        make_model_operation, post_schema, patch_schema = RESOURCE_OPERATIONS[operation.resource]
+        model_operation: ModelOperation = make_model_operation(self.db, self.user)
+        model_operation.autocommit = False
+
+        match operation.method:
+            case 'POST':
+                new_obj = model_operation.add_obj(post_schema(**operation.data))
+                status_code, id_, message_key = status.HTTP_201_CREATED, new_obj.id, 'post'
+            case 'PATCH':
+                model_operation.update_obj(operation.id, patch_schema(**operation.data))
+                status_code, id_, message_key = status.HTTP_200_OK, operation.id, 'patch'
+            case _:
+                model_operation.delete_obj(operation.id)
+                status_code, id_, message_key = status.HTTP_200_OK, operation.id, 'delete'
+
+        return {
+            'status_code': status_code,
+            'id': id_,
+            'message': get_text(message_key).format(model_operation.model_name, id_)
+        }, model_operation
@@ -1,22 +1,59 @@
-from datetime import date, datetime as dt
+from collections import defaultdict
+from datetime import date, datetime as dt, time
+from itertools import islice
+from typing import Iterator, NoReturn
 
 from fastapi import status
-from sqlalchemy import and_, asc, or_
+from pydantic import ValidationError
+from sqlalchemy import Table, and_, asc, func, insert, or_, select, text, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, aliased
+from sqlalchemy.orm.util import AliasedClass
+from sqlalchemy.sql.elements import Label
+from sqlalchemy.sql.selectable import ScalarSelect, Subquery
 
-from src.api.models.order import OrderModel
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import ORDERS_ID_SEQUENCE, OrderModel
 from src.api.models.table import TableModel
 from src.api.models.relationships import orders_tables
 from src.api.schemes.order.base_schemes import (OrderPatchSchema,
+                                                OrderPatchBulkSchema,
                                                 OrderPostSchema)
 from src.api.crud_operations.base_crud_operations import ModelOperation
-from src.api.crud_operations.utils.order import (add_or_delete_order_tables,
+from src.api.crud_operations.table import TableOperation
+from src.api.crud_operations.utils.order import (BookedTime,
+                                                 add_or_delete_order_tables,
                                                  calculate_cost,
+                                                 find_overlapping_pairs,
+                                                 get_booked_time_by_table_id,
                                                  validate_booking_time)
-from src.api.crud_operations.utils.other import process_end_datetime
+from src.api.crud_operations.utils.other import bound_start_datetime, make_error_result, process_end_datetime
+from src.api.crud_operations.utils.schedule import (check_time_range_within_daily_schedule,
+                                                    find_schedule_in,
+                                                    get_schedules_by_day)
 from src.api.crud_operations.utils.table import (convert_ids_to_table_objs)
+from src.config import get_settings
 from src.utils.exceptions import JSONException
 from src.utils.response_generation.main import get_text
 
+settings = get_settings()
+
+# Field order of 'OrderGetSchema' and 'TableGetSchema'.
+ORDER_FIELDS: tuple[str, ...] = ('start_datetime', 'end_datetime', 'user_id',
+                                 'id', 'status', 'cost', 'tables')
+TABLE_FIELDS: tuple[str, ...] = ('type', 'number_of_seats', 'price_per_hour', 'id')
+# Live orders with the archived ones, they are searched like the orders.
+ORDERS_WITH_ARCHIVE: AliasedClass = aliased(
+    OrderModel,
+    union_all(select(*OrderModel.__table__.c),
+              select(*(orders_archive.c[column.name] for column in OrderModel.__table__.c)))
+    .subquery('orders_with_archive')
+)
+ORDERS_TABLES_WITH_ARCHIVE: Subquery = union_all(
+    select(orders_tables.c.order_id, orders_tables.c.table_id),
+    select(orders_tables_archive.c.order_id, orders_tables_archive.c.table_id)
+).subquery('orders_tables_with_archive')
+
 
 class OrderOperation(ModelOperation):
     def __init__(self, db, user):
@@ -24,15 +61,235 @@ class OrderOperation(ModelOperation):
         self.model_name = 'order'
         self.db = db
         self.user = user
+        self.bulk_operations = True
 
     def find_all_by_params(self, **kwargs) -> list[OrderModel] | list[None]:
         """
         Finds all orders in the db by given parameters.
         But before that it checks the user's access.
         If it's not superuser, it only looks for orders associated with the user id.
+        Only the live orders are found, archived orders are not mapped to the model.
         :param kwargs: dictionary with parameters.
         :return: orders list or an empty list if no orders were found.
         """
+        return self._make_query_by_params(**kwargs).options(*self._get_load_options()).all()
+
+    def find_all_by_params_as_dicts(self,
+                                    limit: int | None = None,
+                                    offset: int = 0,
+                                    totals: tuple[str, ...] = (),
+                                    **kwargs
+                                    ) -> tuple[list[dict], dict[str, int | float]]:
+        """
+        Finds all orders in the db by given parameters like 'find_all_by_params',
+        but returns plain dicts in the 'OrderGetSchema' format with nested tables.
+        Rows are selected by columns without ORM objects, so it is much faster for large lists.
+        Only the sparse fieldset columns are selected, nested tables are selected only if requested.
+        Totals of all found orders (not only of the page) are selected in the same statement
+        by window functions: 'count' - number of orders, 'sum_cost' - sum of the order costs.
+        The count of all orders without filters is estimated by the db statistics instead,
+        then it is returned as 'estimated_count'.
+        Archived orders are found too if the searched time range reaches the archive.
+        :param limit: max number of orders, all orders if None.
+        :param offset: number of skipped orders.
+        :param totals: names of the requested totals.
+        :param kwargs: dictionary with parameters.
+        :return: orders list or an empty list if no orders were found and the totals by name.
+        """
+        order_model, order_tables = self._find_order_sources(kwargs.get('start_datetime'))
+        query: Query = self._make_query_by_params(order_model=order_model, order_tables=order_tables, **kwargs)
+        estimate_count: bool = 'count' in totals and not self._check_if_filtered(**kwargs)
+        total_columns: dict[str, Label] = {
+            name: column.label(f'total_{name}')
+            for name, column in (('count', func.count().over()),
+                                 ('sum_cost', func.coalesce(func.sum(order_model.cost).over(), 0)))
+            if name in totals and not (name == 'count' and estimate_count)
+        }
+        order_rows: list[Row] = (
+            self._select_order_columns(query, order_model)
+            .add_columns(*total_columns.values())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+        found_totals: dict[str, int | float] = (
+            {name: getattr(order_rows[0], column.name) for name, column in total_columns.items()}
+            if order_rows else self._count_totals(query, order_model, tuple(total_columns))
+        )
+        if estimate_count:
+            found_totals['estimated_count'] = self._estimate_count(query, order_model)
+        if not order_rows:
+            return [], found_totals
+
+        # Nested tables of all found orders by one query.
+        tables_by_order_id: dict[int, list[dict]] | None = (
+            self._find_tables_by_order_ids(
+                [order_row.id for order_row in order_rows] if limit is not None or offset
+                else query.with_entities(order_model.id).order_by(None).scalar_subquery(),
+                order_tables
+            ) if self._with_tables() else None
+        )
+        return self._convert_rows_to_dicts(order_rows, tables_by_order_id), found_totals
+
+    def stream_all_by_params_as_dicts(self, **kwargs) -> Iterator[list[dict]]:
+        """
+        Finds all orders in the db by given parameters like 'find_all_by_params_as_dicts',
+        but the rows are fetched from the server-side cursor by chunks,
+        so the memory usage does not depend on the number of orders.
+        Archived orders are found too if the searched time range reaches the archive.
+        :param kwargs: dictionary with parameters.
+        :return: iterator of the order lists, one list for each chunk.
+        """
+        chunk_size: int = settings.EXPORT_CHUNK_SIZE
+        order_model, order_tables = self._find_order_sources(kwargs.get('start_datetime'))
+        order_rows: Iterator[Row] = iter(
+            self._select_order_columns(
+                self._make_query_by_params(order_model=order_model, order_tables=order_tables, **kwargs),
+                order_model
+            ).yield_per(chunk_size)
+        )
+        while chunk := list(islice(order_rows, chunk_size)):
+            # Nested tables of the chunk orders by one query.
+            tables_by_order_id: dict[int, list[dict]] | None = (
+                self._find_tables_by_order_ids([order_row.id for order_row in chunk], order_tables)
+                if self._with_tables() else None
+            )
+            yield self._convert_rows_to_dicts(chunk, tables_by_order_id)
+
+    def _check_if_filtered(self, **kwargs) -> bool:
+        """Checks that any search parameter is given or the orders are searched by the user id."""
+        return not self.check_user_access() or any(value is not None for value in kwargs.values())
+
+    def _find_order_sources(self,
+                            start_datetime: dt | date | None
+                            ) -> tuple[type | AliasedClass, Table | Subquery]:
+        """
+        Finds where the orders of the searched time range are.
+        The archive holds the orders that start before the archive horizon,
+        so it is read only if the range starts before the latest archived order.
+        :param start_datetime: start of the searched time range or None.
+        :return: orders and their tables with the archived ones or only the live ones.
+        """
+        archive_end: dt | None = self.db.query(func.max(orders_archive.c.start_datetime)).scalar()
+        if archive_end is None or (start_datetime is not None
+                                   and dt.combine(start_datetime, time.min) > archive_end):
+            return OrderModel, orders_tables
+        return ORDERS_WITH_ARCHIVE, ORDERS_TABLES_WITH_ARCHIVE
+
+    def _count_totals(self,
+                      query: Query,
+                      order_model: type | AliasedClass,
+                      totals: tuple[str, ...]
+                      ) -> dict[str, int | float]:
+        """
+        Counts the totals by the separate query.
+        It is needed only if the page is empty, else the totals are selected with the page.
+        """
+        if not totals:
+            return {}
+        count, sum_cost = (query
+                           .with_entities(func.count(order_model.id),
+                                          func.coalesce(func.sum(order_model.cost), 0))
+                           .order_by(None)
+                           .one())
+        return {name: value for name, value in (('count', count), ('sum_cost', sum_cost))
+                if name in totals}
+
+    def _estimate_count(self, query: Query, order_model: type | AliasedClass) -> int:
+        """
+        Estimates the number of orders by the planner statistics ('pg_class.reltuples'),
+        so the whole table is not scanned.
+        The statistics also contain deleted orders and are updated by (auto)vacuum and analyze.
+        Orders are partitioned, so the statistics of the partitions are summed up,
+        the partitions that have never been analyzed are skipped.
+        If no partition has been analyzed, orders are counted exactly.
+        The statistics of the archive are added if it is searched.
+        :param query: query of the orders.
+        :param order_model: orders entity of the query.
+        """
+        table_names: list[str] = (['orders', 'orders_archive'] if order_model is ORDERS_WITH_ARCHIVE
+                                  else ['orders'])
+        reltuples: float | None = self.db.execute(
+            text("SELECT sum(greatest(reltuples, 0)) FROM pg_class "
+                 "WHERE oid IN (SELECT inhrelid FROM pg_inherits "
+                 "              WHERE inhparent = ANY(CAST(:table_names AS regclass[]))) "
+                 "OR (oid = ANY(CAST(:table_names AS regclass[])) AND relkind <> 'p')"),
+            {'table_names': table_names}
+        ).scalar()
+        if not reltuples or reltuples < 0:
+            return query.with_entities(func.count(order_model.id)).order_by(None).scalar()
+        return int(reltuples)
+
+    def _with_tables(self) -> bool:
+        """Checks that the nested tables are requested."""
+        return 'tables' in (self.fields or ORDER_FIELDS)
+
+    def _select_order_columns(self, query: Query, order_model: type | AliasedClass = OrderModel) -> Query:
+        """Selects only the sparse fieldset columns and the order id."""
+        columns: list[str] = [field for field in self.fields or ORDER_FIELDS
+                              if field not in ('id', 'tables')]
+        return query.with_entities(order_model.id, *(getattr(order_model, column) for column in columns))
+
+    def _find_tables_by_order_ids(self,
+                                  order_ids: list[int] | ScalarSelect,
+                                  order_tables: Table | Subquery = orders_tables
+                                  ) -> dict[int, list[dict]]:
+        """
+        Finds nested tables of the orders by one query.
+        :param order_ids: order ids or the subquery of order ids.
+        :param order_tables: order tables, with the archived ones if the orders are searched in the archive.
+        :return: tables in the 'TableGetSchema' format by order id.
+        """
+        table_rows: list[Row] = (
+            self.db
+            .query(order_tables.c.order_id,
+                   TableModel.type,
+                   TableModel.number_of_seats,
+                   TableModel.price_per_hour,
+                   TableModel.id)
+            .join(TableModel, TableModel.id == order_tables.c.table_id)
+            .filter(order_tables.c.order_id.in_(order_ids))
+            .order_by(asc(TableModel.id))
+            .all()
+        )
+        tables_by_order_id: dict[int, list[dict]] = defaultdict(list)
+        for order_id, *table_values in table_rows:
+            tables_by_order_id[order_id].append(dict(zip(TABLE_FIELDS, table_values)))
+        return tables_by_order_id
+
+    def _convert_rows_to_dicts(self,
+                               order_rows: list[Row],
+                               tables_by_order_id: dict[int, list[dict]] | None
+                               ) -> list[dict]:
+        """
+        Converts order rows to dicts in the sparse fieldset order, nested tables are the last.
+        :param order_rows: rows from '_select_order_columns'.
+        :param tables_by_order_id: nested tables from '_find_tables_by_order_ids'
+                                   or None if they are not requested.
+        :return: orders list.
+        """
+        columns: list[str] = [field for field in self.fields or ORDER_FIELDS if field != 'tables']
+        orders: list[dict] = []
+        for order_row in order_rows:
+            order: dict = {column: getattr(order_row, column) for column in columns}
+            if tables_by_order_id is not None:
+                order['tables'] = tables_by_order_id[order_row.id]
+            orders.append(order)
+        return orders
+
+    def _make_query_by_params(self,
+                              order_model: type | AliasedClass = OrderModel,
+                              order_tables: Table | Subquery = orders_tables,
+                              **kwargs
+                              ) -> Query:
+        """
+        Makes the query of orders by given parameters.
+        If it's not superuser, it only looks for orders associated with the user id.
+        :param order_model: orders entity, 'ORDERS_WITH_ARCHIVE' to search the archive too.
+        :param order_tables: order tables, 'ORDERS_TABLES_WITH_ARCHIVE' to search the archive too.
+        :param kwargs: dictionary with parameters.
+        :return: query ordered by start datetime.
+        """
         user_id: int = self.user.id if not self.check_user_access() else kwargs.get('user_id')
         start_datetime: dt | date = kwargs.get('start_datetime')
         end_datetime: dt = process_end_datetime(kwargs.get('end_datetime'))
@@ -42,62 +299,50 @@ class OrderOperation(ModelOperation):
 
         subquery_for_search_by_table_ids = (
             self.db
-            .query(OrderModel.id)
-            .outerjoin(orders_tables)
-            .outerjoin(TableModel)
+            .query(order_tables.c.order_id)
+            .join(TableModel, TableModel.id == order_tables.c.table_id)
             .filter(or_(TableModel.id.in_(table_ids)))
             .scalar_subquery()
         ) if table_ids else None
 
-        subquery_for_search_by_start_and_end = (
-            self.db
-            .query(OrderModel.id)
-            .filter(and_(
-                         (OrderModel.end_datetime >= start_datetime
-                          if start_datetime is not None else True),
-                         (OrderModel.start_datetime <= end_datetime
-                          if end_datetime is not None else True)
-                        )
-                    )
-            .scalar_subquery()
-        ) if (start_datetime and end_datetime) else None
-
         return (
             self.db
-            .query(OrderModel)
+            .query(order_model)
             .filter(and_(
+                # Only the partitions of the searched months are scanned.
+                *bound_start_datetime((order_model.start_datetime,), start_datetime, end_datetime),
                 (
-                    OrderModel.id.in_(subquery_for_search_by_start_and_end)
+                    order_model.end_datetime >= start_datetime
                     if (start_datetime and end_datetime) else True
                 ),
                 (
-                    OrderModel.start_datetime >= start_datetime
+                    order_model.start_datetime >= start_datetime
                     if start_datetime is not None and end_datetime is None else True
                 ),
                 (
-                    OrderModel.end_datetime <= end_datetime
+                    order_model.end_datetime <= end_datetime
                     if end_datetime is not None and start_datetime is None else True
                 ),
                 (
-                    OrderModel.status == status_
+                    order_model.status == status_
                     if status_ is not None else True
                 ),
                 (
-                    OrderModel.cost <= cost
+                    order_model.cost <= cost
                     if cost is not None else True)
                 ,
                 (
-                    OrderModel.user_id == user_id
+                    order_model.user_id == user_id
                     if user_id is not None else True
                 ),
                 (
-                    OrderModel.id.in_(subquery_for_search_by_table_ids)
+                    order_model.id.in_(subquery_for_search_by_table_ids)
                     if table_ids is not None else True
                 )
             )
             )
-            .order_by(asc(self.model.start_datetime))
-            .all()
+            # The id makes the order stable for the pages.
+            .order_by(asc(order_model.start_datetime), asc(order_model.id))
         )
 
     def update_obj(self, id_: int, new_data: OrderPatchSchema) -> OrderModel:
@@ -124,9 +369,12 @@ class OrderOperation(ModelOperation):
             if hasattr(old_order, key):
                 setattr(old_order, key, value)
 
+        # Nested tables are not columns of the order, so the change time is set explicitly.
+        old_order.updated_at = func.now()
+
         # Save updated order.
         updated_order: OrderModel = old_order
-        self.db.commit()
+        self._commit()
         self.db.refresh(updated_order)
 
         return updated_order
@@ -138,15 +386,151 @@ class OrderOperation(ModelOperation):
         :return: added order.
         """
         prepared_data: dict = self._prepare_data_for_post_operation(new_data)
-        max_order_id: int = self.get_max_id()
-        new_order: OrderModel = self.model(id=max_order_id + 1, **prepared_data)
+        # Id is given by the sequence.
+        new_order: OrderModel = self.model(**prepared_data)
 
         self.db.add(new_order)
-        self.db.commit()
+        self._commit()
         self.db.refresh(new_order)
 
         return new_order
 
+    def add_objs(self, orders_data: list[dict]) -> list[dict]:
+        """
+        Adds new orders into db in one transaction.
+        Each order is checked like in 'add_obj', but the data for the checks is selected once:
+        schedules are selected by one query and each order is checked in memory,
+        tables of all orders are selected by one query,
+        booked time of these tables is selected by one range query over the time span of all orders.
+        The orders of the request that overlap each other are found by the sweep line,
+        then the order that goes first in the request is added and the others are not.
+        Valid orders are inserted by multi-row inserts, invalid ones are skipped.
+        :param orders_data: list of 'POST /orders/create' bodies.
+        :return: result of each order in the request order.
+        """
+        results: list[dict | None] = [None] * len(orders_data)
+        orders: dict[int, OrderPostSchema] = self._validate_orders_in_memory(orders_data, results)
+
+        # Tables of all orders by one query.
+        tables_by_id: dict[int, TableModel] = {
+            table.id: table for table in TableOperation(db=self.db, user=None).find_by_ids(
+                sorted({table_id for order in orders.values() for table_id in order.tables})
+            )
+        }
+        for index, order in list(orders.items()):
+            if missing_table_ids := [table_id for table_id in order.tables if table_id not in tables_by_id]:
+                results[index] = make_error_result(JSONException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    message=get_text('not_found').format('table', missing_table_ids[0])
+                ), None)
+                del orders[index]
+
+        self._skip_busy_orders(orders, results)
+        if not orders:
+            return results
+
+        # Ids are taken from the sequence by one query and given in the request order.
+        new_ids: list[int] = sorted(self.db.execute(
+            select(ORDERS_ID_SEQUENCE.next_value()).select_from(func.generate_series(1, len(orders)))
+        ).scalars().all())
+        order_rows: list[dict] = []
+        order_table_rows: list[dict] = []
+        for new_id, (index, order) in zip(new_ids, sorted(orders.items())):
+            order_rows.append({
+                'id': new_id,
+                'start_datetime': order.start_datetime,
+                'end_datetime': order.end_datetime,
+                'user_id': order.user_id,
+                'status': order.status,
+                'cost': calculate_cost(order.start_datetime,
+                                       order.end_datetime,
+                                       [tables_by_id[table_id] for table_id in order.tables])
+            })
+            order_table_rows.extend({'order_id': new_id, 'table_id': table_id, 'start_datetime': order.start_datetime}
+                                    for table_id in order.tables)
+            results[index] = {'status_code': status.HTTP_201_CREATED,
+                              'id': new_id,
+                              'message': get_text('post').format(self.model_name, new_id)}
+
+        # Lists of params are inserted by multi-row 'INSERT ... VALUES'.
+        self.db.execute(insert(OrderModel), order_rows)
+        self.db.execute(insert(orders_tables), order_table_rows)
+        self._commit()
+        return results
+
+    def _validate_orders_in_memory(self,
+                                   orders_data: list[dict],
+                                   results: list[dict | None]
+                                   ) -> dict[int, OrderPostSchema]:
+        """
+        Validates the orders by the schema and the schedules without db queries per order.
+        Repeated table ids of an order are removed.
+        :param orders_data: list of 'POST /orders/create' bodies.
+        :param results: results by index, the errors of invalid orders are set.
+        :return: valid orders by index.
+        """
+        schedules_by_day: dict = get_schedules_by_day(self.db)
+        orders: dict[int, OrderPostSchema] = {}
+        for index, order_data in enumerate(orders_data):
+            try:
+                order = OrderPostSchema(**order_data)
+                order.tables = list(dict.fromkeys(order.tables))
+                check_time_range_within_daily_schedule(
+                    order.start_datetime,
+                    order.end_datetime,
+                    find_schedule_in(schedules_by_day, order.start_datetime.date())
+                )
+            except (JSONException, ValidationError) as err:
+                results[index] = make_error_result(err, None)
+                continue
+            orders[index] = order
+        return orders
+
+    def _skip_busy_orders(self, orders: dict[int, OrderPostSchema], results: list[dict | None]) -> NoReturn:
+        """
+        Removes the orders whose tables are booked at this time in the db or by the previous orders
+        of the request.
+        :param orders: valid orders by index.
+        :param results: results by index, the errors of busy orders are set.
+        """
+        if not orders:
+            return
+        table_ids: list[int] = sorted({table_id for order in orders.values() for table_id in order.tables})
+        booked_time_by_table_id: dict[int, BookedTime] = get_booked_time_by_table_id(
+            table_ids,
+            min(order.start_datetime for order in orders.values()),
+            max(order.end_datetime for order in orders.values()),
+            self.db
+        )
+        # Overlapping orders of the request by table.
+        order_ranges_by_table_id: dict[int, list[tuple]] = defaultdict(list)
+        for index, order in orders.items():
+            for table_id in order.tables:
+                order_ranges_by_table_id[table_id].append((index, order.start_datetime, order.end_datetime))
+        overlapping_indexes: dict[int, dict[int, list[int]]] = defaultdict(lambda: defaultdict(list))
+        for table_id, order_ranges in order_ranges_by_table_id.items():
+            for first_index, second_index in find_overlapping_pairs(order_ranges):
+                overlapping_indexes[max(first_index, second_index)][min(first_index, second_index)].append(table_id)
+
+        for index, order in sorted(orders.items()):
+            if busy_table_ids := [
+                table_id for table_id in order.tables
+                if table_id in booked_time_by_table_id
+                and booked_time_by_table_id[table_id].overlaps(order.start_datetime, order.end_datetime)
+            ]:
+                message: str = get_text('order_err_busy_time').format(busy_table_ids)
+            # Only the orders that are added, the others were removed earlier.
+            elif (previous_index := next((previous_index for previous_index in overlapping_indexes[index]
+                                          if previous_index in orders), None)) is not None:
+                message = get_text('order_err_busy_time_in_request').format(
+                    sorted(overlapping_indexes[index][previous_index]), previous_index
+                )
+            else:
+                continue
+            results[index] = make_error_result(JSONException(status_code=status.HTTP_400_BAD_REQUEST,
+                                                             message=message), None)
+            del orders[index]
+
     def _prepare_data_for_post_operation(self, data: OrderPostSchema) -> dict:
         """
         Converts table ids to table objects.
@@ -165,6 +549,18 @@ class OrderOperation(ModelOperation):
                                                data.tables)
         return prepared_data
 
+    def _prepare_data_for_bulk_update_operation(self, new_data: OrderPatchBulkSchema) -> dict:
+        """
+        Gets the changed values for the bulk update.
+        If 'client', then the fields are excluded like in '_prepare_data_for_patch_operation'.
+        :param new_data: order update data.
+        :return: values by column name.
+        """
+        if not self.check_user_access():
+            new_data = OrderPatchBulkSchema(**new_data.dict(exclude_unset=True,
+                                                            exclude={'status', 'user_id', 'cost'}))
+        return super()._prepare_data_for_bulk_update_operation(new_data)
+
     def _prepare_data_for_patch_operation(self,
                                           old_data: OrderModel,
                                           new_data: OrderPatchSchema
@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import status
+from sqlalchemy import and_, asc, func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.api.models.report import (REPORT_VIEWS,
+                                   daily_table_booked_hours,
+                                   daily_table_revenue,
+                                   user_orders)
+from src.config import get_settings
+from src.utils.exceptions import JSONException
+from src.utils.occupancy.main import make_occupancy_heatmap
+from src.utils.response_generation.main import get_text
+
+settings = get_settings()
+
+
+class ReportOperation:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_daily_revenue(self,
+                           start_date: date | None = None,
+                           end_date: date | None = None,
+                           table_id: int | None = None,
+                           type: str | None = None,
+                           by: Literal['table', 'type'] = 'table'
+                           ) -> list[dict]:
+        """
+        Finds the daily revenue of the tables from the report view.
+        :param start_date: days from this date.
+        :param end_date: days up to this date inclusive.
+        :param table_id: revenue of this table only.
+        :param type: revenue of the tables of this type only.
+        :param by: revenue of each table or of each table type.
+        :return: revenue list ordered by day.
+        """
+        columns: tuple = (
+            (daily_table_revenue.c.day,
+             daily_table_revenue.c.table_id,
+             daily_table_revenue.c.table_type,
+             daily_table_revenue.c.bookings,
+             daily_table_revenue.c.revenue) if by == 'table' else
+            (daily_table_revenue.c.day,
+             daily_table_revenue.c.table_type,
+             func.sum(daily_table_revenue.c.bookings).label('bookings'),
+             func.sum(daily_table_revenue.c.revenue).label('revenue'))
+        )
+        query: Select = self._filter_days(select(*columns), daily_table_revenue, start_date, end_date).where(
+            daily_table_revenue.c.table_id == table_id if table_id is not None else True,
+            daily_table_revenue.c.table_type == type if type is not None else True
+        )
+        if by == 'table':
+            query = query.order_by(asc(daily_table_revenue.c.day), asc(daily_table_revenue.c.table_id))
+        else:
+            query = (query
+                     .group_by(daily_table_revenue.c.day, daily_table_revenue.c.table_type)
+                     .order_by(asc(daily_table_revenue.c.day), asc(daily_table_revenue.c.table_type)))
+        return [dict(row) for row in self.db.execute(query).mappings()]
+
+    def find_daily_booked_hours(self,
+                                start_date: date | None = None,
+                                end_date: date | None = None,
+                                table_id: int | None = None
+                                ) -> list[dict]:
+        """
+        Finds the daily booked hours of the tables from the report view.
+        :param start_date: days from this date.
+        :param end_date: days up to this date inclusive.
+        :param table_id: booked hours of this table only.
+        :return: booked hours list ordered by day and table id.
+        """
+        query: Select = (
+            self._filter_days(select(daily_table_booked_hours), daily_table_booked_hours, start_date, end_date)
+            .where(daily_table_booked_hours.c.table_id == table_id if table_id is not None else True)
+            .order_by(asc(daily_table_booked_hours.c.day), asc(daily_table_booked_hours.c.table_id))
+        )
+        return [dict(row) for row in self.db.execute(query).mappings()]
+
+    def find_user_orders(self, user_id: int | None = None) -> list[dict]:
+        """
+        Finds the order stats of the users from the report view.
+        :param user_id: stats of this user only.
+        :return: stats list ordered by user id.
+        """
+        query: Select = (
+            select(user_orders)
+            .where(user_orders.c.user_id == user_id if user_id is not None else True)
+            .order_by(asc(user_orders.c.user_id))
+        )
+        return [dict(row) for row in self.db.execute(query).mappings()]
+
+    def find_occupancy(self, start_date: date, end_date: date, type: str | None = None) -> dict:
+        """
+        Makes the occupancy heatmap of the tables by day of the week and hour.
+        It is computed from the orders, not from the report views, so it is always up to date.
+        :param start_date: first day.
+        :param end_date: last day inclusive.
+        :param type: heatmap of the tables of this type only.
+        :return: heatmap dictionary from 'make_occupancy_heatmap'.
+        :raises: JSONException if the date range is empty or longer than 'REPORTS_OCCUPANCY_MAX_DAYS'.
+        """
+        if end_date < start_date:
+            raise JSONException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=get_text('report_err_end_less_start')
+            )
+        if (end_date - start_date).days + 1 > settings.REPORTS_OCCUPANCY_MAX_DAYS:
+            raise JSONException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=get_text('report_err_too_long_range').format(settings.REPORTS_OCCUPANCY_MAX_DAYS)
+            )
+        return make_occupancy_heatmap(self.db, start_date, end_date, type)
+
+    def refresh_views(self) -> list[str]:
+        """
+        Refreshes all report views 'CONCURRENTLY', so they are read while they are refreshed.
+        Each view is refreshed and committed separately.
+        :return: names of the refreshed views.
+        """
+        for view_name in REPORT_VIEWS:
+            self.db.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}'))
+            self.db.commit()
+        return list(REPORT_VIEWS)
+
+    @staticmethod
+    def _filter_days(query: Select, view, start_date: date | None, end_date: date | None) -> Select:
+        """Filters the rows of the view by the day range."""
+        return query.where(and_(
+            view.c.day >= start_date if start_date is not None else True,
+            view.c.day <= end_date if end_date is not None else True
+        ))
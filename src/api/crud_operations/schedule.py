@@ -35,6 +35,7 @@ class ScheduleOperation(ModelOperation):
 
         return (self.db
                     .query(ScheduleModel)
+                    .options(*self._get_load_options())
                     .filter(and_(
                                  (ScheduleModel.day == day
                                   if day is not None else True),
@@ -74,7 +75,7 @@ class ScheduleOperation(ModelOperation):
 
         # Save updated schedule.
         updated_schedule: ScheduleModel = old_schedule
-        self.db.commit()
+        self._commit()
         self.db.refresh(updated_schedule)
 
         return updated_schedule
@@ -1,13 +1,23 @@
 from datetime import date, datetime as dt
+from typing import NoReturn
 
-from sqlalchemy import and_, asc
+from pydantic import BaseModel as BaseSchema
+from sqlalchemy import and_, asc, func
+from sqlalchemy.orm import Query
 
+from src.config import get_settings
 from src.api.models.table import TableModel
 from src.api.models.order import OrderModel
 from src.api.models.relationships import orders_tables
 from src.api.schemes.table.base_schemes import TablePatchSchema
 from src.api.crud_operations.base_crud_operations import ModelOperation
-from src.api.crud_operations.utils.other import process_end_datetime
+from src.api.crud_operations.utils.other import bound_start_datetime, process_end_datetime
+from src.utils.cascade_deletion.main import make_table_order_tables_statement
+from src.utils.celery.celery_tasks import cascade_deleted_rows, reprice_orders
+from src.utils.repricing.main import reprice_future_orders
+from src.utils.response_cache.main import invalidate_cached_responses
+
+settings = get_settings()
 
 
 class TableOperation(ModelOperation):
@@ -17,6 +27,7 @@ class TableOperation(ModelOperation):
         self.patch_schema = TablePatchSchema
         self.db = db
         self.user = user
+        self.bulk_operations = True
 
     def find_all_by_params(self, **kwargs) -> list[TableModel]:
         """
@@ -25,6 +36,84 @@ class TableOperation(ModelOperation):
         :param kwargs: dictionary with parameters.
         :return: tables list or an empty list if no tables were found.
         """
+        return self._make_query_by_params(**kwargs).options(*self._get_load_options()).all()
+
+    def update_obj(self, id_: int, new_data: TablePatchSchema) -> TableModel:
+        """
+        Updates the table like the base method does.
+        If the price is changed, then the future orders of the table are repriced.
+        """
+        updated_table: TableModel = super().update_obj(id_, new_data)
+        if new_data.price_per_hour is not None:
+            self._reprice_future_orders([id_])
+        return updated_table
+
+    def update_objs(self, ids: list[int] | None, params: dict, new_data: BaseSchema) -> list[int]:
+        """
+        Updates the tables like the base method does.
+        If the price is changed, then the future orders of the updated tables are repriced.
+        """
+        updated_ids: list[int] = super().update_objs(ids, params, new_data)
+        if updated_ids and new_data.price_per_hour is not None:
+            self._reprice_future_orders(updated_ids)
+        return updated_ids
+
+    def delete_obj(self, id_: int) -> NoReturn:
+        """
+        Deletes the table like the base method does.
+        The order tables of the table are deleted in the background by batches.
+        :param id_: table id.
+        """
+        table_to_delete: TableModel = self.find_by_id_or_404(id_)
+        table_to_delete.deleted_at = func.now()
+        self._cascade_deletion([id_])
+
+    def delete_objs(self, ids: list[int] | None, params: dict) -> list[int]:
+        """
+        Deletes the tables like the base method does.
+        The order tables of the deleted tables are deleted in the background by batches.
+        """
+        deleted_ids: list[int] = super().delete_objs(ids, params)
+        if deleted_ids:
+            self._cascade_deletion(deleted_ids)
+        return deleted_ids
+
+    def _reprice_future_orders(self, table_ids: list[int]) -> NoReturn:
+        """
+        Reprices the future orders of the tables by the celery task after the new prices are committed.
+        If the changes are committed by the caller, then the task is sent after its commit.
+        If 'ORDERS_REPRICE_IN_BACKGROUND' is off, then the orders are repriced in the same transaction.
+        :param table_ids: ids of the tables with the changed prices.
+        """
+        if not settings.ORDERS_REPRICE_IN_BACKGROUND:
+            order_ids: list[int] = reprice_future_orders(self.db, table_ids)
+            self._commit()
+            if self.autocommit and order_ids:
+                invalidate_cached_responses('orders')
+        else:
+            self._send_task_after_commit(reprice_orders, table_ids=table_ids)
+
+    def _cascade_deletion(self, table_ids: list[int]) -> NoReturn:
+        """
+        Commits the deletion of the tables, then the celery task deletes their order tables by batches,
+        so the deletion of a table with a long history does not lock the orders for a long time.
+        If 'DELETE_CASCADE_IN_BACKGROUND' is off, then the order tables are deleted in the same transaction.
+        :param table_ids: ids of the deleted tables.
+        """
+        if not settings.DELETE_CASCADE_IN_BACKGROUND:
+            self.db.flush()
+            self.db.execute(make_table_order_tables_statement(table_ids, None))
+            self._commit()
+        else:
+            self._commit()
+            self._send_task_after_commit(cascade_deleted_rows, resource='tables', ids=table_ids)
+
+    def _make_query_by_params(self, **kwargs) -> Query:
+        """
+        Makes the query of tables by given parameters.
+        :param kwargs: dictionary with parameters.
+        :return: query ordered by id.
+        """
         type = kwargs.get('type')
         number_of_seats = kwargs.get('number_of_seats')
         price_per_hour = kwargs.get('price_per_hour')
@@ -39,8 +128,10 @@ class TableOperation(ModelOperation):
             .filter(and_(
                 (OrderModel.end_datetime >= start_datetime
                  if start_datetime is not None else True),
-                (OrderModel.start_datetime <= end_datetime
-                 if end_datetime is not None else True)
+                # Only the partitions of the searched months are scanned.
+                *bound_start_datetime((OrderModel.start_datetime, orders_tables.c.start_datetime),
+                                      start_datetime,
+                                      end_datetime)
             )
             )
             .scalar_subquery()
@@ -53,7 +144,10 @@ class TableOperation(ModelOperation):
             .outerjoin(OrderModel)
             .filter(and_(
                 (OrderModel.start_datetime >= start_datetime
-                 if start_datetime is not None and end_datetime is None else True)
+                 if start_datetime is not None and end_datetime is None else True),
+                *bound_start_datetime((OrderModel.start_datetime, orders_tables.c.start_datetime),
+                                      start_datetime,
+                                      None)
             )
             )
             .scalar_subquery()
@@ -66,7 +160,10 @@ class TableOperation(ModelOperation):
             .outerjoin(OrderModel)
             .filter(and_(
                 (OrderModel.end_datetime <= end_datetime
-                 if end_datetime is not None and start_datetime is None else True)
+                 if end_datetime is not None and start_datetime is None else True),
+                *bound_start_datetime((OrderModel.start_datetime, orders_tables.c.start_datetime),
+                                      None,
+                                      end_datetime)
             )
             )
             .scalar_subquery()
@@ -102,5 +199,4 @@ class TableOperation(ModelOperation):
                 )
                 )
                 .order_by(asc(self.model.id))
-                .all()
                 )
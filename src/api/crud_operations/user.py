@@ -1,9 +1,17 @@
-from sqlalchemy import and_, asc
+from typing import NoReturn
+
+from sqlalchemy import and_, asc, func
 
 from src.api.crud_operations.base_crud_operations import ModelOperation
 from src.api.models.user import UserModel
 from src.api.schemes.user.base_schemes import UserPatchSchema, UserPostSchema
+from src.config import get_settings
 from src.utils.auth_utils.password_cryptograph import PasswordCryptographer
+from src.utils.cascade_deletion.main import make_user_orders_statement
+from src.utils.celery.celery_tasks import cascade_deleted_rows
+from src.utils.response_cache.main import invalidate_cached_responses
+
+settings = get_settings()
 
 
 class UserOperation(ModelOperation):
@@ -18,6 +26,7 @@ class UserOperation(ModelOperation):
         status = kwargs.get('status')
         return (self.db
                     .query(UserModel)
+                    .options(*self._get_load_options())
                     .filter(and_(
                                  (UserModel.phone == phone
                                   if phone is not None else True),
@@ -45,11 +54,30 @@ class UserOperation(ModelOperation):
 
         # Save new user object into db.
         self.db.add(new_user_obj)
-        self.db.commit()
+        self._commit()
         self.db.refresh(new_user_obj)
 
         return new_user_obj
 
+    def delete_obj(self, id_: int) -> NoReturn:
+        """
+        Deletes user from db by the given user id with all user's orders.
+        The user and orders are only marked as deleted.
+        The user is marked at once, the orders are marked in the background by batches.
+        :param id_: user id.
+        """
+        user_to_delete: UserModel = self.find_by_id_or_404(id_)
+        user_to_delete.deleted_at = func.now()
 
+        # Rows are not deleted, so the db does not cascade the deletion to the user's orders.
+        if not settings.DELETE_CASCADE_IN_BACKGROUND:
+            self.db.flush()
+            self.db.execute(make_user_orders_statement([id_], None))
+            self._commit()
+        else:
+            self._commit()
+            self._send_task_after_commit(cascade_deleted_rows, resource='users', ids=[id_])
 
-
+    def _invalidate_cached_responses(self) -> NoReturn:
+        """User deletion cascades to the user's orders, so order data is invalidated too."""
+        invalidate_cached_responses(self.model.__tablename__, 'orders')
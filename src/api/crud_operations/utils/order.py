@@ -1,15 +1,22 @@
-from typing import NoReturn
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import accumulate
+from typing import Hashable, NoReturn
 from datetime import date, datetime as dt
 
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from fastapi import status
 
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
 from src.api.models.table import TableModel
 from src.api.schemes.validators.order import OrderPostOrPatchValidator
 from src.api.crud_operations.utils.table import (collect_new_tables_excluding_existing_ones,
                                                  get_table_ids_by_booking_time)
 from src.api.crud_operations.utils.schedule import check_time_range_within_schedule_range
-from src.api.crud_operations.utils.other import round_timedelta_to_hours
+from src.api.crud_operations.utils.other import bound_start_datetime, round_timedelta_to_hours
 from src.utils.exceptions import JSONException
 from src.utils.response_generation.main import get_text
 
@@ -87,3 +94,72 @@ def check_free_time_in_orders(start: dt | date,
                     status_code=status.HTTP_400_BAD_REQUEST,
                     message=get_text('order_err_busy_time').format(occupied_tables)
                 )
+
+
+@dataclass
+class BookedTime:
+    """Booked time ranges of one table sorted by start."""
+    starts: list[dt] = field(default_factory=list)
+    ends: list[dt] = field(default_factory=list)
+    # The latest end of the ranges up to each index.
+    max_ends: list[dt] = field(default_factory=list)
+
+    def overlaps(self, start: dt, end: dt) -> bool:
+        """Checks that the time range overlaps any booked range by binary search."""
+        if not self.max_ends:
+            self.max_ends = list(accumulate(self.ends, max))
+        # Only the ranges that start before the given end can overlap it.
+        index: int = bisect_right(self.starts, end)
+        return index > 0 and self.max_ends[index - 1] >= start
+
+
+def get_booked_time_by_table_id(table_ids: list[int],
+                                start: dt,
+                                end: dt,
+                                db: Session
+                                ) -> dict[int, BookedTime]:
+    """
+    Gets the booked time ranges of the tables within the given time span by one query.
+    :param table_ids: table ids.
+    :param start: start of the time span.
+    :param end: end of the time span.
+    :param db: db session.
+    :return: booked time by table id, there are no keys for the tables without orders.
+    """
+    rows = (db
+            .query(orders_tables.c.table_id, OrderModel.start_datetime, OrderModel.end_datetime)
+            .join(OrderModel, and_(OrderModel.id == orders_tables.c.order_id,
+                                   OrderModel.start_datetime == orders_tables.c.start_datetime))
+            .filter(orders_tables.c.table_id.in_(table_ids),
+                    OrderModel.end_datetime >= start,
+                    # Only the partitions of the given months are scanned.
+                    *bound_start_datetime((OrderModel.start_datetime, orders_tables.c.start_datetime),
+                                          start,
+                                          end))
+            .order_by(orders_tables.c.table_id, OrderModel.start_datetime)
+            .all())
+    booked_time_by_table_id: dict[int, BookedTime] = {}
+    for table_id, order_start, order_end in rows:
+        booked_time: BookedTime = booked_time_by_table_id.setdefault(table_id, BookedTime())
+        booked_time.starts.append(order_start)
+        booked_time.ends.append(order_end)
+    return booked_time_by_table_id
+
+
+def find_overlapping_pairs(time_ranges: list[tuple[Hashable, dt, dt]]) -> set[tuple[Hashable, Hashable]]:
+    """
+    Finds the pairs of overlapping time ranges by the sweep line:
+    ranges are scanned by start, the ranges that are not finished yet are kept in the heap by end.
+    The ranges overlap like the orders do, the bounds are included.
+    :param time_ranges: (key, start, end) of each range.
+    :return: pairs of keys of the overlapping ranges, the range that starts earlier goes first.
+    """
+    pairs: set[tuple[Hashable, Hashable]] = set()
+    active_ranges: list[tuple[dt, int, Hashable]] = []
+    for number, (key, start, end) in enumerate(sorted(time_ranges, key=lambda time_range: time_range[1])):
+        while active_ranges and active_ranges[0][0] < start:
+            heappop(active_ranges)
+        pairs.update((active_key, key) for _, _, active_key in active_ranges)
+        # The number breaks the ties, so the keys are never compared.
+        heappush(active_ranges, (end, number, key))
+    return pairs
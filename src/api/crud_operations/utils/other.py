@@ -1,6 +1,15 @@
-from datetime import date, datetime as dt, timedelta as td
+from datetime import date, datetime as dt, time, timedelta as td
 from math import ceil
 
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy import Column
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import ColumnElement
+
+from src.utils.exceptions import JSONException
+
 
 def process_end_datetime(end: dt):
     """
@@ -18,6 +27,30 @@ def process_end_datetime(end: dt):
     )
 
 
+def bound_start_datetime(columns: tuple[Column, ...],
+                         start: dt | date | None,
+                         end: dt | None
+                         ) -> list[ColumnElement]:
+    """
+    Makes the conditions on the order start for the orders that overlap the given time range.
+    An order starts and ends on the same day, so it overlaps the range only if it starts
+    not earlier than the day of the range start and not later than the range end.
+    Orders are partitioned by the start, so these conditions let the planner skip the partitions
+    of other months, the conditions on the order end do not.
+    :param columns: order start columns, the conditions are repeated for each of them.
+    :param start: range start or None.
+    :param end: range end or None.
+    :return: list of conditions.
+    """
+    conditions: list[ColumnElement] = []
+    for column in columns:
+        if start is not None:
+            conditions.append(column >= dt.combine(start, time.min))
+        if end is not None:
+            conditions.append(column <= end)
+    return conditions
+
+
 def round_timedelta_to_hours(start: dt, end: dt) -> int:
     """
     Rounds time delta to hours.
@@ -25,4 +58,25 @@ def round_timedelta_to_hours(start: dt, end: dt) -> int:
     """
     dt_delta: td = end - start
     accurate_time_in_seconds: float = dt_delta.seconds / 3600
-    return ceil(accurate_time_in_seconds)
\ No newline at end of file
+    return ceil(accurate_time_in_seconds)
+
+
+def make_error_result(err: JSONException | ValidationError | IntegrityError, id_: int | None) -> dict:
+    """
+    Converts the error of one item of the bulk request to the item result
+    in the same format as the error responses of the endpoints.
+    :param err: error of the item.
+    :param id_: object id or None if there is no object.
+    :return: dict with 'status_code', 'id' and 'message' keys.
+    """
+    match err:
+        case JSONException():
+            status_code, message = err.status_code, err.message
+        case ValidationError():
+            status_code, message = status.HTTP_422_UNPROCESSABLE_ENTITY, jsonable_encoder(err.errors())
+        case _:
+            status_code, message = status.HTTP_400_BAD_REQUEST, {
+                'err_name': 'sqlalchemy.exc.IntegrityError',
+                'traceback': err.args[0] or str(err)
+            }
+    return {'status_code': status_code, 'id': id_, 'message': message}
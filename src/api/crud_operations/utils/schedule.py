@@ -11,6 +11,8 @@ from src.utils.exceptions import JSONException
 from src.utils.response_generation.main import get_text
 from src.utils.color_logging.main import logger
 
+WEEK_DAYS: tuple[str, ...] = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 
 def check_time_range_within_schedule_range(start: dt, end: dt, db: Session) -> bool:
     """
@@ -24,7 +26,19 @@ def check_time_range_within_schedule_range(start: dt, end: dt, db: Session) -> b
     """
     # get daily schedule by date or week day
     daily_schedule: ScheduleModel = find_schedule(start.date(), db)
+    return check_time_range_within_daily_schedule(start, end, daily_schedule)
+
 
+def check_time_range_within_daily_schedule(start: dt, end: dt, daily_schedule: ScheduleModel) -> bool:
+    """
+    Returns True if the time is within the range of the given daily schedule,
+    else raises JSONException.
+    :param start: input start datetime.
+    :param end: input end datetime.
+    :param daily_schedule: schedule of the start date.
+    :return: True.
+    :raises: JSONException, if the time range is not within the schedule range.
+    """
     # convert time schedule range to datetime schedule range
     daily_schedule_without_break = _replace_time_range_to_datetime_range(
         daily_schedule.open_time,
@@ -67,6 +81,33 @@ def find_schedule(input_date: dt.date, db: Session) -> ScheduleModel:
         return _find_week_day_schedule(input_date, db)
 
 
+def get_schedules_by_day(db: Session) -> dict[str, ScheduleModel]:
+    """
+    Gets all schedules by one query, so many dates can be checked in memory.
+    :return: schedules by specific date ('2022-12-25') or day of the week ('Monday').
+    """
+    return {schedule.day: schedule for schedule in _get_schedule_objects(db)}
+
+
+def find_schedule_in(schedules_by_day: dict[str, ScheduleModel], input_date: dt.date) -> ScheduleModel:
+    """
+    Like 'find_schedule', but looks up the schedule in the schedules from 'get_schedules_by_day'.
+    """
+    schedule: ScheduleModel | None = (schedules_by_day.get(str(input_date))
+                                      or schedules_by_day.get(WEEK_DAYS[input_date.weekday()]))
+    if not schedule:
+        logger.exception(
+            f"Schedule of '{input_date}' was not found."
+            f"You probably need to add 'schedules' first. "
+            f"Check your database."
+        )
+        raise JSONException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            message=get_text('err_500')
+        )
+    return schedule
+
+
 def _replace_time_range_to_datetime_range(start_time: time,
                                           end_time: time,
                                           start_dt: dt,
@@ -127,17 +168,7 @@ def _find_specific_day_schedule(input_date: dt.date, db: Session) -> ScheduleMod
 
 def _find_week_day_schedule(input_date: dt.date, db: Session) -> ScheduleModel:
     """Searches for schedule by day of the week."""
-    week_days: dict = {
-        0: 'Monday',
-        1: 'Tuesday',
-        2: 'Wednesday',
-        3: 'Thursday',
-        4: 'Friday',
-        5: 'Saturday',
-        6: 'Sunday'
-    }
-    input_weak_day_id: int = input_date.weekday()
-    input_weak_day: str = week_days.get(input_weak_day_id)
+    input_weak_day: str = WEEK_DAYS[input_date.weekday()]
     week_day_schedule: list[ScheduleModel] = _get_schedule_objects(db, day=input_weak_day)
     if not week_day_schedule:
         logger.exception(
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 
-from src.api.routers import user, users_auth, table, schedule, order
+from src.api.routers import user, users_auth, table, schedule, order, cache, batch, report
 
+from src.utils.compression.main import CompressionMiddleware
 from src.utils.exceptions import JSONException
 from src.utils.color_logging.main import logger
 from src.utils.db_populating.inserting_data_into_db import insert_data_to_db
@@ -21,7 +22,11 @@ def create_app(with_data: tuple = None,
                           version='0.2.0',
                           docs_url=f'{api_url}/docs',
                           redoc_url=f'{api_url}/redoc',
-                          openapi_url=f'{api_url}/openapi.json')
+                          openapi_url=f'{api_url}/openapi.json',
+                          default_response_class=ORJSONResponse)
+
+    # Middlewares
+    application.add_middleware(CompressionMiddleware)
 
     # Routers
     application.include_router(users_auth.router, prefix=api_url)
@@ -29,6 +34,9 @@ def create_app(with_data: tuple = None,
     application.include_router(order.router, prefix=api_url)
     application.include_router(schedule.router, prefix=api_url)
     application.include_router(table.router, prefix=api_url)
+    application.include_router(cache.router, prefix=api_url)
+    application.include_router(batch.router, prefix=api_url)
+    application.include_router(report.router, prefix=api_url)
 
     # Exception handlers
     @application.exception_handler(JSONException)
@@ -0,0 +1,39 @@
+from sqlalchemy import Table, Column, DateTime, Float, ForeignKey, Index, Integer, String
+
+from src.db.db_sqlalchemy import BaseModel
+
+# Cold storage of the past orders, see 'src.utils.archiving'.
+# Columns are the same as the columns of the orders and their tables, so the rows are moved as they are.
+orders_archive = Table(
+    'orders_archive',
+    BaseModel.metadata,
+    Column('updated_at', DateTime, nullable=False),
+    Column('deleted_at', DateTime),
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('start_datetime', DateTime, nullable=False, index=True),
+    Column('end_datetime', DateTime),
+    Column('status', String(length=25)),
+    Column('cost', Float(precision=2)),
+    Column('user_id', Integer, ForeignKey('users.id',
+                                          onupdate='CASCADE',
+                                          ondelete='CASCADE')
+           ),
+    Index('ix_orders_archive_user_id_start_datetime', 'user_id', 'start_datetime')
+)
+
+orders_tables_archive = Table(
+    'orders_tables_archive',
+    BaseModel.metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('order_id', Integer, ForeignKey('orders_archive.id',
+                                           onupdate='CASCADE',
+                                           ondelete='CASCADE'),
+           index=True
+           ),
+    Column('table_id', Integer, ForeignKey('tables.id',
+                                           onupdate='CASCADE',
+                                           ondelete='CASCADE'),
+           index=True
+           ),
+    Column('start_datetime', DateTime, nullable=False)
+)
@@ -0,0 +1,37 @@
+"""
+Change tracking of rows for the delta sync (`GET /{resource}/changes`).
+
+'updated_at' is set on every insert and update, deleted rows are only marked by 'deleted_at' (tombstone),
+so clients can get deleted ids too. Deleted rows are excluded from all ORM queries automatically
+(including joins, subqueries and relationships) unless the query has 'include_deleted' execution option.
+So the indexes of the live data are partial ('WHERE deleted_at IS NULL') and don't grow with the deleted rows,
+the deleted rows are found by the purge job ('src.utils.purging') by the partial index of 'deleted_at'
+('WHERE deleted_at IS NOT NULL') that each model declares.
+"""
+from sqlalchemy import Column, DateTime, event, func
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+from sqlalchemy.sql import Executable
+
+
+class ChangeTrackingMixin:
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now(), index=True)
+    deleted_at = Column(DateTime, default=None)
+
+
+def exclude_deleted_rows(statement: Executable) -> Executable:
+    """:return: ORM statement that excludes the deleted rows of all models with change tracking."""
+    return statement.options(
+        with_loader_criteria(ChangeTrackingMixin,
+                             lambda cls: cls.deleted_at.is_(None),
+                             include_aliases=True)
+    )
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _exclude_deleted_rows(execute_state: ORMExecuteState) -> None:
+    if (
+            execute_state.is_select
+            and not execute_state.is_column_load
+            and not execute_state.execution_options.get('include_deleted', False)
+    ):
+        execute_state.statement = exclude_deleted_rows(execute_state.statement)
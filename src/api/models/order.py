@@ -1,15 +1,36 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy import (DDL, Column, Index, Integer, Float, String, DateTime, ForeignKey, Sequence, event,
+                        text)
 from sqlalchemy.orm import relationship
 
 from src.db.db_sqlalchemy import BaseModel
+from src.api.models.change_tracking import ChangeTrackingMixin
 from src.api.models.relationships import orders_tables
 
 
-class OrderModel(BaseModel):
+ORDERS_ID_SEQUENCE = Sequence('orders_id_seq')
+
+
+class OrderModel(ChangeTrackingMixin, BaseModel):
     __tablename__ = 'orders'
+    # Deleted orders are excluded from all queries, so the indexes cover the not deleted orders only.
+    __table_args__ = (
+        # Orders of the client ordered by start.
+        Index('ix_orders_user_id_start_datetime', 'user_id', 'start_datetime',
+              postgresql_where=text('deleted_at IS NULL')),
+        # Orders by time range.
+        Index('ix_orders_start_datetime_end_datetime', 'start_datetime', 'end_datetime',
+              postgresql_where=text('deleted_at IS NULL')),
+        # Deleted orders for the purge.
+        Index('ix_orders_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL')),
+        # Orders are partitioned by month of the start, see 'src.utils.partitioning'.
+        {'postgresql_partition_by': 'RANGE (start_datetime)'}
+    )
 
-    id = Column(Integer, primary_key=True)
-    start_datetime = Column(DateTime)
+    # Ids are given by the sequence, so the concurrent orders get different ids
+    # and the ids of the archived and purged orders are not given again.
+    id = Column(Integer, ORDERS_ID_SEQUENCE, server_default=ORDERS_ID_SEQUENCE.next_value(), primary_key=True)
+    # The partition key must be a part of the primary key.
+    start_datetime = Column(DateTime, primary_key=True)
     end_datetime = Column(DateTime)
     status = Column(String(length=25))
     cost = Column(Float(precision=2))
@@ -25,3 +46,10 @@ class OrderModel(BaseModel):
                           )
 
 
+# Rows are inserted only if there is a partition for them,
+# the default partition takes the rows of the months without partitions.
+event.listen(
+    OrderModel.__table__,
+    'after_create',
+    DDL('CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT').execute_if(dialect='postgresql')
+)
@@ -1,18 +1,37 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import (DDL, Table, Column, DateTime, ForeignKey, ForeignKeyConstraint, Identity, Index,
+                        Integer, event)
 
 from src.db.db_sqlalchemy import BaseModel
 
 # relationship many to many
+# Rows are partitioned like the orders by month of the order start, see 'src.utils.partitioning'.
 orders_tables = Table(
     'orders_tables',
     BaseModel.metadata,
-    Column('id', Integer, primary_key=True),
-    Column('order_id', Integer, ForeignKey('orders.id',
-                                           onupdate='CASCADE',
-                                           ondelete='CASCADE')
-           ),
+    Column('id', Integer, Identity(), primary_key=True),
+    Column('order_id', Integer),
     Column('table_id', Integer, ForeignKey('tables.id',
                                            onupdate='CASCADE',
                                            ondelete='CASCADE')
-           )
+           ),
+    # The partition key must be a part of the primary key and the order reference.
+    Column('start_datetime', DateTime, primary_key=True),
+    ForeignKeyConstraint(['order_id', 'start_datetime'],
+                         ['orders.id', 'orders.start_datetime'],
+                         name='orders_tables_order_id_start_datetime_fkey',
+                         onupdate='CASCADE',
+                         ondelete='CASCADE'),
+    # Orders of the tables (booking checks) and tables of the orders (nested tables).
+    Index('ix_orders_tables_table_id_order_id', 'table_id', 'order_id'),
+    Index('ix_orders_tables_order_id', 'order_id'),
+    postgresql_partition_by='RANGE (start_datetime)'
+)
+
+# Rows are inserted only if there is a partition for them,
+# the default partition takes the rows of the months without partitions.
+event.listen(
+    orders_tables,
+    'after_create',
+    DDL('CREATE TABLE IF NOT EXISTS orders_tables_default PARTITION OF orders_tables DEFAULT')
+    .execute_if(dialect='postgresql')
 )
@@ -0,0 +1,97 @@
+"""
+Materialized views of the reports, they are refreshed by celery beat ('REPORTS_REFRESH_INTERVAL').
+
+Views aggregate the live and the archived orders that are not deleted.
+Each view has the unique index, so it is refreshed 'CONCURRENTLY' without blocking the reads.
+Views are described by the tables of the separate metadata to be queried,
+so 'create_all' does not create them as tables.
+"""
+from sqlalchemy import DDL, Table, Column, Date, DateTime, Float, Integer, MetaData, String, event
+
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.db.db_sqlalchemy import BaseModel
+
+views_metadata = MetaData()
+
+ORDERS_SQL: str = (
+    'SELECT id, start_datetime, end_datetime, status, cost, user_id FROM orders WHERE deleted_at IS NULL '
+    'UNION ALL '
+    f'SELECT id, start_datetime, end_datetime, status, cost, user_id FROM {orders_archive.name} '
+    'WHERE deleted_at IS NULL'
+)
+# Order cost is split between the order tables in proportion to their prices.
+ORDER_TABLES_SQL: str = (
+    'SELECT CAST(o.start_datetime AS date) AS day, t.id AS table_id, t.type AS table_type, '
+    'ceil(extract(epoch FROM o.end_datetime - o.start_datetime) / 3600) AS hours, '
+    'coalesce(o.cost * t.price_per_hour '
+    '/ nullif(sum(t.price_per_hour) OVER (PARTITION BY o.id), 0), 0) AS revenue '
+    f'FROM ({ORDERS_SQL}) AS o '
+    'JOIN (SELECT order_id, table_id FROM orders_tables '
+    f'UNION ALL SELECT order_id, table_id FROM {orders_tables_archive.name}) AS ot ON ot.order_id = o.id '
+    'JOIN tables AS t ON t.id = ot.table_id'
+)
+# View name: (select, unique index columns).
+REPORT_VIEWS: dict[str, tuple[str, tuple[str, ...]]] = {
+    'mv_daily_table_revenue': (
+        'SELECT day, table_id, table_type, count(*) AS bookings, sum(revenue) AS revenue '
+        f'FROM ({ORDER_TABLES_SQL}) AS order_tables GROUP BY day, table_id, table_type',
+        ('day', 'table_id')
+    ),
+    'mv_daily_table_booked_hours': (
+        'SELECT day, table_id, count(*) AS bookings, sum(hours) AS booked_hours '
+        f'FROM ({ORDER_TABLES_SQL}) AS order_tables GROUP BY day, table_id',
+        ('day', 'table_id')
+    ),
+    'mv_user_orders': (
+        "SELECT user_id, count(*) AS orders, count(*) FILTER (WHERE status = 'confirmed') AS confirmed_orders, "
+        "coalesce(sum(cost), 0) AS total_cost, "
+        "min(start_datetime) AS first_order_at, max(start_datetime) AS last_order_at "
+        f"FROM ({ORDERS_SQL}) AS o WHERE user_id IS NOT NULL GROUP BY user_id",
+        ('user_id',)
+    )
+}
+
+daily_table_revenue = Table(
+    'mv_daily_table_revenue',
+    views_metadata,
+    Column('day', Date, primary_key=True),
+    Column('table_id', Integer, primary_key=True),
+    Column('table_type', String(length=50)),
+    Column('bookings', Integer),
+    Column('revenue', Float)
+)
+
+daily_table_booked_hours = Table(
+    'mv_daily_table_booked_hours',
+    views_metadata,
+    Column('day', Date, primary_key=True),
+    Column('table_id', Integer, primary_key=True),
+    Column('bookings', Integer),
+    Column('booked_hours', Float)
+)
+
+user_orders = Table(
+    'mv_user_orders',
+    views_metadata,
+    Column('user_id', Integer, primary_key=True),
+    Column('orders', Integer),
+    Column('confirmed_orders', Integer),
+    Column('total_cost', Float),
+    Column('first_order_at', DateTime),
+    Column('last_order_at', DateTime)
+)
+
+# Views are created after all tables and dropped before them.
+for view_name, (view_select, unique_columns) in REPORT_VIEWS.items():
+    event.listen(
+        BaseModel.metadata,
+        'after_create',
+        DDL(f'CREATE MATERIALIZED VIEW IF NOT EXISTS {view_name} AS {view_select}; '
+            f'CREATE UNIQUE INDEX IF NOT EXISTS ix_{view_name}_{"_".join(unique_columns)} '
+            f'ON {view_name} ({", ".join(unique_columns)})').execute_if(dialect='postgresql')
+    )
+    event.listen(
+        BaseModel.metadata,
+        'before_drop',
+        DDL(f'DROP MATERIALIZED VIEW IF EXISTS {view_name}').execute_if(dialect='postgresql')
+    )
@@ -1,13 +1,20 @@
-from sqlalchemy import Column, Integer, String, Time
+from sqlalchemy import Column, Index, Integer, String, Time, text
 
 from src.db.db_sqlalchemy import BaseModel
+from src.api.models.change_tracking import ChangeTrackingMixin
 
 
-class ScheduleModel(BaseModel):
+class ScheduleModel(ChangeTrackingMixin, BaseModel):
     __tablename__ = "schedules"
+    # Deleted schedules keep their data, so the day must be unique among not deleted schedules only.
+    __table_args__ = (
+        Index('ix_schedules_day', 'day', unique=True, postgresql_where=text('deleted_at IS NULL')),
+        # Deleted schedules for the purge.
+        Index('ix_schedules_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL')),
+    )
 
     id = Column(Integer, primary_key=True)
-    day = Column(String(length=25), unique=True)
+    day = Column(String(length=25))
     open_time = Column(Time)
     close_time = Column(Time)
     break_start_time = Column(Time, default=None)
@@ -1,12 +1,20 @@
-from sqlalchemy import Column, Integer, Float, String
+from sqlalchemy import Column, Index, Integer, Float, String, text
 from sqlalchemy.orm import relationship
 
 from src.db.db_sqlalchemy import BaseModel
+from src.api.models.change_tracking import ChangeTrackingMixin
 from src.api.models.relationships import orders_tables
 
 
-class TableModel(BaseModel):
+class TableModel(ChangeTrackingMixin, BaseModel):
     __tablename__ = "tables"
+    __table_args__ = (
+        # Not deleted tables by type and number of seats.
+        Index('ix_tables_type_number_of_seats', 'type', 'number_of_seats',
+              postgresql_where=text('deleted_at IS NULL')),
+        # Deleted tables for the purge.
+        Index('ix_tables_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL')),
+    )
 
     id = Column(Integer, primary_key=True)
     type = Column(String(length=50))
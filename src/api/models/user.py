@@ -1,15 +1,29 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String, text
+from sqlalchemy.orm import relationship
 
 from src.db.db_sqlalchemy import BaseModel
+from src.api.models.change_tracking import ChangeTrackingMixin
+from src.api.models.user_order_stats import UserOrderStatsModel
 
 
-class UserModel(BaseModel):
+class UserModel(ChangeTrackingMixin, BaseModel):
     __tablename__ = 'users'
+    # Deleted users keep their data, so the values must be unique among not deleted users only.
+    __table_args__ = (
+        Index('ix_users_username', 'username', unique=True, postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_users_email', 'email', unique=True, postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_users_phone', 'phone', unique=True, postgresql_where=text('deleted_at IS NULL')),
+        # Deleted users for the purge.
+        Index('ix_users_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL')),
+    )
 
     id = Column(Integer, primary_key=True)
-    username = Column(String(length=100), unique=True, index=True)
+    username = Column(String(length=100))
     hashed_password = Column(String(length=100))
-    email = Column(String(length=100), unique=True, index=True)
-    phone = Column(String(length=15), unique=True, index=True)
+    email = Column(String(length=100))
+    phone = Column(String(length=15))
     role = Column(String(length=100))
     status = Column(String(length=25))
+
+    # Kept by the triggers of the orders, see 'src.api.models.user_order_stats'.
+    order_stats = relationship(UserOrderStatsModel, uselist=False, viewonly=True)
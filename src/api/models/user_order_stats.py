@@ -0,0 +1,72 @@
+from sqlalchemy import DDL, Column, DateTime, Float, ForeignKey, Integer, event
+
+from src.db.db_sqlalchemy import BaseModel
+
+# Stats are changed by the row triggers of the orders and the archive in the same transaction,
+# so every change of the orders is counted, the bulk statements and the archival too.
+# Only not deleted orders are counted, the row of the user is removed when the user has no orders.
+APPLY_FUNCTION_SQL: str = """
+CREATE OR REPLACE FUNCTION apply_user_order_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (OLD.user_id, OLD.cost, OLD.start_datetime, OLD.deleted_at)
+                            IS NOT DISTINCT FROM (NEW.user_id, NEW.cost, NEW.start_datetime, NEW.deleted_at) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL AND OLD.deleted_at IS NULL THEN
+        UPDATE user_order_stats
+        SET orders_count = orders_count - 1, total_spent = total_spent - coalesce(OLD.cost, 0)
+        WHERE user_id = OLD.user_id;
+        DELETE FROM user_order_stats WHERE user_id = OLD.user_id AND orders_count <= 0;
+        -- The last order is searched by the index only if it was the removed one.
+        UPDATE user_order_stats
+        SET last_order_at = greatest(
+            (SELECT max(start_datetime) FROM orders WHERE user_id = OLD.user_id AND deleted_at IS NULL),
+            (SELECT max(start_datetime) FROM orders_archive WHERE user_id = OLD.user_id AND deleted_at IS NULL)
+        )
+        WHERE user_id = OLD.user_id AND last_order_at <= OLD.start_datetime;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.user_id IS NOT NULL AND NEW.deleted_at IS NULL THEN
+        INSERT INTO user_order_stats AS stats (user_id, orders_count, total_spent, last_order_at)
+        VALUES (NEW.user_id, 1, coalesce(NEW.cost, 0), NEW.start_datetime)
+        ON CONFLICT (user_id) DO UPDATE
+        SET orders_count = stats.orders_count + 1,
+            total_spent = stats.total_spent + excluded.total_spent,
+            last_order_at = greatest(stats.last_order_at, excluded.last_order_at);
+    END IF;
+    RETURN NULL;
+END $$
+"""
+STATS_TRIGGER_TABLES: tuple[str, ...] = ('orders', 'orders_archive')
+
+
+class UserOrderStatsModel(BaseModel):
+    __tablename__ = 'user_order_stats'
+
+    user_id = Column(Integer, ForeignKey('users.id',
+                                         onupdate='CASCADE',
+                                         ondelete='CASCADE'),
+                     primary_key=True
+                     )
+    orders_count = Column(Integer, nullable=False, default=0)
+    total_spent = Column(Float, nullable=False, default=0)
+    last_order_at = Column(DateTime)
+
+
+# The triggers are created when all tables are created.
+event.listen(BaseModel.metadata, 'after_create', DDL(APPLY_FUNCTION_SQL).execute_if(dialect='postgresql'))
+for table_name in STATS_TRIGGER_TABLES:
+    event.listen(
+        BaseModel.metadata,
+        'after_create',
+        DDL(f'DROP TRIGGER IF EXISTS {table_name}_user_order_stats ON {table_name}; '
+            f'CREATE TRIGGER {table_name}_user_order_stats '
+            f'AFTER INSERT OR UPDATE OR DELETE ON {table_name} '
+            f'FOR EACH ROW EXECUTE FUNCTION apply_user_order_stats()').execute_if(dialect='postgresql')
+    )
+event.listen(
+    BaseModel.metadata,
+    'before_drop',
+    DDL('DROP FUNCTION IF EXISTS apply_user_order_stats() CASCADE').execute_if(dialect='postgresql')
+)
@@ -0,0 +1,39 @@
+from dataclasses import asdict
+
+from fastapi import Depends
+from fastapi.responses import ORJSONResponse
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+from sqlalchemy.orm import Session
+
+from src.api.models.user import UserModel
+from src.api.crud_operations.batch import BatchOperation
+from src.api.swagger.batch import BatchInterfacePost, BatchOutputPost
+from src.api.dependencies.db import get_db
+from src.api.dependencies.auth import get_current_confirmed_user
+
+# Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
+# So I have a prefix in each function.
+router = InferringRouter(tags=['batch'])
+
+
+@cbv(router)
+class Batch:
+    db: Session = Depends(get_db)
+    user: UserModel = Depends(get_current_confirmed_user)
+
+    def __init__(self):
+        self.batch_operation = BatchOperation(db=self.db, user=self.user)
+
+    @router.post('/batch', **asdict(BatchOutputPost()))
+    def execute_batch(self,
+                      batch: BatchInterfacePost = Depends()
+                      ) -> ORJSONResponse:
+        """
+        Executes several operations of orders, tables, schedules and users in one db transaction.
+        The user is authenticated once for all operations.
+        Available to all confirmed users,
+        each operation requires the role of the resource endpoint.
+        """
+        results, committed = self.batch_operation.execute(batch.data.operations, batch.data.atomic)
+        return ORJSONResponse(content={'committed': committed, 'results': results})
@@ -0,0 +1,27 @@
+from dataclasses import asdict
+
+from fastapi import Depends
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+
+from src.api.models.user import UserModel
+from src.api.swagger.cache import CacheOutputGetStats
+from src.api.dependencies.auth import get_current_admin_or_superuser
+from src.utils.response_cache.main import ResponseCache
+
+# Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
+# So I have a prefix in each function.
+router = InferringRouter(tags=['cache'])
+
+
+@cbv(router)
+class Cache:
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+    @router.get('/cache/stats/', **asdict(CacheOutputGetStats()))
+    def get_cache_stats(self) -> list[dict]:
+        """
+        Returns hit statistics of the response cache.
+        Only available to admins.
+        """
+        return ResponseCache.get_stats()
@@ -1,33 +1,73 @@
 from dataclasses import asdict
+from pathlib import Path as FilePath
 
-from fastapi import Depends, Path, status
-from fastapi.responses import JSONResponse
+from fastapi import Depends, Path, Request, status
+from celery.result import AsyncResult
+from fastapi.responses import (FileResponse, JSONResponse, ORJSONResponse, Response,
+                               StreamingResponse)
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from sqlalchemy.orm import Session
 
 from src.api.models.user import UserModel
 from src.api.models.order import OrderModel
+from src.api.schemes.order.base_schemes import OrderGetSchema
 from src.api.crud_operations.order import OrderOperation
 from src.api.swagger.order import (
-    OrderInterfaceGetAll,
+    OrderInterfaceGetPage,
+    OrderInterfaceExport,
+    OrderInterfaceStartExportJob,
+    OrderInterfaceExportJob,
+    OrderInterfaceGetBatch,
+    OrderInterfaceGetChanges,
+    OrderInterfaceDeleteBulk,
+    OrderInterfacePatchBulk,
+    OrderInterfaceGet,
     OrderInterfacePatch,
     OrderInterfacePost,
+    OrderInterfacePostBulk,
 
     OrderOutputGetAll,
+    OrderOutputExport,
+    OrderOutputStartExportJob,
+    OrderOutputGetExportJob,
+    OrderOutputDownloadExportJob,
+    OrderOutputGetBatch,
+    OrderOutputGetChanges,
+    OrderOutputDeleteBulk,
+    OrderOutputPatchBulk,
     OrderOutputGet,
     OrderOutputPatch,
     OrderOutputDelete,
-    OrderOutputPost
+    OrderOutputPost,
+    OrderOutputPostBulk
 )
 from src.api.dependencies.db import get_db
 from src.api.dependencies.auth import get_current_confirmed_user
+from src.config import get_settings
+from src.utils.exceptions import JSONException
 from src.utils.response_generation.main import get_text
+from src.utils.response_cache.main import serialize_response_data
+from src.utils.response_cache.conditional import ConditionalGet
+from src.utils.sparse_fieldsets.main import convert_to_response_data, parse_fields, parse_include
+from src.utils.multi_get.main import (make_batch_response_data,
+                                      make_bulk_response_data,
+                                      parse_ids)
+from src.utils.delta_sync.main import decode_cursor, make_changes_response_data
+from src.utils.ndjson.main import NDJSON_MEDIA_TYPE, iterate_ndjson
+from src.utils.columnar_export.main import EXPORT_MEDIA_TYPES
+from src.utils.celery.celery_tasks import export_orders_to_file
+from src.api.crud_operations.utils.other import process_end_datetime
+
+settings = get_settings()
 
 # Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
 # So I have a prefix in each function.
 router = InferringRouter(tags=['order'])
 
+# Orders contain nested tables, so the responses depend on both.
+order_conditional_get = ConditionalGet(route='/orders/{order_id}', resources=('orders', 'tables'))
+
 
 @cbv(router)
 class Order:
@@ -39,8 +79,8 @@ class Order:
 
     @router.get('/orders/',  **asdict(OrderOutputGetAll()))
     def get_all_orders(self,
-                       order: OrderInterfaceGetAll = Depends()
-                       ) -> list[OrderModel] | list[None]:
+                       order: OrderInterfaceGetPage = Depends()
+                       ) -> ORJSONResponse:
         """
         Returns all orders from db by parameters.
         Available to all confirmed users.
@@ -56,10 +96,184 @@ class Order:
             'user_id': order.user_id,
             'tables': order.tables
         }
-        return self.order_operation.find_all_by_params(**params)
+        self.order_operation.fields = parse_include(order.include,
+                                                    parse_fields(order.fields, OrderGetSchema),
+                                                    OrderModel)
+        orders, totals = self.order_operation.find_all_by_params_as_dicts(
+            limit=order.limit,
+            offset=order.offset,
+            totals=tuple(order.with_.split(',')) if order.with_ else (),
+            **params
+        )
+        # Orders are built from db rows in the response format,
+        # so they are not validated by the response model again.
+        return ORJSONResponse(content=orders, headers=self._make_totals_headers(totals))
+
+    # These must be declared before '/orders/{order_id}',
+    # else 'export', 'batch', 'changes' and 'bulk' are taken as the order id.
+    @router.get('/orders/export', **asdict(OrderOutputExport()))
+    def export_orders(self,
+                      order: OrderInterfaceExport = Depends()
+                      ) -> StreamingResponse:
+        """
+        Streams all orders from db by parameters as NDJSON.
+        Only available to admins.
+        """
+        params: dict = {
+            'start_datetime': order.start_datetime,
+            'end_datetime': order.end_datetime,
+            'status': order.status,
+            'cost': order.cost,
+            'user_id': order.user_id,
+            'tables': order.tables
+        }
+        self.order_operation.fields = parse_include(order.include,
+                                                    parse_fields(order.fields, OrderGetSchema),
+                                                    OrderModel)
+        # The db session is closed after the response is sent.
+        return StreamingResponse(
+            content=iterate_ndjson(self.order_operation.stream_all_by_params_as_dicts(**params)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={'Content-Disposition': 'attachment; filename="orders.ndjson"'}
+        )
+
+    @router.post('/orders/export/jobs', **asdict(OrderOutputStartExportJob()))
+    def start_export_job(self,
+                         export: OrderInterfaceStartExportJob = Depends()
+                         ) -> JSONResponse:
+        """
+        Starts the background export of orders with their tables to the file using celery.
+        Only available to admins.
+        """
+        task: AsyncResult = export_orders_to_file.delay(
+            start_datetime=export.start_datetime.isoformat() if export.start_datetime else None,
+            end_datetime=(process_end_datetime(export.end_datetime).isoformat()
+                          if export.end_datetime else None)
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={'task_id': task.id, 'status': task.state}
+        )
+
+    @router.get('/orders/export/jobs/{task_id}', **asdict(OrderOutputGetExportJob()))
+    def get_export_job(self,
+                       export: OrderInterfaceExportJob = Depends()
+                       ) -> JSONResponse:
+        """
+        Returns the status of the background export from the celery result backend.
+        Only available to admins.
+        """
+        task: AsyncResult = export_orders_to_file.AsyncResult(str(export.task_id))
+        content: dict = {'task_id': task.id, 'status': task.state}
+        if task.state == 'FAILURE':
+            content['error'] = str(task.result)
+        elif isinstance(task.info, dict):
+            # Progress or the result of the finished export.
+            content.update(task.info)
+        return JSONResponse(status_code=status.HTTP_200_OK, content=content)
+
+    @router.get('/orders/export/jobs/{task_id}/file', **asdict(OrderOutputDownloadExportJob()))
+    def download_export_job(self,
+                            export: OrderInterfaceExportJob = Depends()
+                            ) -> FileResponse:
+        """
+        Returns the file of the finished background export.
+        Only available to admins.
+        """
+        task: AsyncResult = export_orders_to_file.AsyncResult(str(export.task_id))
+        if task.state != 'SUCCESS':
+            raise JSONException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                message=get_text('err_export_not_ready').format(task.id, task.state)
+            )
+        file_path: FilePath = settings.EXPORT_DIR.joinpath(task.result['file_name'])
+        return FileResponse(path=file_path,
+                            media_type=EXPORT_MEDIA_TYPES[task.result['format']],
+                            filename=f"orders.{task.result['format']}")
+
+    @router.get("/orders/batch", **asdict(OrderOutputGetBatch()))
+    def get_orders_batch(self,
+                         order: OrderInterfaceGetBatch = Depends()
+                         ) -> ORJSONResponse:
+        """
+        Returns orders from db by the list of order ids with one query.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        It will only find orders associated with the user id,
+        other ids are returned as missing.
+        """
+        ids: list[int] = parse_ids(order.ids)
+        self.order_operation.fields = parse_include(order.include,
+                                                    parse_fields(order.fields, OrderGetSchema),
+                                                    OrderModel)
+        return ORJSONResponse(content=make_batch_response_data(
+            ids,
+            self.order_operation.find_by_ids(ids),
+            lambda order_obj: convert_to_response_data(order_obj,
+                                                       OrderGetSchema,
+                                                       self.order_operation.fields)
+        ))
+
+    @router.get("/orders/changes", **asdict(OrderOutputGetChanges()))
+    def get_orders_changes(self,
+                           order: OrderInterfaceGetChanges = Depends()
+                           ) -> ORJSONResponse:
+        """
+        Returns orders changed after the cursor and ids of deleted orders in the order of change time.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        It will only find orders associated with the user id.
+        """
+        self.order_operation.fields = parse_include(order.include,
+                                                    parse_fields(order.fields, OrderGetSchema),
+                                                    OrderModel)
+        return ORJSONResponse(content=make_changes_response_data(
+            self.order_operation.find_changes(decode_cursor(order.since), order.limit),
+            order.since,
+            order.limit,
+            lambda order_obj: convert_to_response_data(order_obj,
+                                                       OrderGetSchema,
+                                                       self.order_operation.fields)
+        ))
+
+    @router.delete("/orders/bulk", **asdict(OrderOutputDeleteBulk()))
+    def delete_orders_bulk(self,
+                           order: OrderInterfaceDeleteBulk = Depends()
+                           ) -> JSONResponse:
+        """
+        Deletes all orders found by ids and (or) parameters by one statement.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        It will only delete orders associated with the user id.
+        """
+        ids, params = self._parse_bulk_condition(order)
+        if order.dry_run:
+            return JSONResponse(content=make_bulk_response_data(self.order_operation.count_objs(ids, params)))
+        deleted_ids: list[int] = self.order_operation.delete_objs(ids, params)
+        return JSONResponse(content=make_bulk_response_data(deleted_ids))
+
+    @router.patch("/orders/bulk", **asdict(OrderOutputPatchBulk()))
+    def patch_orders_bulk(self,
+                          order: OrderInterfacePatchBulk = Depends()
+                          ) -> JSONResponse:
+        """
+        Updates all orders found by ids and (or) parameters with the same data by one statement.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        It will only update orders associated with the user id,
+        'status', 'cost' and 'user_id' are not changed.
+        """
+        ids, params = self._parse_bulk_condition(order)
+        if order.dry_run:
+            return JSONResponse(content=make_bulk_response_data(self.order_operation.count_objs(ids, params)))
+        updated_ids: list[int] = self.order_operation.update_objs(ids, params, order.data)
+        return JSONResponse(content=make_bulk_response_data(updated_ids))
 
     @router.get("/orders/{order_id}", **asdict(OrderOutputGet()))
-    def get_order(self, order_id: int = Path(..., ge=1)) -> OrderModel | None:
+    def get_order(self,
+                  request: Request,
+                  order: OrderInterfaceGet = Depends()
+                  ) -> Response:
         """
         Returns one order from db by order id.
         Available to all confirmed users.
@@ -67,7 +281,18 @@ class Order:
         It will return the order only if the order is associated with this user,
         else return None.
         """
-        return self.order_operation.find_by_id(order_id)
+        self.order_operation.fields = parse_include(order.include,
+                                                    parse_fields(order.fields, OrderGetSchema),
+                                                    OrderModel)
+        # Clients see only their own orders, so each client has its own response.
+        access_group: str = ('staff' if self.order_operation.check_user_access()
+                             else f'user:{self.user.id}')
+        return order_conditional_get.get_response(
+            request=request,
+            params={'order_id': order.order_id, 'fields': self.order_operation.fields},
+            access_group=access_group,
+            respond=lambda: self._make_order_response(order.order_id)
+        )
 
     @router.delete("/orders/{order_id}", **asdict(OrderOutputDelete()))
     def delete_order(self, order_id: int = Path(..., ge=1)) -> JSONResponse:
@@ -117,3 +342,55 @@ class Order:
             status_code=status.HTTP_201_CREATED,
             content={"message": get_text('post').format(self.order_operation.model_name, order.id)}
         )
+
+    @router.post("/orders/bulk", **asdict(OrderOutputPostBulk()))
+    def add_orders(self,
+                   orders: OrderInterfacePostBulk = Depends()
+                   ) -> JSONResponse:
+        """
+        Adds several orders into db in one transaction, invalid orders are skipped.
+        Available to all confirmed users.
+        """
+        results: list[dict] = self.order_operation.add_objs(orders.data.orders)
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={'created': sum(result['status_code'] == status.HTTP_201_CREATED for result in results),
+                     'results': results}
+        )
+
+    @staticmethod
+    def _parse_bulk_condition(order: OrderInterfaceDeleteBulk) -> tuple[list[int] | None, dict]:
+        """Gets the ids and the search parameters of the bulk operations."""
+        params: dict = {
+            'start_datetime': order.start_datetime,
+            'end_datetime': order.end_datetime,
+            'status': order.status,
+            'cost': order.cost,
+            'user_id': order.user_id,
+            'tables': order.tables
+        }
+        return (parse_ids(order.ids) if order.ids is not None else None), params
+
+    @staticmethod
+    def _make_totals_headers(totals: dict[str, int | float]) -> dict[str, str]:
+        """Converts the totals from 'find_all_by_params_as_dicts' to the response headers."""
+        headers: dict[str, str] = {}
+        if 'count' in totals:
+            headers.update({'X-Total-Count': str(totals['count']), 'X-Total-Count-Type': 'exact'})
+        if 'estimated_count' in totals:
+            headers.update({'X-Total-Count': str(totals['estimated_count']),
+                            'X-Total-Count-Type': 'estimated'})
+        if 'sum_cost' in totals:
+            headers['X-Total-Sum-Cost'] = str(float(totals['sum_cost']))
+        return headers
+
+    def _make_order_response(self, order_id: int) -> Response:
+        """Finds the order by id and serializes it, the response is 'null' if there is no order."""
+        order_obj: OrderModel | None = self.order_operation.find_by_id(order_id)
+        return Response(
+            content=serialize_response_data(
+                convert_to_response_data(order_obj, OrderGetSchema, self.order_operation.fields)
+            ),
+            media_type='application/json'
+        )
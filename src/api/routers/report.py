@@ -0,0 +1,88 @@
+from dataclasses import asdict
+
+from fastapi import Depends
+from fastapi.responses import ORJSONResponse
+from fastapi_utils.cbv import cbv
+from fastapi_utils.inferring_router import InferringRouter
+from sqlalchemy.orm import Session
+
+from src.api.dependencies.db import get_db
+from src.api.models.user import UserModel
+from src.api.crud_operations.report import ReportOperation
+from src.api.swagger.report import (ReportInterfaceGetBookedHours,
+                                    ReportInterfaceGetOccupancy,
+                                    ReportInterfaceGetTableRevenue,
+                                    ReportInterfaceGetTypeRevenue,
+                                    ReportInterfaceGetUserOrders,
+                                    ReportOutputGetBookedHours,
+                                    ReportOutputGetOccupancy,
+                                    ReportOutputGetTableRevenue,
+                                    ReportOutputGetTypeRevenue,
+                                    ReportOutputGetUserOrders)
+from src.api.dependencies.auth import get_current_admin_or_superuser
+
+# Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
+# So I have a prefix in each function.
+router = InferringRouter(tags=['reports'])
+
+
+@cbv(router)
+class Report:
+    db: Session = Depends(get_db)
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+    def __init__(self):
+        self.report_operation = ReportOperation(db=self.db)
+
+    @router.get('/reports/revenue/tables/', **asdict(ReportOutputGetTableRevenue()))
+    def get_table_revenue(self, report: ReportInterfaceGetTableRevenue = Depends()) -> list[dict]:
+        """
+        Returns the daily revenue of the tables.
+        Only available to admins.
+        """
+        return self.report_operation.find_daily_revenue(start_date=report.start_date,
+                                                        end_date=report.end_date,
+                                                        table_id=report.table_id,
+                                                        type=report.type,
+                                                        by='table')
+
+    @router.get('/reports/revenue/types/', **asdict(ReportOutputGetTypeRevenue()))
+    def get_type_revenue(self, report: ReportInterfaceGetTypeRevenue = Depends()) -> list[dict]:
+        """
+        Returns the daily revenue of the table types.
+        Only available to admins.
+        """
+        return self.report_operation.find_daily_revenue(start_date=report.start_date,
+                                                        end_date=report.end_date,
+                                                        type=report.type,
+                                                        by='type')
+
+    @router.get('/reports/booked_hours/', **asdict(ReportOutputGetBookedHours()))
+    def get_booked_hours(self, report: ReportInterfaceGetBookedHours = Depends()) -> list[dict]:
+        """
+        Returns the daily booked hours of the tables.
+        Only available to admins.
+        """
+        return self.report_operation.find_daily_booked_hours(start_date=report.start_date,
+                                                             end_date=report.end_date,
+                                                             table_id=report.table_id)
+
+    @router.get('/reports/users/', **asdict(ReportOutputGetUserOrders()))
+    def get_user_orders(self, report: ReportInterfaceGetUserOrders = Depends()) -> list[dict]:
+        """
+        Returns the order stats of the users.
+        Only available to admins.
+        """
+        return self.report_operation.find_user_orders(user_id=report.user_id)
+
+    @router.get('/reports/occupancy/', **asdict(ReportOutputGetOccupancy()))
+    def get_occupancy(self, report: ReportInterfaceGetOccupancy = Depends()) -> ORJSONResponse:
+        """
+        Returns the occupancy heatmap of the tables.
+        Only available to admins.
+        """
+        # The arrays are built by numpy in the response format,
+        # so they are not validated by the response model again.
+        return ORJSONResponse(content=self.report_operation.find_occupancy(start_date=report.start_date,
+                                                                           end_date=report.end_date,
+                                                                           type=report.type))
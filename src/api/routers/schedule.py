@@ -1,21 +1,25 @@
 from dataclasses import asdict
 
-from fastapi import Depends, Path, status
-from fastapi.responses import JSONResponse
+from fastapi import BackgroundTasks, Depends, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from sqlalchemy.orm import Session
 
 from src.api.models.user import UserModel
-from src.api.models.schedule import ScheduleModel
 from src.api.crud_operations.schedule import ScheduleOperation
 from src.api.swagger.schedule import (
     ScheduleInterfaceGetAll,
+    ScheduleInterfaceGetBatch,
+    ScheduleInterfaceGetChanges,
+    ScheduleInterfaceGet,
     ScheduleInterfaceDelete,
     ScheduleInterfacePatch,
     ScheduleInterfacePost,
 
     ScheduleOutputGetAll,
+    ScheduleOutputGetBatch,
+    ScheduleOutputGetChanges,
     ScheduleOutputGet,
     ScheduleOutputDelete,
     ScheduleOutputPatch,
@@ -26,11 +30,19 @@ from src.api.schemes.schedule.base_schemes import ScheduleGetSchema
 from src.api.dependencies.db import get_db
 from src.api.dependencies.auth import get_current_confirmed_user
 from src.utils.response_generation.main import get_text
+from src.utils.response_cache.main import ResponseCache
+from src.utils.response_cache.conditional import ConditionalGet
+from src.utils.sparse_fieldsets.main import convert_to_response_data, parse_fields
+from src.utils.multi_get.main import make_batch_response_data, parse_ids
+from src.utils.delta_sync.main import decode_cursor, make_changes_response_data
 
 # Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
 # So I have a prefix in each function.
 router = InferringRouter(tags=['schedule'])
 
+schedules_cache = ResponseCache(route='/schedules/', resources=('schedules',))
+schedules_conditional_get = ConditionalGet(route='/schedules/', resources=('schedules',))
+
 
 @cbv(router)
 class Schedule:
@@ -42,28 +54,92 @@ class Schedule:
 
     @router.get("/schedules/", **asdict(ScheduleOutputGetAll()))
     def get_all_schedules(self,
+                          request: Request,
+                          background_tasks: BackgroundTasks,
                           schedule: ScheduleInterfaceGetAll = Depends()
-                          ) -> list[ScheduleModel] | list[None]:
+                          ) -> Response:
         """
         Returns all schedules from db by parameters.
         Available to all confirmed users.
         """
+        self.schedule_operation.fields = parse_fields(schedule.fields, ScheduleGetSchema)
         params: dict = dict(
             day=schedule.day,
             open_time=schedule.open_time,
             close_time=schedule.close_time,
             break_start_time=schedule.break_start_time,
-            break_end_time=schedule.break_end_time
+            break_end_time=schedule.break_end_time,
+            fields=self.schedule_operation.fields
+        )
+        # Schedules are the same for all users.
+        return schedules_conditional_get.get_response(
+            request=request,
+            params=params,
+            access_group='all',
+            respond=lambda: schedules_cache.get_response(
+                params=params,
+                access_group='all',
+                compute=lambda: [convert_to_response_data(schedule_obj,
+                                                          ScheduleGetSchema,
+                                                          self.schedule_operation.fields)
+                                 for schedule_obj in self.schedule_operation.find_all_by_params(**params)],
+                background_tasks=background_tasks,
+                accept_encoding=request.headers.get('accept-encoding')
+            )
         )
-        return self.schedule_operation.find_all_by_params(**params)
+
+    # These must be declared before '/schedules/{schedule_id}',
+    # else 'batch' and 'changes' are taken as the schedule id.
+    @router.get("/schedules/batch", **asdict(ScheduleOutputGetBatch()))
+    def get_schedules_batch(self,
+                            schedule: ScheduleInterfaceGetBatch = Depends()
+                            ) -> ORJSONResponse:
+        """
+        Returns schedules from db by the list of schedule ids with one query.
+        Available to all confirmed users.
+        """
+        ids: list[int] = parse_ids(schedule.ids)
+        self.schedule_operation.fields = parse_fields(schedule.fields, ScheduleGetSchema)
+        return ORJSONResponse(content=make_batch_response_data(
+            ids,
+            self.schedule_operation.find_by_ids(ids),
+            lambda schedule_obj: convert_to_response_data(schedule_obj,
+                                                          ScheduleGetSchema,
+                                                          self.schedule_operation.fields)
+        ))
+
+    @router.get("/schedules/changes", **asdict(ScheduleOutputGetChanges()))
+    def get_schedules_changes(self,
+                              schedule: ScheduleInterfaceGetChanges = Depends()
+                              ) -> ORJSONResponse:
+        """
+        Returns schedules changed after the cursor and ids of deleted schedules in the order of change time.
+        Available to all confirmed users.
+        """
+        self.schedule_operation.fields = parse_fields(schedule.fields, ScheduleGetSchema)
+        return ORJSONResponse(content=make_changes_response_data(
+            self.schedule_operation.find_changes(decode_cursor(schedule.since), schedule.limit),
+            schedule.since,
+            schedule.limit,
+            lambda schedule_obj: convert_to_response_data(schedule_obj,
+                                                          ScheduleGetSchema,
+                                                          self.schedule_operation.fields)
+        ))
 
     @router.get("/schedules/{schedule_id}", **asdict(ScheduleOutputGet()))
-    def get_schedule(self, schedule_id: int = Path(..., ge=1)) -> ScheduleGetSchema:
+    def get_schedule(self,
+                     schedule: ScheduleInterfaceGet = Depends()
+                     ) -> ORJSONResponse:
         """
         Returns one schedule from db by schedule id.
         Available to all confirmed users.
         """
-        return self.schedule_operation.find_by_id_or_404(schedule_id)
+        self.schedule_operation.fields = parse_fields(schedule.fields, ScheduleGetSchema)
+        return ORJSONResponse(content=convert_to_response_data(
+            self.schedule_operation.find_by_id_or_404(schedule.schedule_id),
+            ScheduleGetSchema,
+            self.schedule_operation.fields
+        ))
 
     @router.delete("/schedules/{schedule_id}", **asdict(ScheduleOutputDelete()))
     def delete_schedule(self,
@@ -1,7 +1,7 @@
 from dataclasses import asdict
 
-from fastapi import Depends, Path, status
-from fastapi.responses import JSONResponse
+from fastapi import BackgroundTasks, Depends, Request, status
+from fastapi.responses import JSONResponse, Response
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from sqlalchemy.orm import Session
@@ -12,11 +12,20 @@ from src.api.schemes.relationships.orders_tables import FullTableGetSchema
 from src.api.crud_operations.table import TableOperation
 from src.api.swagger.table import (
     TableInterfaceGetAll,
+    TableInterfaceGetBatch,
+    TableInterfaceGetChanges,
+    TableInterfaceDeleteBulk,
+    TableInterfacePatchBulk,
+    TableInterfaceGet,
     TableInterfaceDelete,
     TableInterfacePatch,
     TableInterfacePost,
 
     TableOutputGetAll,
+    TableOutputGetBatch,
+    TableOutputGetChanges,
+    TableOutputDeleteBulk,
+    TableOutputPatchBulk,
     TableOutputGet,
     TableOutputDelete,
     TableOutputPatch,
@@ -25,11 +34,24 @@ from src.api.swagger.table import (
 from src.api.dependencies.db import get_db
 from src.api.dependencies.auth import get_current_confirmed_user
 from src.utils.response_generation.main import get_text
+from src.utils.response_cache.main import ResponseCache, serialize_response_data
+from src.utils.response_cache.conditional import ConditionalGet
+from src.utils.sparse_fieldsets.main import get_response_schema, parse_fields, parse_include
+from src.utils.multi_get.main import (make_batch_response_data,
+                                      make_bulk_response_data,
+                                      parse_ids)
+from src.utils.delta_sync.main import decode_cursor, make_changes_response_data
 
 # Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
 # So I have a prefix in each function.
 router = InferringRouter(tags=['table'])
 
+# Tables contain nested orders, so the responses depend on both.
+tables_cache = ResponseCache(route='/tables/', resources=('tables', 'orders'))
+table_cache = ResponseCache(route='/tables/{table_id}', resources=('tables', 'orders'))
+tables_conditional_get = ConditionalGet(route='/tables/', resources=('tables', 'orders'))
+table_conditional_get = ConditionalGet(route='/tables/{table_id}', resources=('tables', 'orders'))
+
 
 @cbv(router)
 class Table:
@@ -41,8 +63,10 @@ class Table:
 
     @router.get("/tables/", **asdict(TableOutputGetAll()))
     def get_all_tables(self,
+                       request: Request,
+                       background_tasks: BackgroundTasks,
                        table: TableInterfaceGetAll = Depends()
-                       ) -> list[TableModel] | list[dict] | list[None]:
+                       ) -> Response:
         """
         Returns all tables from db by parameters.
         Available to all confirmed users.
@@ -50,26 +74,113 @@ class Table:
         Instead of a nested full order data,
         it will only return the start and end datetime.
         """
-        table_objs: list[TableModel] = self.table_operation.find_all_by_params(
+        self.table_operation.fields = parse_include(table.include,
+                                                    parse_fields(table.fields, FullTableGetSchema),
+                                                    TableModel)
+        params: dict = dict(
             type=table.type,
             number_of_seats=table.number_of_seats,
             price_per_hour=table.price_per_hour,
             start_datetime=table.start_datetime,
-            end_datetime=table.end_datetime
+            end_datetime=table.end_datetime,
+            fields=self.table_operation.fields
         )
-        if not self.table_operation.check_user_access():
-            return [
-                FullTableGetSchema.from_orm(table_obj).dict(
-                    exclude_unset=True,
-                    exclude={'orders': {'__all__': {'user_id', 'id', 'status', 'cost'}}}
-                )
-                for table_obj in table_objs
-            ]
+        access_group: str = 'staff' if self.table_operation.check_user_access() else 'client'
+        return tables_conditional_get.get_response(
+            request=request,
+            params=params,
+            access_group=access_group,
+            respond=lambda: tables_cache.get_response(
+                params=params,
+                access_group=access_group,
+                compute=lambda: self._find_all_tables(params),
+                background_tasks=background_tasks,
+                accept_encoding=request.headers.get('accept-encoding')
+            )
+        )
+
+    # These must be declared before '/tables/{table_id}',
+    # else 'batch', 'changes' and 'bulk' are taken as the table id.
+    @router.get("/tables/batch", **asdict(TableOutputGetBatch()))
+    def get_tables_batch(self,
+                         table: TableInterfaceGetBatch = Depends()
+                         ) -> Response:
+        """
+        Returns tables from db by the list of table ids with one query.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        Instead of a nested full order data,
+        it will only return the start and end datetime.
+        """
+        ids: list[int] = parse_ids(table.ids)
+        self.table_operation.fields = parse_include(table.include,
+                                                    parse_fields(table.fields, FullTableGetSchema),
+                                                    TableModel)
+        return Response(
+            content=serialize_response_data(make_batch_response_data(
+                ids, self.table_operation.find_by_ids(ids), self._convert_table_to_schema
+            )),
+            media_type='application/json'
+        )
+
+    @router.get("/tables/changes", **asdict(TableOutputGetChanges()))
+    def get_tables_changes(self,
+                           table: TableInterfaceGetChanges = Depends()
+                           ) -> Response:
+        """
+        Returns tables changed after the cursor and ids of deleted tables in the order of change time.
+        Available to all confirmed users.
+        Non-superuser behavior:
+        Instead of a nested full order data,
+        it will only return the start and end datetime.
+        """
+        self.table_operation.fields = parse_include(table.include,
+                                                    parse_fields(table.fields, FullTableGetSchema),
+                                                    TableModel)
+        return Response(
+            content=serialize_response_data(make_changes_response_data(
+                self.table_operation.find_changes(decode_cursor(table.since), table.limit),
+                table.since,
+                table.limit,
+                self._convert_table_to_schema
+            )),
+            media_type='application/json'
+        )
+
+    @router.delete("/tables/bulk", **asdict(TableOutputDeleteBulk()))
+    def delete_tables_bulk(self,
+                           table: TableInterfaceDeleteBulk = Depends()
+                           ) -> JSONResponse:
+        """
+        Deletes all tables found by ids and (or) parameters by one statement.
+        Only available to admins.
+        """
+        ids, params = self._parse_bulk_condition(table)
+        if table.dry_run:
+            return JSONResponse(content=make_bulk_response_data(self.table_operation.count_objs(ids, params)))
+        deleted_ids: list[int] = self.table_operation.delete_objs(ids, params)
+        return JSONResponse(content=make_bulk_response_data(deleted_ids))
 
-        return table_objs
+    @router.patch("/tables/bulk", **asdict(TableOutputPatchBulk()))
+    def patch_tables_bulk(self,
+                          table: TableInterfacePatchBulk = Depends()
+                          ) -> JSONResponse:
+        """
+        Updates all tables found by ids and (or) parameters with the same data by one statement.
+        Only available to admins.
+        """
+        ids, params = self._parse_bulk_condition(table)
+        if table.dry_run:
+            return JSONResponse(content=make_bulk_response_data(self.table_operation.count_objs(ids, params)))
+        updated_ids: list[int] = self.table_operation.update_objs(ids, params, table.data)
+        return JSONResponse(content=make_bulk_response_data(updated_ids))
 
     @router.get("/tables/{table_id}", **asdict(TableOutputGet()))
-    def get_table(self, table_id: int = Path(..., ge=1)) -> TableModel | dict | None:
+    def get_table(self,
+                  request: Request,
+                  background_tasks: BackgroundTasks,
+                  table: TableInterfaceGet = Depends()
+                  ) -> Response:
         """
         Returns one table from db by table id.
         Available to all confirmed users.
@@ -77,15 +188,24 @@ class Table:
         Instead of a nested full order data,
         it will only return the start and end datetime.
         """
-        table_obj: TableModel = self.table_operation.find_by_id_or_404(table_id)
-
-        if not self.table_operation.check_user_access():
-            data = FullTableGetSchema.from_orm(table_obj)
-            return data.dict(
-                exclude_unset=True,
-                exclude={'orders': {'__all__': {'user_id', 'id', 'status', 'cost'}}}
+        self.table_operation.fields = parse_include(table.include,
+                                                    parse_fields(table.fields, FullTableGetSchema),
+                                                    TableModel)
+        params: dict = {'table_id': table.table_id, 'fields': self.table_operation.fields}
+        # 404 error is raised while computing the response, so it is never cached.
+        access_group: str = 'staff' if self.table_operation.check_user_access() else 'client'
+        return table_conditional_get.get_response(
+            request=request,
+            params=params,
+            access_group=access_group,
+            respond=lambda: table_cache.get_response(
+                params=params,
+                access_group=access_group,
+                compute=lambda: self._find_table(table.table_id),
+                background_tasks=background_tasks,
+                accept_encoding=request.headers.get('accept-encoding')
             )
-        return table_obj
+        )
 
     @router.delete("/tables/{table_id}", **asdict(TableOutputDelete()))
     def delete_table(self,
@@ -134,3 +254,43 @@ class Table:
             content={"message": get_text('post').format(
                 self.table_operation.model_name, table.id)}
         )
+
+    @staticmethod
+    def _parse_bulk_condition(table: TableInterfaceDeleteBulk) -> tuple[list[int] | None, dict]:
+        """Gets the ids and the search parameters of the bulk operations."""
+        params: dict = dict(
+            type=table.type,
+            number_of_seats=table.number_of_seats,
+            price_per_hour=table.price_per_hour,
+            start_datetime=table.start_datetime,
+            end_datetime=table.end_datetime
+        )
+        return (parse_ids(table.ids) if table.ids is not None else None), params
+
+    def _find_all_tables(self, params: dict) -> list[FullTableGetSchema]:
+        """Finds tables by parameters and hides order data if it's the client."""
+        table_objs: list[TableModel] = self.table_operation.find_all_by_params(**params)
+        return [self._convert_table_to_schema(table_obj) for table_obj in table_objs]
+
+    def _find_table(self, table_id: int) -> FullTableGetSchema:
+        """Finds table by id or raises 404 and hides order data if it's the client."""
+        table_obj: TableModel = self.table_operation.find_by_id_or_404(table_id)
+        return self._convert_table_to_schema(table_obj)
+
+    def _convert_table_to_schema(self, table_obj: TableModel) -> FullTableGetSchema:
+        """
+        Converts table object to the response schema.
+        Non-superuser behavior:
+        Instead of a nested full order data,
+        it will only return the start and end datetime.
+        """
+        schema: type[FullTableGetSchema] = get_response_schema(FullTableGetSchema,
+                                                               self.table_operation.fields)
+        if not self.table_operation.check_user_access():
+            return schema.parse_obj(
+                schema.from_orm(table_obj).dict(
+                    exclude_unset=True,
+                    exclude={'orders': {'__all__': {'user_id', 'id', 'status', 'cost'}}}
+                )
+            )
+        return schema.from_orm(table_obj)
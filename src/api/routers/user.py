@@ -1,19 +1,25 @@
 from dataclasses import asdict
 
 from fastapi import Depends, Path, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi_utils.cbv import cbv
 from fastapi_utils.inferring_router import InferringRouter
 from sqlalchemy.orm import Session
 
 from src.api.models.user import UserModel
 from src.api.crud_operations.user import UserOperation
+from src.api.schemes.user.base_schemes import UserGetSchema, UserWithOrderStatsGetSchema
 from src.api.swagger.user import (
     UserInterfaceGetAll,
+    UserInterfaceGetBatch,
+    UserInterfaceGetChanges,
+    UserInterfaceGet,
     UserInterfacePatch,
     UserInterfacePost,
 
     UserOutputGetAll,
+    UserOutputGetBatch,
+    UserOutputGetChanges,
     UserOutputGet,
     UserOutputDelete,
     UserOutputPatch,
@@ -22,6 +28,9 @@ from src.api.swagger.user import (
 from src.api.dependencies.db import get_db
 from src.api.dependencies.auth import get_current_superuser
 from src.utils.response_generation.main import get_text
+from src.utils.sparse_fieldsets.main import convert_to_response_data, parse_fields, parse_include
+from src.utils.multi_get.main import make_batch_response_data, parse_ids
+from src.utils.delta_sync.main import decode_cursor, make_changes_response_data
 
 # Unfortunately attribute 'prefix' in InferringRouter does not work correctly (duplicate prefix).
 # So I have a prefix in each function.
@@ -39,20 +48,65 @@ class User:
     @router.get("/users/", **asdict(UserOutputGetAll()))
     def get_all_users(self,
                       user: UserInterfaceGetAll = Depends(UserInterfaceGetAll)
-                      ) -> list[UserModel] | list[None]:
+                      ) -> ORJSONResponse:
         """
         Returns all users from db by parameters.
         Only available to admins.
         """
-        return self.user_operation.find_all_by_params(phone=user.phone, status=user.status)
+        # Only the response fields are loaded, so the password hash is never loaded.
+        # The order stats are loaded only if they are included.
+        self.user_operation.fields = parse_include(user.include or '',
+                                                   parse_fields(user.fields, UserWithOrderStatsGetSchema),
+                                                   UserModel)
+        return ORJSONResponse(content=[
+            convert_to_response_data(user_obj, UserWithOrderStatsGetSchema, self.user_operation.fields)
+            for user_obj in self.user_operation.find_all_by_params(phone=user.phone, status=user.status)
+        ])
+
+    # These must be declared before '/users/{user_id}',
+    # else 'batch' and 'changes' are taken as the user id.
+    @router.get("/users/batch", **asdict(UserOutputGetBatch()))
+    def get_users_batch(self,
+                        user: UserInterfaceGetBatch = Depends(UserInterfaceGetBatch)
+                        ) -> ORJSONResponse:
+        """
+        Returns users from db by the list of user ids with one query.
+        Only available to admins.
+        """
+        ids: list[int] = parse_ids(user.ids)
+        self.user_operation.fields = parse_fields(user.fields, UserGetSchema)
+        return ORJSONResponse(content=make_batch_response_data(
+            ids,
+            self.user_operation.find_by_ids(ids),
+            lambda user_obj: convert_to_response_data(user_obj, UserGetSchema, self.user_operation.fields)
+        ))
+
+    @router.get("/users/changes", **asdict(UserOutputGetChanges()))
+    def get_users_changes(self,
+                          user: UserInterfaceGetChanges = Depends(UserInterfaceGetChanges)
+                          ) -> ORJSONResponse:
+        """
+        Returns users changed after the cursor and ids of deleted users in the order of change time.
+        Only available to admins.
+        """
+        self.user_operation.fields = parse_fields(user.fields, UserGetSchema)
+        return ORJSONResponse(content=make_changes_response_data(
+            self.user_operation.find_changes(decode_cursor(user.since), user.limit),
+            user.since,
+            user.limit,
+            lambda user_obj: convert_to_response_data(user_obj, UserGetSchema, self.user_operation.fields)
+        ))
 
     @router.get("/users/{user_id}", **asdict(UserOutputGet()))
-    def get_user(self, user_id: int = Path(..., ge=1)) -> UserModel | None:
+    def get_user(self, user: UserInterfaceGet = Depends(UserInterfaceGet)) -> ORJSONResponse:
         """
         Returns one user from db by user id.
         Only available to admins.
         """
-        return self.user_operation.find_by_id(user_id)
+        self.user_operation.fields = parse_fields(user.fields, UserGetSchema)
+        return ORJSONResponse(content=convert_to_response_data(
+            self.user_operation.find_by_id(user.user_id), UserGetSchema, self.user_operation.fields
+        ))
 
     @router.delete("/users/{user_id}", **asdict(UserOutputDelete()))
     def delete_user(self, user_id: int = Path(..., ge=1)) -> JSONResponse:
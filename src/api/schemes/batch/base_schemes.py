@@ -0,0 +1,36 @@
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel, Field, root_validator
+from pydantic.generics import GenericModel
+
+from src.config import get_settings
+
+settings = get_settings()
+
+ItemSchema = TypeVar('ItemSchema')
+
+
+class BatchGetSchema(GenericModel, Generic[ItemSchema]):
+    items: list[ItemSchema]
+    missing_ids: list[int] = Field(..., example=[4])
+
+
+class BatchOperationSchema(BaseModel):
+    method: Literal['POST'] | Literal['PATCH'] | Literal['DELETE']
+    resource: Literal['orders'] | Literal['tables'] | Literal['schedules'] | Literal['users']
+    id: int | None = Field(None, ge=1, description="Object id for 'PATCH' and 'DELETE'")
+    data: dict | None = Field(None, description="Request body of the resource endpoint")
+
+    @root_validator()
+    def check_id_and_data(cls, values):
+        if values.get('method') in ('PATCH', 'DELETE') and values.get('id') is None:
+            raise ValueError(f"'id' is required for '{values['method']}'")
+        if values.get('method') in ('POST', 'PATCH') and values.get('data') is None:
+            raise ValueError(f"'data' is required for '{values['method']}'")
+        return values
+
+
+class BatchPostSchema(BaseModel):
+    operations: list[BatchOperationSchema] = Field(..., min_items=1,
+                                                   max_items=settings.BATCH_MAX_OPERATIONS)
+    atomic: bool = Field(True, description="All operations or nothing, else each one separately")
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+from src.utils.response_generation.main import get_text
+
+
+class BatchResponseOperationSchema(BaseModel):
+    status_code: int = Field(..., example=201)
+    id: int | None = Field(None, example=1)
+    message: str | dict | list = get_text('post').format('order', 1)
+
+
+class BatchResponseBulkSchema(BaseModel):
+    count: int = Field(..., example=2)
+    ids: list[int] | None = Field(None, example=[1, 2], description="Changed ids, none for the dry run")
+    dry_run: bool = False
+
+
+class BatchResponsePostSchema(BaseModel):
+    committed: bool
+    results: list[BatchResponseOperationSchema]
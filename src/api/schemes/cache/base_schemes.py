@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class CacheStatsGetSchema(BaseModel):
+    route: str = Field(..., example='/tables/')
+    hits: int = Field(..., ge=0)
+    stale_hits: int = Field(..., ge=0)
+    misses: int = Field(..., ge=0)
+    coalesced: int = Field(..., ge=0)
+    coalescing_timeouts: int = Field(..., ge=0)
+    hit_ratio: float = Field(..., ge=0, le=1)
@@ -0,0 +1,13 @@
+from typing import Generic, TypeVar
+
+from pydantic import Field
+from pydantic.generics import GenericModel
+
+ItemSchema = TypeVar('ItemSchema')
+
+
+class ChangesGetSchema(GenericModel, Generic[ItemSchema]):
+    items: list[ItemSchema]
+    deleted_ids: list[int] = Field(..., example=[4])
+    cursor: str | None = Field(..., example='MjAyMi0wOC0wOFQxMDowMDowMHwx')
+    has_more: bool
@@ -4,9 +4,12 @@ from typing import Literal
 
 from pydantic import BaseModel, Field, root_validator
 
+from src.config import get_settings
 from src.api.schemes.validators.order import OrderBaseValidator, OrderPostOrPatchValidator
 from src.api.schemes.table.base_schemes import TableGetSchema
 
+settings = get_settings()
+
 
 class OrderBaseSchema(BaseModel):
     start_datetime: dt = Field(..., example=dt.utcnow().strftime('%Y-%m-%dT%H:%M'))
@@ -53,6 +56,18 @@ class OrderPostSchema(OrderBaseSchema):
         return validator.validate_data()
 
 
+class OrderPostBulkSchema(BaseModel):
+    # Each order is validated separately, so invalid orders don't fail the whole request.
+    orders: list[dict] = Field(..., min_items=1, max_items=settings.ORDERS_BULK_MAX_ITEMS)
+
+
+class OrderPatchBulkSchema(BaseModel):
+    # Only the fields that get the same value for all orders, the time and tables are checked for each order.
+    status: Literal['processing'] | Literal['confirmed'] | None
+    cost: float | None
+    user_id: int | None = Field(None, ge=1)
+
+
 class OrderGetSchema(OrderBaseSchema):
     id: int
     status: Literal['processing'] | Literal['confirmed']
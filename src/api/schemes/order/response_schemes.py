@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+from src.api.schemes.batch.response_schemes import BatchResponseOperationSchema
 from src.utils.response_generation.main import get_text
 
 
@@ -13,3 +14,17 @@ class OrderResponseDeleteSchema(BaseModel):
 
 class OrderResponsePostSchema(BaseModel):
     message: str = get_text('post').format('order', 1)
+
+
+class OrderResponsePostBulkSchema(BaseModel):
+    created: int
+    results: list[BatchResponseOperationSchema]
+
+
+class OrderResponseExportJobSchema(BaseModel):
+    task_id: str
+    status: str = 'PROGRESS'
+    rows: int | None = None
+    total_rows: int | None = None
+    file_name: str | None = None
+    error: str | None = None
@@ -0,0 +1,42 @@
+from datetime import date, datetime as dt
+
+from pydantic import BaseModel, Field
+
+
+class TypeDailyRevenueGetSchema(BaseModel):
+    day: date = Field(..., example='2022-08-03')
+    table_type: str = Field(..., example='standard')
+    bookings: int = Field(..., ge=0, example=3)
+    revenue: float = Field(..., ge=0, example=4500)
+
+
+class TableDailyRevenueGetSchema(TypeDailyRevenueGetSchema):
+    table_id: int = Field(..., example=1)
+
+
+class DailyBookedHoursGetSchema(BaseModel):
+    day: date = Field(..., example='2022-08-03')
+    table_id: int = Field(..., example=1)
+    bookings: int = Field(..., ge=0, example=3)
+    booked_hours: float = Field(..., ge=0, example=4)
+
+
+class UserOrdersGetSchema(BaseModel):
+    user_id: int = Field(..., example=3)
+    orders: int = Field(..., ge=0, example=5)
+    confirmed_orders: int = Field(..., ge=0, example=4)
+    total_cost: float = Field(..., ge=0, example=32000)
+    first_order_at: dt = Field(..., example='2022-03-08T15:00:00')
+    last_order_at: dt = Field(..., example='2022-08-03T15:00:00')
+
+
+class OccupancyGetSchema(BaseModel):
+    start_date: date = Field(..., example='2022-01-01')
+    end_date: date = Field(..., example='2022-12-31')
+    table_ids: list[int] = Field(..., example=[1, 2])
+    weekdays: list[str] = Field(..., example=['Monday', 'Tuesday'])
+    opening_hours: list[list[float]] = Field(..., example=[[0, 52, 52], [0, 52, 26]])
+    booked_hours: list[list[list[float]]] = Field(..., example=[[[0, 26, 13], [0, 0, 26]],
+                                                                [[0, 52, 0], [0, 13, 0]]])
+    occupancy: list[list[list[float]]] = Field(..., example=[[[0, 0.5, 0.25], [0, 0, 1]],
+                                                             [[0, 1, 0], [0, 0.25, 0]]])
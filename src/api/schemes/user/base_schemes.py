@@ -1,3 +1,4 @@
+from datetime import datetime as dt
 from typing import Literal
 
 from pydantic import (BaseModel as BaseSchema,
@@ -39,6 +40,19 @@ class UserGetSchema(UserBaseSchema):
         orm_mode = True
 
 
+class UserOrderStatsGetSchema(BaseSchema):
+    orders_count: int = Field(..., ge=0, example=5)
+    total_spent: float = Field(..., ge=0, example=32000)
+    last_order_at: dt | None = Field(None, example='2022-08-03T15:00:00')
+
+    class Config:
+        orm_mode = True
+
+
+class UserWithOrderStatsGetSchema(UserGetSchema):
+    order_stats: UserOrderStatsGetSchema | None
+
+
 class UserResetPasswordSchema(BaseSchema):
     password: str = Field(
         ...,
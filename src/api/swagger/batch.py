@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Optional, Type, Any
+
+from fastapi import Body, status
+
+from src.api.schemes.batch.base_schemes import BatchPostSchema
+from src.api.schemes.batch.response_schemes import BatchResponsePostSchema
+
+
+@dataclass
+class BatchInterfacePost:
+    data: BatchPostSchema = Body(..., example={
+            "atomic": True,
+            "operations": [
+                {
+                    "method": "PATCH",
+                    "resource": "tables",
+                    "id": 1,
+                    "data": {"number_of_seats": 6}
+                },
+                {
+                    "method": "POST",
+                    "resource": "orders",
+                    "data": {
+                        "start_datetime": "2022-08-10T08:00",
+                        "end_datetime": "2022-08-10T09:59",
+                        "user_id": 1,
+                        "tables": [1]
+                    }
+                },
+                {
+                    "method": "DELETE",
+                    "resource": "schedules",
+                    "id": 8
+                }
+            ]
+        }
+    )
+
+
+@dataclass
+class BatchOutputPost:
+    summary: Optional[str] = 'Execute several operations in one transaction'
+    description: Optional[str] = (
+        "**Executes** 'POST', 'PATCH' and 'DELETE' operations of **orders, tables, schedules and users** "
+        "in the given order in one db transaction. <br />"
+        "Each operation has the same body, checks and result as the resource endpoint. <br />"
+        "If **atomic**, the first failed operation cancels all operations, "
+        "else only the failed operations are cancelled. <br />"
+        "Available to all **confirmed users**, each operation requires the role of the resource endpoint."
+    )
+    response_model: Optional[Type[Any]] = BatchResponsePostSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Result of each executed operation'
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional, Type, Any
+
+from fastapi import status
+
+from src.api.schemes.cache.base_schemes import CacheStatsGetSchema
+
+
+@dataclass
+class CacheOutputGetStats:
+    summary: Optional[str] = 'Get response cache stats'
+    description: Optional[str] = (
+        "**Returns** hits, misses and hit ratio of the response cache for each cached route. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = list[CacheStatsGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'List of cached routes stats'
@@ -1,15 +1,29 @@
 from dataclasses import dataclass
 from datetime import date, datetime as dt
 from typing import Optional, Type, Any, Literal
+from uuid import UUID
 
-from fastapi import Query, Body, status
+from fastapi import Query, Path, Body, Depends, status
+from fastapi.responses import FileResponse, StreamingResponse
 
+from src.config import get_settings
+from src.api.models.user import UserModel
 from src.api.schemes.order.base_schemes import (OrderGetSchema,
                                                 OrderPatchSchema,
-                                                OrderPostSchema)
+                                                OrderPatchBulkSchema,
+                                                OrderPostSchema,
+                                                OrderPostBulkSchema)
 from src.api.schemes.order.response_schemes import (OrderResponsePatchSchema,
                                                     OrderResponseDeleteSchema,
-                                                    OrderResponsePostSchema)
+                                                    OrderResponsePostSchema,
+                                                    OrderResponsePostBulkSchema,
+                                                    OrderResponseExportJobSchema)
+from src.api.schemes.batch.base_schemes import BatchGetSchema
+from src.api.schemes.batch.response_schemes import BatchResponseBulkSchema
+from src.api.schemes.changes.base_schemes import ChangesGetSchema
+from src.api.dependencies.auth import get_current_admin_or_superuser
+
+settings = get_settings()
 
 
 @dataclass
@@ -32,6 +46,115 @@ class OrderInterfaceGetAll:
     cost: float = Query(default=None, description="Less or equal")
     user_id: int = Query(default=None, description="Client ID")
     tables: list[int] = Query(default=None, description="List of table ids")
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,start_datetime,end_datetime'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='tables'
+    )
+
+
+@dataclass
+class OrderInterfaceGetPage(OrderInterfaceGetAll):
+    limit: int = Query(default=None, ge=1, description="Max number of orders, all orders by default")
+    offset: int = Query(default=0, ge=0, description="Number of skipped orders")
+    with_: str = Query(
+        default=None,
+        alias='with',
+        regex=r'^(count|sum_cost)(,(count|sum_cost))*$',
+        description="Comma separated totals of all found orders returned in the headers: "
+                    "'count' - 'X-Total-Count', 'sum_cost' - 'X-Total-Sum-Cost'",
+        example='count,sum_cost'
+    )
+
+
+@dataclass
+class OrderInterfaceExport(OrderInterfaceGetAll):
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+
+@dataclass
+class OrderInterfaceStartExportJob:
+    start_datetime: dt | date = Query(
+        default=None,
+        description="Orders that start at this date or datetime or later",
+        example='2022-01-01'
+    )
+    end_datetime: dt | date = Query(
+        default=None,
+        description="Orders that start at this date or datetime or earlier",
+        example='2022-01-31'
+    )
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+
+@dataclass
+class OrderInterfaceExportJob:
+    task_id: UUID = Path(..., description="Task ID from the export start response")
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+
+@dataclass
+class OrderInterfaceGetBatch:
+    ids: str = Query(
+        ...,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated order ids",
+        example='1,2,3'
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,start_datetime,end_datetime'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='tables'
+    )
+
+
+@dataclass
+class OrderInterfaceGetChanges:
+    since: str = Query(
+        default=None,
+        description="Cursor from the previous response, all orders are returned without it"
+    )
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=settings.CHANGES_MAX_LIMIT,
+        description="Max number of orders"
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,start_datetime,end_datetime'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='tables'
+    )
+
+
+@dataclass
+class OrderInterfaceGet:
+    order_id: int = Path(..., ge=1)
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,start_datetime,end_datetime'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='tables'
+    )
 
 
 @dataclass
@@ -65,6 +188,63 @@ class OrderInterfacePost:
     )
 
 
+@dataclass
+class OrderInterfaceDeleteBulk:
+    ids: str = Query(
+        default=None,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated order ids",
+        example='1,2,3'
+    )
+    start_datetime: dt | date = Query(
+        default=None,
+        description="Start booking date or datetime",
+        example='2022-01-01T10:00'
+    )
+    end_datetime: dt | date = Query(
+        default=None,
+        description="End booking date or datetime",
+        example='2022-12-31'
+    )
+    status: Literal['processing'] | Literal['confirmed'] = Query(
+        default=None,
+        description="'processing' or 'confirmed'",
+        example='processing'
+    )
+    cost: float = Query(default=None, description="Less or equal")
+    user_id: int = Query(default=None, description="Client ID")
+    tables: list[int] = Query(default=None, description="List of table ids")
+    dry_run: bool = Query(default=False, description="Only count the orders that would be changed")
+
+
+@dataclass
+class OrderInterfacePatchBulk(OrderInterfaceDeleteBulk):
+    data: OrderPatchBulkSchema = Body(..., example={
+        "status": "confirmed"
+    })
+
+
+@dataclass
+class OrderInterfacePostBulk:
+    data: OrderPostBulkSchema = Body(..., example={
+            "orders": [
+                {
+                    "start_datetime": "2022-08-10T08:00",
+                    "end_datetime": "2022-08-10T10:00",
+                    "user_id": 1,
+                    "tables": [1, 2]
+                },
+                {
+                    "start_datetime": "2022-08-10T12:00",
+                    "end_datetime": "2022-08-10T14:00",
+                    "user_id": 1,
+                    "tables": [3]
+                }
+            ]
+        }
+    )
+
+
 @dataclass
 class OrderOutputGetAll:
     summary: Optional[str] = 'Get all orders by parameters'
@@ -74,13 +254,108 @@ class OrderOutputGetAll:
         "<br />"
         "**Non-superuser behavior:** <br />"
         "It will only find orders associated with the user id, "
-        "else return empty list."
+        "else return empty list. <br />"
+        "<br />"
+        "**Totals** of all found orders are returned in the headers if requested by **with**: <br />"
+        "'X-Total-Count' is exact for the search with parameters and estimated by the db statistics "
+        "without them ('X-Total-Count-Type' is 'exact' or 'estimated'). <br />"
+        "Totals are selected in the same query as the orders."
     )
     response_model: Optional[Type[Any]] = list[OrderGetSchema]
     status_code: Optional[int] = status.HTTP_200_OK
     response_description: str = 'List of orders'
 
 
+@dataclass
+class OrderOutputExport:
+    summary: Optional[str] = 'Export all orders by parameters'
+    description: Optional[str] = (
+        "**Streams** all orders from db by **parameters** as NDJSON (one order per line). <br />"
+        "Orders are read from db and sent by chunks, so the export of any size starts immediately. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    # Each line is one order.
+    response_model: Optional[Type[Any]] = OrderGetSchema
+    response_class: Optional[Type[Any]] = StreamingResponse
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Orders, one JSON object per line'
+
+
+@dataclass
+class OrderOutputStartExportJob:
+    summary: Optional[str] = 'Start background export of orders to file'
+    description: Optional[str] = (
+        "**Starts** the background export of orders with their tables to **Parquet** "
+        "(CSV if pyarrow is not installed), one row for each order table. <br />"
+        "The export runs in celery, use the returned **task id** to get the status and the file. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = OrderResponseExportJobSchema
+    status_code: Optional[int] = status.HTTP_202_ACCEPTED
+    response_description: str = 'Task ID of the export'
+
+
+@dataclass
+class OrderOutputGetExportJob:
+    summary: Optional[str] = 'Get status of background export of orders'
+    description: Optional[str] = (
+        "**Returns** the status of the export by **task id**: "
+        "'PENDING', 'PROGRESS' (with the number of written rows), 'SUCCESS' or 'FAILURE'. <br />"
+        "Unknown task ids have 'PENDING' status. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = OrderResponseExportJobSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Export status'
+
+
+@dataclass
+class OrderOutputDownloadExportJob:
+    summary: Optional[str] = 'Download file of background export of orders'
+    description: Optional[str] = (
+        "**Returns** the file of the finished export by **task id**. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    # The file content.
+    response_model: Optional[Type[Any]] = bytes
+    response_class: Optional[Type[Any]] = FileResponse
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Parquet or CSV file'
+
+
+@dataclass
+class OrderOutputGetBatch:
+    summary: Optional[str] = 'Get orders by order ids'
+    description: Optional[str] = (
+        "**Returns** orders from db by the list of **order ids** with one query. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "It will only find orders associated with the user id, "
+        "other ids are returned as missing."
+    )
+    response_model: Optional[Type[Any]] = BatchGetSchema[OrderGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Found orders and missing ids'
+
+
+@dataclass
+class OrderOutputGetChanges:
+    summary: Optional[str] = 'Get orders changed since the cursor'
+    description: Optional[str] = (
+        "**Returns** orders changed after the **cursor** and ids of deleted orders "
+        "in the order of change time. <br />"
+        "The response cursor is used in the next request to get only new changes. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "It will only find orders associated with the user id."
+    )
+    response_model: Optional[Type[Any]] = ChangesGetSchema[OrderGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Changed orders, deleted ids and the next cursor'
+
+
 @dataclass
 class OrderOutputGet:
     summary: Optional[str] = 'Get order by order id'
@@ -136,3 +411,57 @@ class OrderOutputPost:
     )
     response_model: Optional[Type[Any]] = OrderResponsePostSchema
     status_code: Optional[int] = status.HTTP_201_CREATED
+
+
+@dataclass
+class OrderOutputPostBulk:
+    summary: Optional[str] = 'Add several orders'
+    description: Optional[str] = (
+        "**Adds** several orders into db in one transaction. <br />"
+        "Each order is checked like in 'POST /orders/create', "
+        "the orders that fail the checks are skipped and the others are added. <br />"
+        "If the orders of the request overlap each other at the same table, "
+        "the order that goes first is added. <br />"
+        f"Max orders in one request: **{settings.ORDERS_BULK_MAX_ITEMS}**. <br />"
+        "The result of each order is returned in the request order. <br />"
+        "Available to all **confirmed users.**"
+    )
+    response_model: Optional[Type[Any]] = OrderResponsePostBulkSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Number of added orders and the result of each order'
+
+
+@dataclass
+class OrderOutputPatchBulk:
+    summary: Optional[str] = 'Patch orders by ids or parameters'
+    description: Optional[str] = (
+        "**Updates** all orders found by **ids** and (or) **parameters** "
+        "with the same data by one statement. <br />"
+        "The parameters are the same as in 'GET /orders/'. <br />"
+        "With **dry_run** the orders are only counted. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "It will only update orders associated with the user id, "
+        "'status', 'cost' and 'user_id' cannot be changed."
+    )
+    response_model: Optional[Type[Any]] = BatchResponseBulkSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Number and ids of updated orders'
+
+
+@dataclass
+class OrderOutputDeleteBulk:
+    summary: Optional[str] = 'Delete orders by ids or parameters'
+    description: Optional[str] = (
+        "**Deletes** all orders found by **ids** and (or) **parameters** by one statement. <br />"
+        "The parameters are the same as in 'GET /orders/'. <br />"
+        "With **dry_run** the orders are only counted. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "It will only delete orders associated with the user id."
+    )
+    response_model: Optional[Type[Any]] = BatchResponseBulkSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Number and ids of deleted orders'
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Type, Any
+
+from fastapi import Query, status
+
+from src.api.schemes.report.base_schemes import (DailyBookedHoursGetSchema,
+                                                 OccupancyGetSchema,
+                                                 TableDailyRevenueGetSchema,
+                                                 TypeDailyRevenueGetSchema,
+                                                 UserOrdersGetSchema)
+
+
+@dataclass
+class ReportInterfaceGetDays:
+    start_date: date = Query(default=None, description="First day of the report", example='2022-01-01')
+    end_date: date = Query(default=None, description="Last day of the report", example='2022-12-31')
+
+
+@dataclass
+class ReportInterfaceGetTableRevenue(ReportInterfaceGetDays):
+    table_id: int = Query(default=None, description="Table ID")
+    type: str = Query(default=None, description="Table type")
+
+
+@dataclass
+class ReportInterfaceGetTypeRevenue(ReportInterfaceGetDays):
+    type: str = Query(default=None, description="Table type")
+
+
+@dataclass
+class ReportInterfaceGetBookedHours(ReportInterfaceGetDays):
+    table_id: int = Query(default=None, description="Table ID")
+
+
+@dataclass
+class ReportInterfaceGetUserOrders:
+    user_id: int = Query(default=None, description="Client ID")
+
+
+@dataclass
+class ReportInterfaceGetOccupancy:
+    start_date: date = Query(..., description="First day of the heatmap", example='2022-01-01')
+    end_date: date = Query(..., description="Last day of the heatmap", example='2022-12-31')
+    type: str = Query(default=None, description="Table type")
+
+
+@dataclass
+class ReportOutputGetTableRevenue:
+    summary: Optional[str] = 'Get daily revenue of the tables'
+    description: Optional[str] = (
+        "**Returns** the revenue and the number of bookings of each table for each day. <br />"
+        "The order cost is split between the order tables in proportion to their prices. <br />"
+        "Reports are read from the materialized views refreshed in the background, "
+        "so the latest orders can be missing for a few minutes. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = list[TableDailyRevenueGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'List of daily revenue of the tables'
+
+
+@dataclass
+class ReportOutputGetTypeRevenue:
+    summary: Optional[str] = 'Get daily revenue of the table types'
+    description: Optional[str] = (
+        "**Returns** the revenue and the number of bookings of each table type for each day. <br />"
+        "Reports are read from the materialized views refreshed in the background, "
+        "so the latest orders can be missing for a few minutes. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = list[TypeDailyRevenueGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'List of daily revenue of the table types'
+
+
+@dataclass
+class ReportOutputGetBookedHours:
+    summary: Optional[str] = 'Get daily booked hours of the tables'
+    description: Optional[str] = (
+        "**Returns** the booked hours and the number of bookings of each table for each day. <br />"
+        "Booked time of each order is rounded up to the hours like the order cost. <br />"
+        "Reports are read from the materialized views refreshed in the background, "
+        "so the latest orders can be missing for a few minutes. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = list[DailyBookedHoursGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'List of daily booked hours of the tables'
+
+
+@dataclass
+class ReportOutputGetUserOrders:
+    summary: Optional[str] = 'Get order stats of the users'
+    description: Optional[str] = (
+        "**Returns** the number of orders, confirmed orders, total cost, "
+        "first and last order start of each user. <br />"
+        "Reports are read from the materialized views refreshed in the background, "
+        "so the latest orders can be missing for a few minutes. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = list[UserOrdersGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'List of order stats of the users'
+
+
+@dataclass
+class ReportOutputGetOccupancy:
+    summary: Optional[str] = 'Get occupancy heatmap of the tables'
+    description: Optional[str] = (
+        "**Returns** the booked share of the opening hours of each table "
+        "by day of the week and hour of the day for the date range. <br />"
+        "'booked_hours' and 'occupancy' are indexed by [table][day of the week][hour], "
+        "tables are in the order of 'table_ids', days of the week are in the order of 'weekdays'. <br />"
+        "'opening_hours' are indexed by [day of the week][hour], "
+        "they are summed over the days of the range by the schedules, breaks excluded. <br />"
+        "The date range cannot be longer than 'REPORTS_OCCUPANCY_MAX_DAYS' days. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = OccupancyGetSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Occupancy heatmap of the tables'
@@ -4,6 +4,7 @@ from typing import Optional, Type, Any
 
 from fastapi import Query, Path, Body, Depends, status
 
+from src.config import get_settings
 from src.api.models.user import UserModel
 from src.api.schemes.schedule.base_schemes import (ScheduleGetSchema,
                                                    SchedulePatchSchema,
@@ -11,8 +12,12 @@ from src.api.schemes.schedule.base_schemes import (ScheduleGetSchema,
 from src.api.schemes.schedule.response_schemes import (ScheduleResponsePatchSchema,
                                                        ScheduleResponseDeleteSchema,
                                                        ScheduleResponsePostSchema)
+from src.api.schemes.batch.base_schemes import BatchGetSchema
+from src.api.schemes.changes.base_schemes import ChangesGetSchema
 from src.api.dependencies.auth import get_current_admin_or_superuser
 
+settings = get_settings()
+
 
 @dataclass
 class ScheduleInterfaceGetAll:
@@ -21,6 +26,55 @@ class ScheduleInterfaceGetAll:
     close_time: time = Query(default=None, description="HH:MM, Less or equal", example='20:00')
     break_start_time: time = Query(default=None, description="HH:MM, More or equal")
     break_end_time: time = Query(default=None, description="HH:MM, Less or equal")
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='day,open_time,close_time'
+    )
+
+
+@dataclass
+class ScheduleInterfaceGetBatch:
+    ids: str = Query(
+        ...,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated schedule ids",
+        example='1,2,3'
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='day,open_time,close_time'
+    )
+
+
+@dataclass
+class ScheduleInterfaceGetChanges:
+    since: str = Query(
+        default=None,
+        description="Cursor from the previous response, all schedules are returned without it"
+    )
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=settings.CHANGES_MAX_LIMIT,
+        description="Max number of schedules"
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='day,open_time,close_time'
+    )
+
+
+@dataclass
+class ScheduleInterfaceGet:
+    schedule_id: int = Path(..., ge=1)
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='day,open_time,close_time'
+    )
 
 
 @dataclass
@@ -66,6 +120,32 @@ class ScheduleOutputGetAll:
     response_description: str = 'List of schedules'
 
 
+@dataclass
+class ScheduleOutputGetBatch:
+    summary: Optional[str] = 'Get schedules by schedule ids'
+    description: Optional[str] = (
+        "**Returns** schedules from db by the list of **schedule ids** with one query. <br />"
+        "Available to all **confirmed users.**"
+    )
+    response_model: Optional[Type[Any]] = BatchGetSchema[ScheduleGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Found schedules and missing ids'
+
+
+@dataclass
+class ScheduleOutputGetChanges:
+    summary: Optional[str] = 'Get schedules changed since the cursor'
+    description: Optional[str] = (
+        "**Returns** schedules changed after the **cursor** and ids of deleted schedules "
+        "in the order of change time. <br />"
+        "The response cursor is used in the next request to get only new changes. <br />"
+        "Available to all **confirmed users.**"
+    )
+    response_model: Optional[Type[Any]] = ChangesGetSchema[ScheduleGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Changed schedules, deleted ids and the next cursor'
+
+
 @dataclass
 class ScheduleOutputGet:
     summary: Optional[str] = 'Get schedule by schedule id'
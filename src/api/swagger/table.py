@@ -4,6 +4,7 @@ from typing import Optional, Type, Any
 
 from fastapi import Query, Path, Body, Depends, status
 
+from src.config import get_settings
 from src.api.models.user import UserModel
 from src.api.schemes.table.base_schemes import (TablePatchSchema,
                                                 TablePostSchema)
@@ -11,8 +12,13 @@ from src.api.schemes.relationships.orders_tables import FullTableGetSchema
 from src.api.schemes.table.response_schemes import (TableResponsePatchSchema,
                                                     TableResponseDeleteSchema,
                                                     TableResponsePostSchema)
+from src.api.schemes.batch.base_schemes import BatchGetSchema
+from src.api.schemes.batch.response_schemes import BatchResponseBulkSchema
+from src.api.schemes.changes.base_schemes import ChangesGetSchema
 from src.api.dependencies.auth import get_current_admin_or_superuser
 
+settings = get_settings()
+
 
 @dataclass
 class TableInterfaceGetAll:
@@ -29,6 +35,75 @@ class TableInterfaceGetAll:
         description="End booking date or datetime",
         example='2022-12-31'
     )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,type,number_of_seats'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='orders'
+    )
+
+
+@dataclass
+class TableInterfaceGetBatch:
+    ids: str = Query(
+        ...,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated table ids",
+        example='1,2,3'
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,type,number_of_seats'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='orders'
+    )
+
+
+@dataclass
+class TableInterfaceGetChanges:
+    since: str = Query(
+        default=None,
+        description="Cursor from the previous response, all tables are returned without it"
+    )
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=settings.CHANGES_MAX_LIMIT,
+        description="Max number of tables"
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,type,number_of_seats'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='orders'
+    )
+
+
+@dataclass
+class TableInterfaceGet:
+    table_id: int = Path(..., ge=1)
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,type,number_of_seats'
+    )
+    include: str = Query(
+        default=None,
+        description="Comma separated nested relationships, all by default, empty value to exclude all",
+        example='orders'
+    )
 
 
 @dataclass
@@ -48,6 +123,38 @@ class TableInterfacePatch:
     admin: UserModel = Depends(get_current_admin_or_superuser)
 
 
+@dataclass
+class TableInterfaceDeleteBulk:
+    ids: str = Query(
+        default=None,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated table ids",
+        example='1,2,3'
+    )
+    type: str = Query(default=None, description='Table type')
+    number_of_seats: int = Query(default=None, description='Less or equal')
+    price_per_hour: float = Query(default=None, description='Less or equal')
+    start_datetime: dt | date = Query(
+        default=None,
+        description="Start booking date or datetime",
+        example='2022-01-01T10:00'
+    )
+    end_datetime: dt | date = Query(
+        default=None,
+        description="End booking date or datetime",
+        example='2022-12-31'
+    )
+    dry_run: bool = Query(default=False, description="Only count the tables that would be changed")
+    admin: UserModel = Depends(get_current_admin_or_superuser)
+
+
+@dataclass
+class TableInterfacePatchBulk(TableInterfaceDeleteBulk):
+    data: TablePatchSchema = Body(..., example={
+        "price_per_hour": 6000
+    })
+
+
 @dataclass
 class TableInterfacePost:
     data: TablePostSchema = Body(..., example={
@@ -75,6 +182,40 @@ class TableOutputGetAll:
     response_description: str = 'List of tables'
 
 
+@dataclass
+class TableOutputGetBatch:
+    summary: Optional[str] = 'Get tables by table ids'
+    description: Optional[str] = (
+        "**Returns** tables from db by the list of **table ids** with one query. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "Instead of a nested full order data, "
+        "it will only return the start and end datetime."
+    )
+    response_model: Optional[Type[Any]] = BatchGetSchema[FullTableGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Found tables and missing ids'
+
+
+@dataclass
+class TableOutputGetChanges:
+    summary: Optional[str] = 'Get tables changed since the cursor'
+    description: Optional[str] = (
+        "**Returns** tables changed after the **cursor** and ids of deleted tables "
+        "in the order of change time. <br />"
+        "The response cursor is used in the next request to get only new changes. <br />"
+        "Available to all **confirmed users.** <br />"
+        "<br />"
+        "**Non-superuser behavior:** <br />"
+        "Instead of a nested full order data, "
+        "it will only return the start and end datetime."
+    )
+    response_model: Optional[Type[Any]] = ChangesGetSchema[FullTableGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Changed tables, deleted ids and the next cursor'
+
+
 @dataclass
 class TableOutputGet:
     summary: Optional[str] = 'Get table by table id'
@@ -96,6 +237,8 @@ class TableOutputDelete:
     summary: Optional[str] = 'Delete table by table id'
     description: Optional[str] = (
         "**Deletes** table from db by **table id**. <br />"
+        "The table is deleted at once, the links of the orders to the table are deleted in the background "
+        "and the future orders of the table are repriced. <br />"
         "Only available to **superuser or admin.**"
     )
     response_model: Optional[Type[Any]] = TableResponseDeleteSchema
@@ -107,6 +250,8 @@ class TableOutputPatch:
     summary: Optional[str] = 'Patch table by table id'
     description: Optional[str] = (
         "**Updates** table from db by **table id**. <br />"
+        "If **price_per_hour** is changed, the cost of the future orders of the table "
+        "is computed again in the background. <br />"
         "Only available to **superuser or admin.**"
     )
     response_model: Optional[Type[Any]] = TableResponsePatchSchema
@@ -122,3 +267,36 @@ class TableOutputPost:
     )
     response_model: Optional[Type[Any]] = TableResponsePostSchema
     status_code: Optional[int] = status.HTTP_201_CREATED
+
+
+@dataclass
+class TableOutputPatchBulk:
+    summary: Optional[str] = 'Patch tables by ids or parameters'
+    description: Optional[str] = (
+        "**Updates** all tables found by **ids** and (or) **parameters** "
+        "with the same data by one statement. <br />"
+        "The parameters are the same as in 'GET /tables/'. <br />"
+        "With **dry_run** the tables are only counted. <br />"
+        "If **price_per_hour** is changed, the cost of the future orders of the updated tables "
+        "is computed again in the background. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = BatchResponseBulkSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Number and ids of updated tables'
+
+
+@dataclass
+class TableOutputDeleteBulk:
+    summary: Optional[str] = 'Delete tables by ids or parameters'
+    description: Optional[str] = (
+        "**Deletes** all tables found by **ids** and (or) **parameters** by one statement. <br />"
+        "The parameters are the same as in 'GET /tables/'. <br />"
+        "With **dry_run** the tables are only counted. <br />"
+        "The links of the orders to the deleted tables are deleted in the background "
+        "and the future orders of the tables are repriced. <br />"
+        "Only available to **superuser or admin.**"
+    )
+    response_model: Optional[Type[Any]] = BatchResponseBulkSchema
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Number and ids of deleted tables'
@@ -3,12 +3,18 @@ from typing import Literal, Optional, Type, Any
 
 from fastapi import Query, Path, Body, status
 
+from src.config import get_settings
 from src.api.schemes.user.base_schemes import (UserGetSchema,
                                                UserPatchSchema,
-                                               UserPostSchema)
+                                               UserPostSchema,
+                                               UserWithOrderStatsGetSchema)
 from src.api.schemes.user.response_schemes import (UserResponsePatchSchema,
                                                    UserResponseDeleteSchema,
                                                    UserResponsePostSchema)
+from src.api.schemes.batch.base_schemes import BatchGetSchema
+from src.api.schemes.changes.base_schemes import ChangesGetSchema
+
+settings = get_settings()
 
 
 @dataclass
@@ -17,8 +23,62 @@ class UserInterfaceGetAll:
     status: Literal['confirmed'] | Literal['unconfirmed'] = Query(
         default=None, description="'confirmed' or 'unconfirmed'"
     )
-    
-    
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,username,email'
+    )
+    include: str = Query(
+        default=None,
+        description="'order_stats' to add the order stats of each user, nothing by default",
+        example='order_stats'
+    )
+
+
+@dataclass
+class UserInterfaceGetBatch:
+    ids: str = Query(
+        ...,
+        regex=r'^\d+(,\d+)*$',
+        description="Comma separated user ids",
+        example='1,2,3'
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,username,email'
+    )
+
+
+@dataclass
+class UserInterfaceGetChanges:
+    since: str = Query(
+        default=None,
+        description="Cursor from the previous response, all users are returned without it"
+    )
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=settings.CHANGES_MAX_LIMIT,
+        description="Max number of users"
+    )
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,username,email'
+    )
+
+
+@dataclass
+class UserInterfaceGet:
+    user_id: int = Path(..., ge=1)
+    fields: str = Query(
+        default=None,
+        description="Comma separated response fields, all fields by default",
+        example='id,username,email'
+    )
+
+
 @dataclass
 class UserInterfacePatch:
     user_id: int = Path(..., ge=1)
@@ -47,13 +107,41 @@ class UserOutputGetAll:
     summary: Optional[str] = 'Get all users by parameters'
     description: Optional[str] = (
         "**Returns** all users from db by **parameters**. <br />"
+        "'order_stats' are returned only if included, they are kept up to date by the db triggers "
+        "of the orders, 'null' if the user has no orders. <br />"
         "Only available to **superuser.**"
     )
-    response_model: Optional[Type[Any]] = list[UserGetSchema]
+    response_model: Optional[Type[Any]] = list[UserWithOrderStatsGetSchema]
     status_code: Optional[int] = status.HTTP_200_OK
     response_description: str = 'List of users'
     
 
+@dataclass
+class UserOutputGetBatch:
+    summary: Optional[str] = 'Get users by user ids'
+    description: Optional[str] = (
+        "**Returns** users from db by the list of **user ids** with one query. <br />"
+        "Only available to **superuser.**"
+    )
+    response_model: Optional[Type[Any]] = BatchGetSchema[UserGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Found users and missing ids'
+
+
+@dataclass
+class UserOutputGetChanges:
+    summary: Optional[str] = 'Get users changed since the cursor'
+    description: Optional[str] = (
+        "**Returns** users changed after the **cursor** and ids of deleted users "
+        "in the order of change time. <br />"
+        "The response cursor is used in the next request to get only new changes. <br />"
+        "Only available to **superuser.**"
+    )
+    response_model: Optional[Type[Any]] = ChangesGetSchema[UserGetSchema]
+    status_code: Optional[int] = status.HTTP_200_OK
+    response_description: str = 'Changed users, deleted ids and the next cursor'
+
+
 @dataclass
 class UserOutputGet:
     summary: Optional[str] = 'Get user by user id'
@@ -71,6 +159,7 @@ class UserOutputDelete:
     summary: Optional[str] = 'Delete user by user id'
     description: Optional[str] = (
         "**Deletes** user from db by **user id**. <br />"
+        "The user is deleted at once, the orders of the user are deleted in the background. <br />"
         "Only available to **superuser.**"
     )
     response_model: Optional[Type[Any]] = UserResponseDeleteSchema
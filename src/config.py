@@ -54,12 +54,65 @@ class Settings(BaseSettings):
     MAIL_SSL: bool = False
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    EMAIL_BATCH_SIZE: int = 100  # max letters sent over one SMTP session
 
     # REDIS related settings
     REDIS_HOST: str = Field(..., env='REDIS_HOST')
     REDIS_PORT: str = Field(..., env='REDIS_PORT')
     REDIS_PASSWORD: str = Field(..., env='REDIS_PASSWORD')
     REDIS_DB_NUMBER: int = 0
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # Response cache related settings
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: int = 30  # seconds while the cached response is fresh
+    RESPONSE_CACHE_STALE_TTL: int = 300  # seconds while the stale response can be served
+    RESPONSE_COALESCING_TIMEOUT: float = 10  # seconds to wait for the identical in-flight request
+
+    # Multi-get related settings
+    MULTI_GET_MAX_IDS: int = 100  # max ids in one '/{resource}/batch' request
+
+    # Batch related settings
+    BATCH_MAX_OPERATIONS: int = 100  # max operations in one 'POST /batch' request
+    ORDERS_BULK_MAX_ITEMS: int = 500  # max orders in one 'POST /orders/bulk' request
+
+    # Delta sync related settings
+    # Changes of the last seconds are returned later,
+    # so rows of transactions that are not committed yet are not skipped by the cursor.
+    CHANGES_SAFETY_LAG: int = 5  # seconds
+    CHANGES_MAX_LIMIT: int = 1000  # max rows in one '/{resource}/changes' response
+
+    # Export related settings
+    EXPORT_CHUNK_SIZE: int = 1000  # rows fetched from the server-side cursor at a time
+    EXPORT_DIR: Path = project_dir.joinpath('exports')  # files of the background exports
+
+    # Partitioning related settings
+    ORDERS_PARTITION_MONTHS_AHEAD: int = 3  # next months with the order partitions created in advance
+
+    # Archival related settings
+    ORDERS_ARCHIVE_AFTER_DAYS: int = 365  # orders that started earlier are moved to the archive
+    ORDERS_ARCHIVE_BATCH_SIZE: int = 5000  # orders moved in one transaction
+
+    # Repricing related settings
+    ORDERS_REPRICE_IN_BACKGROUND: bool = True  # False to reprice the future orders in the table update transaction
+
+    # Deletion related settings
+    DELETE_CASCADE_IN_BACKGROUND: bool = True  # False to change the dependent rows in the deletion transaction
+    DELETE_CASCADE_BATCH_SIZE: int = 1000  # dependent rows changed in one transaction
+    # Clients that sync less often than that miss the ids of the purged rows.
+    PURGE_DELETED_AFTER_DAYS: int = 90  # rows deleted earlier are deleted from the db
+    PURGE_BATCH_SIZE: int = 5000  # rows purged in one transaction
+
+    # Reports related settings
+    REPORTS_REFRESH_INTERVAL: int = 900  # seconds between the refreshes of the report views
+    REPORTS_OCCUPANCY_MAX_DAYS: int = 731  # the longest date range of the occupancy heatmap
+
+    # Response compression related settings
+    COMPRESSION_MINIMUM_SIZE: int = 1000  # bytes, smaller responses are not compressed
+    COMPRESSION_CONTENT_TYPES: list = ['application/json', 'application/x-ndjson',
+                                       'text/csv', 'text/html', 'text/plain']
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # used only if 'brotli' package is installed
 
     # CELERY related settings
     CELERY_BROKER_TRANSPORT_OPTIONS: dict = {'visibility_timeout': 3600}
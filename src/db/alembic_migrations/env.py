@@ -17,7 +17,9 @@ from src.api.models.user import UserModel
 from src.api.models.order import OrderModel
 from src.api.models.table import TableModel
 from src.api.models.relationships import orders_tables
+from src.api.models.archive import orders_archive, orders_tables_archive
 from src.api.models.schedule import ScheduleModel
+from src.api.models.user_order_stats import UserOrderStatsModel
 
 settings = get_settings()
 
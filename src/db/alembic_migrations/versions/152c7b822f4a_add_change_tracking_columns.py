@@ -0,0 +1,56 @@
+"""add_change_tracking_columns
+
+Revision ID: 152c7b822f4a
+Revises: 5aa63ee6d8af
+Create Date: 2026-10-19 13:20:11.204718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '152c7b822f4a'
+down_revision = '5aa63ee6d8af'
+branch_labels = None
+depends_on = None
+
+TABLES: tuple[str, ...] = ('orders', 'tables', 'schedules', 'users')
+USER_UNIQUE_COLUMNS: tuple[str, ...] = ('username', 'email', 'phone')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # Existing rows get the migration time as the change time.
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(),
+                                       server_default=sa.text('now()'), nullable=False))
+        op.add_column(table, sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+        op.create_index(op.f(f'ix_{table}_deleted_at'), table, ['deleted_at'], unique=False)
+
+    # Deleted rows are kept, so the values must be unique among not deleted rows only.
+    for column in USER_UNIQUE_COLUMNS:
+        op.drop_index(op.f(f'ix_users_{column}'), table_name='users')
+        op.create_index(op.f(f'ix_users_{column}'), 'users', [column], unique=True,
+                        postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_constraint('schedules_day_key', 'schedules', type_='unique')
+    op.create_index(op.f('ix_schedules_day'), 'schedules', ['day'], unique=True,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    # Deleted rows would break the unique constraints.
+    for table in reversed(TABLES):
+        op.execute(f'DELETE FROM {table} WHERE deleted_at IS NOT NULL')
+
+    op.drop_index(op.f('ix_schedules_day'), table_name='schedules')
+    op.create_unique_constraint('schedules_day_key', 'schedules', ['day'])
+    for column in USER_UNIQUE_COLUMNS:
+        op.drop_index(op.f(f'ix_users_{column}'), table_name='users')
+        op.create_index(op.f(f'ix_users_{column}'), 'users', [column], unique=True)
+
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table}_deleted_at'), table_name=table)
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'deleted_at')
+        op.drop_column(table, 'updated_at')
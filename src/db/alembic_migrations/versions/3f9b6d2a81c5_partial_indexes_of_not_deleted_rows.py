@@ -0,0 +1,78 @@
+"""partial_indexes_of_not_deleted_rows
+
+Revision ID: 3f9b6d2a81c5
+Revises: e51a0c8d3f62
+Create Date: 2026-10-19 21:14:06.502731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9b6d2a81c5'
+down_revision = 'e51a0c8d3f62'
+branch_labels = None
+depends_on = None
+
+# Index name: (table, columns, partial index predicate before, partial index predicate after).
+INDEXES: dict[str, tuple[str, list[str], str | None, str]] = {
+    'ix_orders_user_id_start_datetime': ('orders', ['user_id', 'start_datetime'],
+                                         None, 'deleted_at IS NULL'),
+    'ix_orders_start_datetime_end_datetime': ('orders', ['start_datetime', 'end_datetime'],
+                                              None, 'deleted_at IS NULL'),
+    'ix_orders_deleted_at': ('orders', ['deleted_at'], None, 'deleted_at IS NOT NULL'),
+    'ix_tables_type_number_of_seats': ('tables', ['type', 'number_of_seats'], None, 'deleted_at IS NULL'),
+    'ix_tables_deleted_at': ('tables', ['deleted_at'], None, 'deleted_at IS NOT NULL'),
+    'ix_users_deleted_at': ('users', ['deleted_at'], None, 'deleted_at IS NOT NULL'),
+    'ix_schedules_deleted_at': ('schedules', ['deleted_at'], None, 'deleted_at IS NOT NULL'),
+}
+PARTITIONED_TABLES: tuple[str, ...] = ('orders',)
+
+
+def find_partitions(table: str) -> list[str]:
+    return op.get_bind().execute(sa.text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE parent.relname = :table ORDER BY child.relname'
+    ), {'table': table}).scalars().all()
+
+
+def replace_index(name: str, table: str, columns: list[str], where: str | None) -> None:
+    """
+    Replaces the index by the index with the given predicate without locking the table for writes.
+    The new index is created concurrently under a temporary name, then the old one is dropped.
+    'CONCURRENTLY' can't be used for the partitioned table, so its index is created for the table only,
+    the indexes of the partitions are created concurrently and attached, then the index becomes valid.
+    """
+    definition: str = f"({', '.join(columns)})" + (f' WHERE {where}' if where else '')
+    # Indexes of the partitions are named by the partition and the index, they are dropped with the old index.
+    index_names: dict[str, str] = {name: table}
+    if table in PARTITIONED_TABLES:
+        index_names.update({f"{partition}_{name.removeprefix('ix_')}": partition
+                            for partition in find_partitions(table)})
+        op.execute(f'CREATE INDEX {name}_new ON ONLY {table} {definition}')
+        for index_name, partition in list(index_names.items())[1:]:
+            op.execute(f'CREATE INDEX CONCURRENTLY {index_name}_new ON {partition} {definition}')
+            op.execute(f'ALTER INDEX {name}_new ATTACH PARTITION {index_name}_new')
+        op.execute(f'DROP INDEX {name}')
+    else:
+        op.execute(f'CREATE INDEX CONCURRENTLY {name}_new ON {table} {definition}')
+        op.execute(f'DROP INDEX CONCURRENTLY {name}')
+    for index_name in index_names:
+        op.execute(f'ALTER INDEX {index_name}_new RENAME TO {index_name}')
+
+
+def upgrade() -> None:
+    # Deleted rows are excluded from all queries, so the indexes cover the not deleted rows only
+    # and the purge job finds the deleted rows by the index of the deleted rows.
+    with op.get_context().autocommit_block():
+        for name, (table, columns, _, where) in INDEXES.items():
+            replace_index(name, table, columns, where)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where, _) in reversed(INDEXES.items()):
+            replace_index(name, table, columns, where)
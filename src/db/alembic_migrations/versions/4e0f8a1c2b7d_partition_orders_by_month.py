@@ -0,0 +1,156 @@
+"""partition_orders_by_month
+
+Revision ID: 4e0f8a1c2b7d
+Revises: db075d6d4eb2
+Create Date: 2026-10-19 17:05:12.384910
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e0f8a1c2b7d'
+down_revision = 'db075d6d4eb2'
+branch_labels = None
+depends_on = None
+
+# Partitions are created up to this number of months after the current one,
+# the next ones are created by 'python -m src.utils.partitioning --create_partitions'.
+MONTHS_AHEAD: int = 3
+# Index name: (table, columns, partial index predicate).
+INDEXES: dict[str, tuple[str, list[str], str | None]] = {
+    'ix_orders_updated_at': ('orders', ['updated_at'], None),
+    'ix_orders_deleted_at': ('orders', ['deleted_at'], None),
+    'ix_orders_user_id_start_datetime': ('orders', ['user_id', 'start_datetime'], None),
+    'ix_orders_start_datetime_end_datetime': ('orders', ['start_datetime', 'end_datetime'], None),
+    'ix_orders_tables_table_id_order_id': ('orders_tables', ['table_id', 'order_id'], None),
+    'ix_orders_tables_order_id': ('orders_tables', ['order_id'], None),
+}
+
+
+def get_first_day_of_next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def create_indexes() -> None:
+    for name, (table, columns, where) in INDEXES.items():
+        op.create_index(name, table, columns, unique=False,
+                        postgresql_where=sa.text(where) if where else None)
+
+
+def create_order_columns() -> list[sa.Column]:
+    return [
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('end_datetime', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=25), nullable=True),
+        sa.Column('cost', sa.Float(precision=2), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], onupdate='CASCADE', ondelete='CASCADE')
+    ]
+
+
+def upgrade() -> None:
+    # The old tables are kept under other names until the rows are copied.
+    op.rename_table('orders_tables', 'orders_tables_old')
+    op.execute('ALTER TABLE orders_tables_old RENAME CONSTRAINT orders_tables_pkey TO orders_tables_old_pkey')
+    op.execute('ALTER SEQUENCE orders_tables_id_seq RENAME TO orders_tables_old_id_seq')
+    op.rename_table('orders', 'orders_old')
+    op.execute('ALTER TABLE orders_old RENAME CONSTRAINT orders_pkey TO orders_old_pkey')
+    for name, (table, _, _) in INDEXES.items():
+        op.drop_index(name, table_name=f'{table}_old')
+
+    # The partition key must be a part of the primary key and the order reference.
+    op.create_table('orders',
+                    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('start_datetime', sa.DateTime(), nullable=False),
+                    *create_order_columns(),
+                    sa.PrimaryKeyConstraint('id', 'start_datetime'),
+                    postgresql_partition_by='RANGE (start_datetime)')
+    op.create_table('orders_tables',
+                    sa.Column('id', sa.Integer(), sa.Identity(), nullable=False),
+                    sa.Column('order_id', sa.Integer(), nullable=True),
+                    sa.Column('table_id', sa.Integer(), nullable=True),
+                    sa.Column('start_datetime', sa.DateTime(), nullable=False),
+                    sa.ForeignKeyConstraint(['order_id', 'start_datetime'],
+                                            ['orders.id', 'orders.start_datetime'],
+                                            name='orders_tables_order_id_start_datetime_fkey',
+                                            onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['table_id'], ['tables.id'], onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id', 'start_datetime'),
+                    postgresql_partition_by='RANGE (start_datetime)')
+
+    # One partition for each month from the first order to the months ahead.
+    first_start: date | None = op.get_bind().execute(
+        sa.text('SELECT min(start_datetime)::date FROM orders_old')
+    ).scalar()
+    month: date = (first_start or date.today()).replace(day=1)
+    last_month: date = date.today().replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last_month = get_first_day_of_next_month(last_month)
+    while month <= last_month:
+        for table in ('orders', 'orders_tables'):
+            op.execute(f"CREATE TABLE {table}_y{month.year}m{month.month:02} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{month}') TO ('{get_first_day_of_next_month(month)}')")
+        month = get_first_day_of_next_month(month)
+    for table in ('orders', 'orders_tables'):
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute('INSERT INTO orders (updated_at, deleted_at, id, start_datetime, end_datetime, '
+               'status, cost, user_id) '
+               'SELECT updated_at, deleted_at, id, start_datetime, end_datetime, status, cost, user_id '
+               'FROM orders_old')
+    # Rows without the order are lost anyway.
+    op.execute('INSERT INTO orders_tables (id, order_id, table_id, start_datetime) '
+               'SELECT orders_tables_old.id, orders_tables_old.order_id, orders_tables_old.table_id, '
+               'orders_old.start_datetime '
+               'FROM orders_tables_old JOIN orders_old ON orders_old.id = orders_tables_old.order_id')
+    op.execute("SELECT setval(pg_get_serial_sequence('orders_tables', 'id'), "
+               "coalesce(max(id), 0) + 1, false) FROM orders_tables")
+    # Indexes of the partitioned tables are created on each partition, after the rows are copied.
+    create_indexes()
+
+    op.drop_table('orders_tables_old')
+    op.drop_table('orders_old')
+
+
+def downgrade() -> None:
+    # The rows of the detached partitions are not returned.
+    op.create_table('orders_plain',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('start_datetime', sa.DateTime(), nullable=True),
+                    *create_order_columns(),
+                    sa.PrimaryKeyConstraint('id', name='orders_plain_pkey'))
+    op.create_table('orders_tables_plain',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('order_id', sa.Integer(), nullable=True),
+                    sa.Column('table_id', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['order_id'], ['orders_plain.id'],
+                                            name='orders_tables_order_id_fkey',
+                                            onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['table_id'], ['tables.id'], onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id', name='orders_tables_plain_pkey'))
+    op.execute('INSERT INTO orders_plain (updated_at, deleted_at, id, start_datetime, end_datetime, '
+               'status, cost, user_id) '
+               'SELECT updated_at, deleted_at, id, start_datetime, end_datetime, status, cost, user_id '
+               'FROM orders')
+    op.execute('INSERT INTO orders_tables_plain (id, order_id, table_id) '
+               'SELECT id, order_id, table_id FROM orders_tables')
+    op.execute("SELECT setval('orders_tables_plain_id_seq', coalesce(max(id), 0) + 1, false) "
+               "FROM orders_tables_plain")
+
+    # Partitions are dropped with the tables.
+    op.drop_table('orders_tables')
+    op.drop_table('orders')
+    op.rename_table('orders_plain', 'orders')
+    op.execute('ALTER TABLE orders RENAME CONSTRAINT orders_plain_pkey TO orders_pkey')
+    op.execute('ALTER TABLE orders RENAME CONSTRAINT orders_plain_user_id_fkey TO orders_user_id_fkey')
+    op.rename_table('orders_tables_plain', 'orders_tables')
+    op.execute('ALTER TABLE orders_tables RENAME CONSTRAINT orders_tables_plain_pkey TO orders_tables_pkey')
+    op.execute('ALTER TABLE orders_tables '
+               'RENAME CONSTRAINT orders_tables_plain_table_id_fkey TO orders_tables_table_id_fkey')
+    op.execute('ALTER SEQUENCE orders_tables_plain_id_seq RENAME TO orders_tables_id_seq')
+    create_indexes()
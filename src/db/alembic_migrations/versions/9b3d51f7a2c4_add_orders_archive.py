@@ -0,0 +1,60 @@
+"""add_orders_archive
+
+Revision ID: 9b3d51f7a2c4
+Revises: 4e0f8a1c2b7d
+Create Date: 2026-10-19 18:21:47.902315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3d51f7a2c4'
+down_revision = '4e0f8a1c2b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('orders_archive',
+                    sa.Column('updated_at', sa.DateTime(), nullable=False),
+                    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+                    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('start_datetime', sa.DateTime(), nullable=False),
+                    sa.Column('end_datetime', sa.DateTime(), nullable=True),
+                    sa.Column('status', sa.String(length=25), nullable=True),
+                    sa.Column('cost', sa.Float(precision=2), nullable=True),
+                    sa.Column('user_id', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index(op.f('ix_orders_archive_start_datetime'), 'orders_archive', ['start_datetime'], unique=False)
+    op.create_index('ix_orders_archive_user_id_start_datetime', 'orders_archive', ['user_id', 'start_datetime'],
+                    unique=False)
+    op.create_table('orders_tables_archive',
+                    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('order_id', sa.Integer(), nullable=True),
+                    sa.Column('table_id', sa.Integer(), nullable=True),
+                    sa.Column('start_datetime', sa.DateTime(), nullable=False),
+                    sa.ForeignKeyConstraint(['order_id'], ['orders_archive.id'],
+                                            onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['table_id'], ['tables.id'], onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'))
+    op.create_index(op.f('ix_orders_tables_archive_order_id'), 'orders_tables_archive', ['order_id'], unique=False)
+    op.create_index(op.f('ix_orders_tables_archive_table_id'), 'orders_tables_archive', ['table_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Archived orders are returned to the orders.
+    op.execute('INSERT INTO orders (updated_at, deleted_at, id, start_datetime, end_datetime, '
+               'status, cost, user_id) '
+               'SELECT updated_at, deleted_at, id, start_datetime, end_datetime, status, cost, user_id '
+               'FROM orders_archive')
+    op.execute('INSERT INTO orders_tables (id, order_id, table_id, start_datetime) '
+               'SELECT id, order_id, table_id, start_datetime FROM orders_tables_archive')
+    op.drop_index(op.f('ix_orders_tables_archive_table_id'), table_name='orders_tables_archive')
+    op.drop_index(op.f('ix_orders_tables_archive_order_id'), table_name='orders_tables_archive')
+    op.drop_table('orders_tables_archive')
+    op.drop_index('ix_orders_archive_user_id_start_datetime', table_name='orders_archive')
+    op.drop_index(op.f('ix_orders_archive_start_datetime'), table_name='orders_archive')
+    op.drop_table('orders_archive')
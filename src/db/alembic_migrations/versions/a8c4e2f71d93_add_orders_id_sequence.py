@@ -0,0 +1,28 @@
+"""add_orders_id_sequence
+
+Revision ID: a8c4e2f71d93
+Revises: 3f9b6d2a81c5
+Create Date: 2026-10-19 23:08:51.274160
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c4e2f71d93'
+down_revision = '3f9b6d2a81c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ids of the archived orders are not given again.
+    op.execute('CREATE SEQUENCE orders_id_seq OWNED BY orders.id')
+    op.execute("SELECT setval('orders_id_seq', greatest((SELECT max(id) FROM orders), "
+               "(SELECT max(id) FROM orders_archive), 0) + 1, false)")
+    op.execute("ALTER TABLE orders ALTER COLUMN id SET DEFAULT nextval('orders_id_seq')")
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE orders ALTER COLUMN id DROP DEFAULT')
+    op.execute('DROP SEQUENCE orders_id_seq')
@@ -0,0 +1,63 @@
+"""add_report_views
+
+Revision ID: c7e2a94d0f13
+Revises: 9b3d51f7a2c4
+Create Date: 2026-10-19 19:10:03.557261
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a94d0f13'
+down_revision = '9b3d51f7a2c4'
+branch_labels = None
+depends_on = None
+
+ORDERS_SQL: str = (
+    'SELECT id, start_datetime, end_datetime, status, cost, user_id FROM orders WHERE deleted_at IS NULL '
+    'UNION ALL '
+    'SELECT id, start_datetime, end_datetime, status, cost, user_id FROM orders_archive WHERE deleted_at IS NULL'
+)
+ORDER_TABLES_SQL: str = (
+    'SELECT CAST(o.start_datetime AS date) AS day, t.id AS table_id, t.type AS table_type, '
+    'ceil(extract(epoch FROM o.end_datetime - o.start_datetime) / 3600) AS hours, '
+    'coalesce(o.cost * t.price_per_hour '
+    '/ nullif(sum(t.price_per_hour) OVER (PARTITION BY o.id), 0), 0) AS revenue '
+    f'FROM ({ORDERS_SQL}) AS o '
+    'JOIN (SELECT order_id, table_id FROM orders_tables '
+    'UNION ALL SELECT order_id, table_id FROM orders_tables_archive) AS ot ON ot.order_id = o.id '
+    'JOIN tables AS t ON t.id = ot.table_id'
+)
+# View name: (select, unique index columns).
+REPORT_VIEWS: dict[str, tuple[str, tuple[str, ...]]] = {
+    'mv_daily_table_revenue': (
+        'SELECT day, table_id, table_type, count(*) AS bookings, sum(revenue) AS revenue '
+        f'FROM ({ORDER_TABLES_SQL}) AS order_tables GROUP BY day, table_id, table_type',
+        ('day', 'table_id')
+    ),
+    'mv_daily_table_booked_hours': (
+        'SELECT day, table_id, count(*) AS bookings, sum(hours) AS booked_hours '
+        f'FROM ({ORDER_TABLES_SQL}) AS order_tables GROUP BY day, table_id',
+        ('day', 'table_id')
+    ),
+    'mv_user_orders': (
+        "SELECT user_id, count(*) AS orders, count(*) FILTER (WHERE status = 'confirmed') AS confirmed_orders, "
+        "coalesce(sum(cost), 0) AS total_cost, "
+        "min(start_datetime) AS first_order_at, max(start_datetime) AS last_order_at "
+        f"FROM ({ORDERS_SQL}) AS o WHERE user_id IS NOT NULL GROUP BY user_id",
+        ('user_id',)
+    )
+}
+
+
+def upgrade() -> None:
+    # The unique indexes are required to refresh the views 'CONCURRENTLY'.
+    for view_name, (view_select, unique_columns) in REPORT_VIEWS.items():
+        op.execute(f'CREATE MATERIALIZED VIEW {view_name} AS {view_select}')
+        op.create_index(f'ix_{view_name}_{"_".join(unique_columns)}', view_name, list(unique_columns), unique=True)
+
+
+def downgrade() -> None:
+    for view_name in reversed(REPORT_VIEWS):
+        op.execute(f'DROP MATERIALIZED VIEW {view_name}')
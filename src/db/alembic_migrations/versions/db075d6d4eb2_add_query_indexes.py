@@ -0,0 +1,40 @@
+"""add_query_indexes
+
+Revision ID: db075d6d4eb2
+Revises: 152c7b822f4a
+Create Date: 2026-10-19 15:42:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'db075d6d4eb2'
+down_revision = '152c7b822f4a'
+branch_labels = None
+depends_on = None
+
+# Index name: (table, columns, partial index predicate).
+INDEXES: dict[str, tuple[str, list[str], str | None]] = {
+    'ix_orders_user_id_start_datetime': ('orders', ['user_id', 'start_datetime'], None),
+    'ix_orders_start_datetime_end_datetime': ('orders', ['start_datetime', 'end_datetime'], None),
+    'ix_orders_tables_table_id_order_id': ('orders_tables', ['table_id', 'order_id'], None),
+    'ix_orders_tables_order_id': ('orders_tables', ['order_id'], None),
+    'ix_tables_type_number_of_seats': ('tables', ['type', 'number_of_seats'], None),
+}
+
+
+def upgrade() -> None:
+    # 'CONCURRENTLY' doesn't lock the table for writes, but can't be run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where) in INDEXES.items():
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_where=sa.text(where) if where else None,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, _, _) in reversed(INDEXES.items()):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,83 @@
+"""add_user_order_stats
+
+Revision ID: e51a0c8d3f62
+Revises: c7e2a94d0f13
+Create Date: 2026-10-19 20:02:41.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e51a0c8d3f62'
+down_revision = 'c7e2a94d0f13'
+branch_labels = None
+depends_on = None
+
+APPLY_FUNCTION_SQL: str = """
+CREATE OR REPLACE FUNCTION apply_user_order_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (OLD.user_id, OLD.cost, OLD.start_datetime, OLD.deleted_at)
+                            IS NOT DISTINCT FROM (NEW.user_id, NEW.cost, NEW.start_datetime, NEW.deleted_at) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL AND OLD.deleted_at IS NULL THEN
+        UPDATE user_order_stats
+        SET orders_count = orders_count - 1, total_spent = total_spent - coalesce(OLD.cost, 0)
+        WHERE user_id = OLD.user_id;
+        DELETE FROM user_order_stats WHERE user_id = OLD.user_id AND orders_count <= 0;
+        -- The last order is searched by the index only if it was the removed one.
+        UPDATE user_order_stats
+        SET last_order_at = greatest(
+            (SELECT max(start_datetime) FROM orders WHERE user_id = OLD.user_id AND deleted_at IS NULL),
+            (SELECT max(start_datetime) FROM orders_archive WHERE user_id = OLD.user_id AND deleted_at IS NULL)
+        )
+        WHERE user_id = OLD.user_id AND last_order_at <= OLD.start_datetime;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.user_id IS NOT NULL AND NEW.deleted_at IS NULL THEN
+        INSERT INTO user_order_stats AS stats (user_id, orders_count, total_spent, last_order_at)
+        VALUES (NEW.user_id, 1, coalesce(NEW.cost, 0), NEW.start_datetime)
+        ON CONFLICT (user_id) DO UPDATE
+        SET orders_count = stats.orders_count + 1,
+            total_spent = stats.total_spent + excluded.total_spent,
+            last_order_at = greatest(stats.last_order_at, excluded.last_order_at);
+    END IF;
+    RETURN NULL;
+END $$
+"""
+STATS_TRIGGER_TABLES: tuple[str, ...] = ('orders', 'orders_archive')
+
+
+def upgrade() -> None:
+    op.create_table('user_order_stats',
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('orders_count', sa.Integer(), nullable=False),
+                    sa.Column('total_spent', sa.Float(), nullable=False),
+                    sa.Column('last_order_at', sa.DateTime(), nullable=True),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], onupdate='CASCADE', ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('user_id'))
+    # The orders are locked, so the stats are computed and the triggers are created at the same point.
+    op.execute('LOCK TABLE orders, orders_archive IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(APPLY_FUNCTION_SQL)
+    for table_name in STATS_TRIGGER_TABLES:
+        op.execute(f'CREATE TRIGGER {table_name}_user_order_stats '
+                   f'AFTER INSERT OR UPDATE OR DELETE ON {table_name} '
+                   f'FOR EACH ROW EXECUTE FUNCTION apply_user_order_stats()')
+    op.execute('INSERT INTO user_order_stats (user_id, orders_count, total_spent, last_order_at) '
+               'SELECT user_id, count(*), coalesce(sum(cost), 0), max(start_datetime) '
+               'FROM (SELECT user_id, cost, start_datetime FROM orders '
+               '      WHERE deleted_at IS NULL AND user_id IS NOT NULL '
+               '      UNION ALL '
+               '      SELECT user_id, cost, start_datetime FROM orders_archive '
+               '      WHERE deleted_at IS NULL AND user_id IS NOT NULL) AS all_orders '
+               'GROUP BY user_id')
+
+
+def downgrade() -> None:
+    for table_name in STATS_TRIGGER_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table_name}_user_order_stats ON {table_name}')
+    op.execute('DROP FUNCTION IF EXISTS apply_user_order_stats()')
+    op.drop_table('user_order_stats')
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+from redis import Redis
+
+from src.config import get_settings
+
+setting = get_settings()
+
+
+@lru_cache()
+def get_redis() -> Redis:
+    """
+    Gets the cached redis client.
+    The client holds a connection pool, so it is created once per process.
+    """
+    return Redis.from_url(setting.get_redis_url(),
+                          socket_timeout=setting.REDIS_SOCKET_TIMEOUT,
+                          socket_connect_timeout=setting.REDIS_SOCKET_TIMEOUT)
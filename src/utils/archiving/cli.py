@@ -0,0 +1,44 @@
+import argparse
+from datetime import datetime as dt
+
+from src.config import get_settings
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.archiving.main import archive_orders, get_archive_horizon
+from src.utils.color_logging.main import logger
+from src.utils.response_cache.main import invalidate_cached_responses
+
+settings = get_settings()
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Archival of the past orders",
+        description="Moves the orders that started before the archive horizon with their tables "
+                    "to the archive tables by batches.",
+        epilog="Try '--archive_orders'"
+    )
+    parser.add_argument('--archive_orders', action='store_true', help='move the past orders to the archive')
+    parser.add_argument('--before', type=dt.fromisoformat, metavar="", default=None,
+                        help="move the orders that start before the given ISO date or datetime, "
+                             "by default 'ORDERS_ARCHIVE_AFTER_DAYS' days ago")
+    parser.add_argument('--batch_size', type=int, metavar="", default=settings.ORDERS_ARCHIVE_BATCH_SIZE,
+                        help='number of the orders moved in one transaction')
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if not args.archive_orders:
+        raise ValueError("argument '--archive_orders' cannot be empty.")
+
+    before: dt = args.before or get_archive_horizon(settings.ORDERS_ARCHIVE_AFTER_DAYS)
+    with SessionLocal() as db:
+        archived_orders: int = archive_orders(
+            db=db,
+            before=before,
+            batch_size=args.batch_size,
+            on_progress=lambda orders: logger.info(f'Archived orders: {orders}')
+        )
+    if archived_orders:
+        invalidate_cached_responses('orders')
+    logger.success(f'{archived_orders} orders that start before {before} have been archived')
@@ -0,0 +1,90 @@
+"""
+Archival of the past orders.
+
+Orders that started before the archive horizon are moved with their tables
+from the orders to the archive tables ('orders_archive', 'orders_tables_archive'),
+so the booking checks and the order lists scan only the live orders.
+Orders are moved by batches, each batch is moved by one statement in its own transaction,
+so the locks are short and the done batches are kept if the job is stopped.
+The order lists read the archive too if the searched time range reaches it.
+"""
+from datetime import date, datetime as dt, time, timedelta as td
+from typing import Callable
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert
+
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+
+orders = OrderModel.__table__
+
+
+def get_archive_horizon(archive_after_days: int) -> dt:
+    """:return: start of the day, orders that start earlier are archived."""
+    return dt.combine(date.today() - td(days=archive_after_days), time.min)
+
+
+def make_archive_batch_statement(before: dt, batch_size: int) -> Insert:
+    """
+    Makes the statement that moves one batch of the orders that start before the given time
+    with their tables to the archive tables.
+    The rows locked by other transactions are skipped, they are moved by the next run.
+    :param before: orders that start earlier are moved.
+    :param batch_size: max number of the moved orders.
+    :return: insert statement that returns the ids of the moved orders.
+    """
+    batch = (select(orders.c.id, orders.c.start_datetime)
+             .where(orders.c.start_datetime < before)
+             .order_by(orders.c.start_datetime, orders.c.id)
+             .limit(batch_size)
+             .with_for_update(skip_locked=True)
+             .cte('batch'))
+    # Order tables are deleted before the orders, so they are not deleted by the cascade.
+    moved_order_tables = (delete(orders_tables)
+                          .where(orders_tables.c.order_id == batch.c.id,
+                                 orders_tables.c.start_datetime == batch.c.start_datetime)
+                          .returning(*orders_tables.c)
+                          .cte('moved_order_tables'))
+    moved_orders = (delete(orders)
+                    .where(orders.c.id == batch.c.id,
+                           orders.c.start_datetime == batch.c.start_datetime)
+                    .returning(*orders.c)
+                    .cte('moved_orders'))
+    archived_order_tables = (insert(orders_tables_archive)
+                             .from_select([column.name for column in orders_tables.c],
+                                          select(*moved_order_tables.c))
+                             .returning(orders_tables_archive.c.id)
+                             .cte('archived_order_tables'))
+    return (insert(orders_archive)
+            .from_select([column.name for column in orders.c], select(*moved_orders.c))
+            .returning(orders_archive.c.id)
+            .add_cte(archived_order_tables))
+
+
+def archive_orders(db: Session,
+                   before: dt,
+                   batch_size: int,
+                   on_progress: Callable[[int], None] | None = None
+                   ) -> int:
+    """
+    Moves the orders that start before the given time with their tables to the archive tables by batches.
+    Each batch is committed separately.
+    :param db: db session.
+    :param before: orders that start earlier are moved.
+    :param batch_size: max number of the orders moved in one transaction.
+    :param on_progress: called with the number of the moved orders after each batch.
+    :return: number of the moved orders.
+    """
+    statement: Insert = make_archive_batch_statement(before, batch_size)
+    archived_orders: int = 0
+    while True:
+        archived_ids: list[int] = db.execute(statement).scalars().all()
+        db.commit()
+        archived_orders += len(archived_ids)
+        if on_progress is not None:
+            on_progress(archived_orders)
+        if len(archived_ids) < batch_size:
+            return archived_orders
@@ -0,0 +1,5 @@
+from src.utils.cascade_deletion.cli import main
+
+
+if __name__ == '__main__':
+    main()
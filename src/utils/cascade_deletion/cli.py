@@ -0,0 +1,43 @@
+import argparse
+
+from src.config import get_settings
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.cascade_deletion.main import CASCADE_STATEMENTS, cascade_deletion
+from src.utils.color_logging.main import logger
+from src.utils.response_cache.main import invalidate_cached_responses
+
+settings = get_settings()
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Cascade of the deletion",
+        description="Marks the orders of the deleted users as deleted "
+                    "and deletes the order tables of the deleted tables by batches.",
+        epilog="Try '--cascade users'"
+    )
+    parser.add_argument('--cascade', choices=tuple(CASCADE_STATEMENTS), metavar="",
+                        help="'users' or 'tables', the deletion of which is cascaded")
+    parser.add_argument('--ids', type=lambda ids: [int(id_) for id_ in ids.split(',')], metavar="",
+                        default=None, help='comma separated ids of the deleted rows, all deleted rows by default')
+    parser.add_argument('--batch_size', type=int, metavar="", default=settings.DELETE_CASCADE_BATCH_SIZE,
+                        help='number of the rows changed in one transaction')
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if args.cascade is None:
+        raise ValueError("argument '--cascade' cannot be empty.")
+
+    with SessionLocal() as db:
+        rows: int = cascade_deletion(
+            db=db,
+            resource=args.cascade,
+            ids=args.ids,
+            batch_size=args.batch_size,
+            on_progress=lambda rows: logger.info(f'Changed rows: {rows}')
+        )
+    if rows:
+        invalidate_cached_responses('orders')
+    logger.success(f'Deletion of the {args.cascade} has been cascaded to {rows} rows')
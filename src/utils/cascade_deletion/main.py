@@ -0,0 +1,128 @@
+"""
+Cascade of the deletion of the users and tables to their dependent rows.
+
+Users and tables are only marked as deleted by 'deleted_at', so the db does not cascade their deletion.
+The orders of the deleted users are marked as deleted at the time of the user deletion,
+the order tables of the deleted tables are deleted (the deleted tables are already hidden from the orders),
+their orders are marked as updated and the future ones are repriced like in 'src.utils.repricing'.
+A user or a table can have thousands of orders, so the rows are changed by batches,
+each batch is changed by one statement in its own transaction,
+so the locks are short and the bookings are not stalled.
+"""
+from typing import Callable, Literal
+
+from sqlalchemy import case, delete, func, select, tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Update
+
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+from src.api.models.user import UserModel
+from src.utils.repricing.main import get_booked_hours
+
+CASCADE_RESOURCE = Literal['users', 'tables']
+
+orders = OrderModel.__table__
+tables = TableModel.__table__
+users = UserModel.__table__
+
+
+def make_user_orders_statement(user_ids: list[int] | None, batch_size: int | None) -> Update:
+    """
+    Makes the statement that marks one batch of the not deleted orders of the deleted users as deleted.
+    The orders get the deletion time of their user.
+    :param user_ids: ids of the deleted users (not deleted users are skipped) or all deleted users if None.
+    :param batch_size: max number of the changed orders or all orders if None.
+    :return: update statement that returns the ids of the changed orders.
+    """
+    batch = (select(orders.c.id, orders.c.start_datetime, users.c.deleted_at)
+             .join_from(orders, users, orders.c.user_id == users.c.id)
+             .where(users.c.id.in_(user_ids) if user_ids is not None else True,
+                    users.c.deleted_at.is_not(None),
+                    orders.c.deleted_at.is_(None))
+             .limit(batch_size)
+             .with_for_update(of=orders)
+             .cte('batch'))
+    return (update(orders)
+            .where(orders.c.id == batch.c.id,
+                   orders.c.start_datetime == batch.c.start_datetime)
+            .values(deleted_at=batch.c.deleted_at)
+            .returning(orders.c.id))
+
+
+def make_table_order_tables_statement(table_ids: list[int] | None, batch_size: int | None) -> Delete:
+    """
+    Makes the statement that deletes one batch of the order tables of the deleted tables.
+    The not deleted orders of the batch get the new 'updated_at' in the same statement,
+    so the delta sync returns them, and the future ones get the cost of their not deleted tables.
+    :param table_ids: ids of the deleted tables (not deleted tables are skipped) or all deleted tables if None.
+    :param batch_size: max number of the deleted rows or all rows if None.
+    :return: delete statement that returns the ids of the deleted rows.
+    """
+    batch = (select(orders_tables.c.id, orders_tables.c.order_id, orders_tables.c.start_datetime)
+             .join_from(orders_tables, tables, orders_tables.c.table_id == tables.c.id)
+             .where(tables.c.id.in_(table_ids) if table_ids is not None else True,
+                    tables.c.deleted_at.is_not(None))
+             .limit(batch_size)
+             .with_for_update(of=orders_tables)
+             .cte('batch'))
+    # All parts of the statement see the order tables before the deletion,
+    # so the deleted tables are skipped by 'deleted_at' instead.
+    price_per_hour = (select(func.coalesce(func.sum(tables.c.price_per_hour), 0))
+                      .join_from(orders_tables, tables, orders_tables.c.table_id == tables.c.id)
+                      .where(orders_tables.c.order_id == orders.c.id,
+                             orders_tables.c.start_datetime == orders.c.start_datetime,
+                             tables.c.deleted_at.is_(None))
+                      .scalar_subquery())
+    updated_orders = (update(orders)
+                      .where(tuple_(orders.c.id, orders.c.start_datetime).in_(
+                                 select(batch.c.order_id, batch.c.start_datetime)
+                             ),
+                             orders.c.deleted_at.is_(None))
+                      .values(updated_at=func.now(),
+                              # Past orders keep their cost.
+                              cost=case((orders.c.start_datetime >= func.localtimestamp(),
+                                         get_booked_hours() * price_per_hour),
+                                        else_=orders.c.cost))
+                      .cte('updated_orders'))
+    return (delete(orders_tables)
+            .where(orders_tables.c.id == batch.c.id,
+                   orders_tables.c.start_datetime == batch.c.start_datetime)
+            .add_cte(updated_orders)
+            .returning(orders_tables.c.id))
+
+
+CASCADE_STATEMENTS: dict[str, Callable[[list[int] | None, int | None], Update | Delete]] = {
+    'users': make_user_orders_statement,
+    'tables': make_table_order_tables_statement
+}
+
+
+def cascade_deletion(db: Session,
+                     resource: CASCADE_RESOURCE,
+                     ids: list[int] | None,
+                     batch_size: int,
+                     on_progress: Callable[[int], None] | None = None
+                     ) -> int:
+    """
+    Changes the dependent rows of the deleted users or tables by batches.
+    Each batch is committed separately, so the done batches are kept if the job is stopped
+    and the next run continues from the rest.
+    :param db: db session.
+    :param resource: 'users' or 'tables'.
+    :param ids: ids of the deleted users or tables or all deleted ones if None.
+    :param batch_size: max number of the rows changed in one transaction.
+    :param on_progress: called with the number of the changed rows after each batch.
+    :return: number of the changed rows.
+    """
+    statement: Update | Delete = CASCADE_STATEMENTS[resource](ids, batch_size)
+    changed_rows: int = 0
+    while True:
+        changed_ids: list[int] = db.execute(statement).scalars().all()
+        db.commit()
+        changed_rows += len(changed_ids)
+        if on_progress is not None:
+            on_progress(changed_rows)
+        if len(changed_ids) < batch_size:
+            return changed_rows
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from src.config import get_settings
 
 settings = get_settings()
@@ -12,4 +13,24 @@ app.conf.broker_url = settings.get_redis_url()
 # Backend result storage
 app.conf.result_backend = settings.get_redis_url()
 
+# Periodic tasks run by 'celery beat'
+app.conf.beat_schedule = {
+    'create-order-partitions': {
+        'task': 'src.utils.celery.celery_tasks.create_order_partitions',
+        'schedule': crontab(hour=3, minute=0)
+    },
+    'archive-old-orders': {
+        'task': 'src.utils.celery.celery_tasks.archive_old_orders',
+        'schedule': crontab(hour=3, minute=30)
+    },
+    'purge-deleted-rows': {
+        'task': 'src.utils.celery.celery_tasks.purge_old_deleted_rows',
+        'schedule': crontab(hour=4, minute=0)
+    },
+    'refresh-report-views': {
+        'task': 'src.utils.celery.celery_tasks.refresh_report_views',
+        'schedule': settings.REPORTS_REFRESH_INTERVAL
+    }
+}
+
 app.autodiscover_tasks()
@@ -1,9 +1,20 @@
 import asyncio
+from datetime import datetime as dt
 from typing import Literal
 
+from src.api.crud_operations.report import ReportOperation
 from src.config import get_settings
+from src.db.db_sqlalchemy import SessionLocal
 from src.utils.celery.celery_config import app
-from src.utils.composing_email.main import compose_email_with_action_link
+from src.utils.archiving.main import archive_orders, get_archive_horizon
+from src.utils.cascade_deletion.main import CASCADE_RESOURCE, cascade_deletion
+from src.utils.columnar_export.main import EXPORT_FORMAT, export_orders
+from src.utils.composing_email.main import (compose_email_with_action_link,
+                                           compose_emails_with_action_link)
+from src.utils.partitioning.main import create_partitions_ahead
+from src.utils.purging.main import get_purge_horizon, purge_deleted_rows
+from src.utils.repricing.main import reprice_future_orders
+from src.utils.response_cache.main import invalidate_cached_responses
 
 settings = get_settings()
 
@@ -30,3 +41,178 @@ def send_email(self,
         raise self.retry(exc=err, countdown=60)
 
     return True
+
+
+@app.task(bind=True)
+def send_emails_batch(self,
+                      users: list[dict],
+                      action: Literal['confirm_email'] | Literal['reset_password'],
+                      failed_recipients: list[str] | None = None
+                      ):
+    """
+    Sends emails to several users using celery.
+    Users are split into chunks of 'EMAIL_BATCH_SIZE',
+    each chunk is rendered in one pass and sent over one SMTP session.
+    If the connection fails, only the users whose letters were not sent yet are retried.
+    A letter that was being sent when the connection failed can be sent twice (at-least-once).
+    :param users: List of dicts with 'username' and 'email' keys.
+    :param action: 'confirm_email' or 'reset_password'.
+    :param failed_recipients: Refused recipients collected before the retry.
+    :return: Recipients of the letters that were refused by the mail server.
+    """
+    failed_recipients: list[str] = list(failed_recipients or [])
+    batch_size: int = settings.EMAIL_BATCH_SIZE
+
+    for chunk_start in range(0, len(users), batch_size):
+        chunk: list[dict] = users[chunk_start:chunk_start + batch_size]
+        sent_recipients: list[str] = []
+        try:
+            email, messages = compose_emails_with_action_link(users=chunk, action=action)
+            failed_recipients.extend(asyncio.run(email.send_messages(messages, sent_recipients)))
+
+        except Exception as err:
+            # Letters of the failed chunk that were already sent are not sent again.
+            sent_emails: set[str] = set(sent_recipients)
+            unsent_users: list[dict] = [user for user in users[chunk_start:] if user['email'] not in sent_emails]
+            raise self.retry(exc=err,
+                             countdown=60,
+                             kwargs={'users': unsent_users,
+                                     'action': action,
+                                     'failed_recipients': failed_recipients})
+
+    return failed_recipients
+
+
+@app.task(bind=True)
+def export_orders_to_file(self,
+                          start_datetime: str | None = None,
+                          end_datetime: str | None = None
+                          ):
+    """
+    Exports the orders with their tables to the file in 'EXPORT_DIR' using celery.
+    The progress is saved to the result backend as the 'PROGRESS' state after each chunk.
+    :param start_datetime: ISO date or datetime, orders that start at this time or later.
+    :param end_datetime: ISO date or datetime, orders that start at this time or earlier.
+    :return: dict with 'file_name', 'format', 'rows' and 'total_rows' keys.
+    """
+    file_name: str = f'orders_{self.request.id}.{EXPORT_FORMAT}'
+
+    def save_progress(rows: int, total_rows: int) -> None:
+        self.update_state(state='PROGRESS', meta={'rows': rows, 'total_rows': total_rows})
+
+    with SessionLocal() as db:
+        rows: int = export_orders(
+            db=db,
+            path=settings.EXPORT_DIR.joinpath(file_name),
+            start_datetime=dt.fromisoformat(start_datetime) if start_datetime else None,
+            end_datetime=dt.fromisoformat(end_datetime) if end_datetime else None,
+            on_progress=save_progress
+        )
+    return {'file_name': file_name, 'format': EXPORT_FORMAT, 'rows': rows, 'total_rows': rows}
+
+
+@app.task
+def create_order_partitions():
+    """
+    Creates the partitions of the orders and their tables
+    for the current month and 'ORDERS_PARTITION_MONTHS_AHEAD' next months using celery.
+    It is run by celery beat every day, the existing partitions are skipped.
+    :return: names of the created partitions.
+    """
+    with SessionLocal() as db:
+        created_partitions: list[str] = create_partitions_ahead(db, settings.ORDERS_PARTITION_MONTHS_AHEAD)
+        db.commit()
+    return created_partitions
+
+
+@app.task(bind=True)
+def archive_old_orders(self):
+    """
+    Moves the orders that started more than 'ORDERS_ARCHIVE_AFTER_DAYS' days ago
+    with their tables to the archive tables using celery.
+    It is run by celery beat every day.
+    The progress is saved to the result backend as the 'PROGRESS' state after each batch.
+    :return: number of the archived orders.
+    """
+    def save_progress(orders: int) -> None:
+        self.update_state(state='PROGRESS', meta={'orders': orders})
+
+    with SessionLocal() as db:
+        archived_orders: int = archive_orders(db=db,
+                                              before=get_archive_horizon(settings.ORDERS_ARCHIVE_AFTER_DAYS),
+                                              batch_size=settings.ORDERS_ARCHIVE_BATCH_SIZE,
+                                              on_progress=save_progress)
+    # Archived orders can't be got by id, so their cached responses must not be served.
+    if archived_orders:
+        invalidate_cached_responses('orders')
+    return archived_orders
+
+
+@app.task
+def refresh_report_views():
+    """
+    Refreshes the materialized views of the reports using celery.
+    It is run by celery beat every 'REPORTS_REFRESH_INTERVAL' seconds.
+    :return: names of the refreshed views.
+    """
+    with SessionLocal() as db:
+        return ReportOperation(db=db).refresh_views()
+
+
+@app.task
+def reprice_orders(table_ids: list[int] | None = None):
+    """
+    Computes the cost of the future orders again from the current prices of their tables using celery.
+    It is sent when the prices of the tables are changed.
+    :param table_ids: orders with these tables or all future orders if None.
+    :return: number of the orders whose cost is changed.
+    """
+    with SessionLocal() as db:
+        order_ids: list[int] = reprice_future_orders(db, table_ids)
+        db.commit()
+    if order_ids:
+        invalidate_cached_responses('orders')
+    return len(order_ids)
+
+
+@app.task(bind=True)
+def cascade_deleted_rows(self, resource: CASCADE_RESOURCE, ids: list[int]):
+    """
+    Changes the dependent rows of the deleted users or tables by batches of 'DELETE_CASCADE_BATCH_SIZE'
+    using celery: the orders of the users are marked as deleted, the order tables of the tables are deleted.
+    It is sent when the users or tables are deleted.
+    The progress is saved to the result backend as the 'PROGRESS' state after each batch.
+    :param resource: 'users' or 'tables'.
+    :param ids: ids of the deleted users or tables.
+    :return: number of the changed rows.
+    """
+    def save_progress(rows: int) -> None:
+        self.update_state(state='PROGRESS', meta={'resource': resource, 'rows': rows})
+
+    with SessionLocal() as db:
+        rows: int = cascade_deletion(db=db,
+                                     resource=resource,
+                                     ids=ids,
+                                     batch_size=settings.DELETE_CASCADE_BATCH_SIZE,
+                                     on_progress=save_progress)
+    if rows:
+        invalidate_cached_responses('orders')
+    return rows
+
+
+@app.task(bind=True)
+def purge_old_deleted_rows(self):
+    """
+    Deletes the rows that were deleted more than 'PURGE_DELETED_AFTER_DAYS' days ago from the db using celery.
+    It is run by celery beat every day.
+    The progress is saved to the result backend as the 'PROGRESS' state after each batch.
+    :return: number of the purged rows by table name.
+    """
+    def save_progress(table_name: str, rows: int) -> None:
+        self.update_state(state='PROGRESS', meta={'table': table_name, 'rows': rows})
+
+    with SessionLocal() as db:
+        return purge_deleted_rows(db=db,
+                                  before=get_purge_horizon(settings.PURGE_DELETED_AFTER_DAYS),
+                                  batch_size=settings.PURGE_BATCH_SIZE,
+                                  on_progress=save_progress)
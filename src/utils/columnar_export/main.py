@@ -0,0 +1,156 @@
+"""
+Columnar export of orders with their tables (one row for each order table) to a file.
+
+Files are written in Parquet (if the 'pyarrow' package is installed) or CSV.
+Rows are fetched from the server-side cursor and written by chunks,
+so the whole dataset is never loaded into memory.
+"""
+import csv
+from datetime import date, datetime as dt
+from pathlib import Path
+from typing import Callable, Iterator
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.api.crud_operations.utils.other import process_end_datetime
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+from src.config import get_settings
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional
+    pyarrow = None
+
+settings = get_settings()
+
+EXPORT_FORMAT: str = 'parquet' if pyarrow else 'csv'
+EXPORT_MEDIA_TYPES: dict[str, str] = {'parquet': 'application/vnd.apache.parquet', 'csv': 'text/csv'}
+EXPORT_COLUMNS: tuple = (
+    OrderModel.id.label('order_id'),
+    OrderModel.start_datetime,
+    OrderModel.end_datetime,
+    OrderModel.status,
+    OrderModel.cost,
+    OrderModel.user_id,
+    TableModel.id.label('table_id'),
+    TableModel.type.label('table_type'),
+    TableModel.number_of_seats,
+    TableModel.price_per_hour
+)
+
+
+def make_export_query(start_datetime: dt | date | None, end_datetime: dt | date | None) -> Select:
+    """
+    Makes the query of the orders joined with their tables, deleted objects are skipped.
+    :param start_datetime: orders that start at this date or datetime or later.
+    :param end_datetime: orders that start at this date or datetime or earlier.
+    :return: select statement ordered by the order start and the table id.
+    """
+    end_datetime = process_end_datetime(end_datetime) if end_datetime is not None else None
+    return (
+        select(*EXPORT_COLUMNS)
+        .join_from(OrderModel, orders_tables, and_(OrderModel.id == orders_tables.c.order_id,
+                                                   OrderModel.start_datetime == orders_tables.c.start_datetime))
+        .join(TableModel, TableModel.id == orders_tables.c.table_id)
+        .where(OrderModel.deleted_at.is_(None),
+               TableModel.deleted_at.is_(None),
+               OrderModel.start_datetime >= start_datetime if start_datetime is not None else True,
+               OrderModel.start_datetime <= end_datetime if end_datetime is not None else True)
+        .order_by(OrderModel.start_datetime, OrderModel.id, TableModel.id)
+    )
+
+
+def count_rows(db: Session, query: Select) -> int:
+    """Counts the rows of the export query to report the progress."""
+    return db.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar_one()
+
+
+def iterate_chunks(db: Session, query: Select) -> Iterator[list[Row]]:
+    """
+    Fetches the rows of the export query by chunks of 'EXPORT_CHUNK_SIZE'.
+    :return: iterator of the row lists.
+    """
+    result = db.execute(query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE))
+    for chunk in result.partitions():
+        yield chunk
+
+
+def write_parquet(path: Path, chunks: Iterator[list[Row]]) -> None:
+    """Writes each chunk as the separate row group of the parquet file."""
+    names: list[str] = [column.key for column in EXPORT_COLUMNS]
+    schema = pyarrow.schema([
+        ('order_id', pyarrow.int64()),
+        ('start_datetime', pyarrow.timestamp('us')),
+        ('end_datetime', pyarrow.timestamp('us')),
+        ('status', pyarrow.string()),
+        ('cost', pyarrow.float64()),
+        ('user_id', pyarrow.int64()),
+        ('table_id', pyarrow.int64()),
+        ('table_type', pyarrow.string()),
+        ('number_of_seats', pyarrow.int64()),
+        ('price_per_hour', pyarrow.float64())
+    ])
+    with pyarrow.parquet.ParquetWriter(path, schema, compression='snappy') as writer:
+        for chunk in chunks:
+            columns: list[tuple] = list(zip(*chunk))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=schema.field(name).type)
+                 for name, column in zip(names, columns)],
+                schema=schema
+            ))
+
+
+def write_csv(path: Path, chunks: Iterator[list[Row]]) -> None:
+    """Writes the header and then the rows of each chunk."""
+    with path.open('w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow([column.key for column in EXPORT_COLUMNS])
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+
+def export_orders(db: Session,
+                  path: Path,
+                  start_datetime: dt | date | None = None,
+                  end_datetime: dt | date | None = None,
+                  on_progress: Callable[[int, int], None] | None = None
+                  ) -> int:
+    """
+    Writes the orders with their tables to the file in 'EXPORT_FORMAT'.
+    The file is written under the temporary name and renamed at the end,
+    so an unfinished file is never served.
+    :param db: db session.
+    :param path: file path.
+    :param start_datetime: orders that start at this date or datetime or later.
+    :param end_datetime: orders that start at this date or datetime or earlier.
+    :param on_progress: called with the number of written rows and the total number of rows
+                        after each chunk.
+    :return: number of written rows.
+    """
+    query: Select = make_export_query(start_datetime, end_datetime)
+    total_rows: int = count_rows(db, query)
+    written_rows: int = 0
+
+    def iterate_with_progress() -> Iterator[list[Row]]:
+        nonlocal written_rows
+        for chunk in iterate_chunks(db, query):
+            yield chunk
+            written_rows += len(chunk)
+            if on_progress is not None:
+                on_progress(written_rows, total_rows)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path: Path = path.with_name(f'{path.name}.part')
+    try:
+        (write_parquet if EXPORT_FORMAT == 'parquet' else write_csv)(temporary_path,
+                                                                     iterate_with_progress())
+        temporary_path.replace(path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+    return written_rows
@@ -1,12 +1,18 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
+from aiosmtplib import SMTPDataError, SMTPRecipientsRefused, SMTPSenderRefused
 from fastapi import status
 from fastapi_mail import (
     FastMail,
     MessageSchema,
     ConnectionConfig,
 )
+from fastapi_mail.connection import Connection
+from fastapi_mail.fastmail import email_dispatched
+from fastapi_mail.msg import MailMsg
+from jinja2 import Environment, Template
 
 from src.config import get_settings
 from src.utils.composing_email.utils import create_expire
@@ -31,10 +37,84 @@ email_config = ConnectionConfig(
     TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
 )
 
+# One template environment per process (API worker or celery worker).
+template_env: Environment = email_config.template_engine()
+# The server refused one letter, the session can send the next ones.
+# Connection errors and timeouts are raised, the letters after them are not sent.
+LETTER_REFUSED_ERRORS: tuple[type[Exception], ...] = (SMTPRecipientsRefused, SMTPSenderRefused, SMTPDataError)
+
+
+@lru_cache()
+def get_email_template(template_name: str) -> Template:
+    """
+    Gets the compiled email template.
+    The template is compiled only once per process and then reused for each letter.
+    :param template_name: Template file name from the 'templates' folder.
+    :return: Compiled jinja template.
+    """
+    return template_env.get_template(template_name)
+
+
+class CachedTemplateFastMail(FastMail):
+    """
+    FastMail that uses precompiled templates
+    and can send several letters over one SMTP session.
+    """
+
+    async def get_mail_template(self, env_path, template_name):
+        return get_email_template(template_name)
+
+    async def send_messages(self,
+                            messages: list[list[MessageSchema, str]],
+                            sent_recipients: list[str] | None = None
+                            ) -> list[str]:
+        """
+        Renders all letters in one pass and sends them over one SMTP session.
+        If the server refuses a letter, it is skipped and the rest of the batch is sent.
+        If the connection fails, the error is raised.
+        :param messages: List of [message, template_name] pairs.
+        :param sent_recipients: recipients are appended to it as soon as their letters are sent,
+                                so the caller knows them if the connection fails in the middle of the batch.
+        :return: Recipients of the letters that were not sent.
+        """
+        prepared_messages: list = [await self._prepare_message_by_template(message, template_name)
+                                   for message, template_name in messages]
+        failed_recipients: list[str] = []
+
+        async with Connection(self.config) as connection:
+            for prepared_message in prepared_messages:
+                if not self.config.SUPPRESS_SEND:
+                    try:
+                        await connection.session.send_message(prepared_message)
+                    except LETTER_REFUSED_ERRORS as err:
+                        logger.error(f"Letter to '{prepared_message['To']}' was not sent: {err}")
+                        failed_recipients.append(prepared_message['To'])
+                        continue
+
+                email_dispatched.send(prepared_message)
+                if sent_recipients is not None:
+                    sent_recipients.append(prepared_message['To'])
+
+        return failed_recipients
+
+    async def _prepare_message_by_template(self, message: MessageSchema, template_name: str):
+        """
+        Renders the letter body by the precompiled template
+        and converts the letter to the MIME message.
+        """
+        template: Template = get_email_template(template_name)
+        message.template_body = template.render(**self.make_dict(message.template_body))
+        message.subtype = 'html'
+
+        mail_message = MailMsg(**message.dict())
+        sender: str = (f'{self.config.MAIL_FROM_NAME} <{self.config.MAIL_FROM}>'
+                       if self.config.MAIL_FROM_NAME is not None else self.config.MAIL_FROM)
+        return await mail_message._message(sender)
+
 
 def compose_confirm_email(email: str,
                           url: str
-                          ) -> tuple[FastMail, list[MessageSchema, str]]:
+                          ) -> tuple[CachedTemplateFastMail, list[MessageSchema, str]]:
     """
     Composing a letter to send. Letter to confirm registration.
     :param email: User email.
@@ -59,14 +139,14 @@ def compose_confirm_email(email: str,
         template_body=template_body
     )
 
-    fm = FastMail(email_config)
+    fm = CachedTemplateFastMail(email_config)
     params = [message, template_name]
     return fm, params
 
 
 def compose_reset_password_email(email: str,
                                  url: str
-                                 ) -> tuple[FastMail, list[MessageSchema, str]]:
+                                 ) -> tuple[CachedTemplateFastMail, list[MessageSchema, str]]:
     """
     Composing a letter to send. Letter to reset user password.
     :param email: User email.
@@ -92,7 +172,7 @@ def compose_reset_password_email(email: str,
         template_body=template_body
     )
 
-    fm = FastMail(email_config)
+    fm = CachedTemplateFastMail(email_config)
     params = [message, template_name]
     return fm, params
 
@@ -101,7 +181,7 @@ def compose_email_with_action_link(
         username: str,
         email: str,
         action: Literal['confirm_email'] | Literal['reset_password'],
-) -> tuple[FastMail, list[MessageSchema, str]]:
+) -> tuple[CachedTemplateFastMail, list[MessageSchema, str]]:
     """Sends email letter that contain action link."""
 
     # 1. Encode the username and pasting it into the url
@@ -128,3 +208,25 @@ def compose_email_with_action_link(
                 message=get_text('err_500')
             )
     return email, params
+
+
+def compose_emails_with_action_link(
+        users: list[dict],
+        action: Literal['confirm_email'] | Literal['reset_password'],
+) -> tuple[CachedTemplateFastMail, list[list[MessageSchema, str]]]:
+    """
+    Composes letters that contain action link for several users at once.
+    :param users: List of dicts with 'username' and 'email' keys.
+    :param action: 'confirm_email' or 'reset_password'.
+    :return: Tuple that contains the FastMail instance and list of [message, template name].
+    """
+    messages: list[list[MessageSchema, str]] = []
+    for user in users:
+        _, params = compose_email_with_action_link(
+            username=user['username'],
+            email=user['email'],
+            action=action
+        )
+        messages.append(params)
+
+    return CachedTemplateFastMail(email_config), messages
@@ -0,0 +1,205 @@
+"""
+Response compression.
+
+Responses are compressed with brotli (if the 'brotli' package is installed) or gzip
+depending on the 'Accept-Encoding' request header.
+Responses that are already compressed (e.g. precompressed cached responses) are sent as is.
+"""
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+settings = get_settings()
+
+# In order of preference.
+ENCODINGS: tuple[str, ...] = ('br', 'gzip') if brotli else ('gzip',)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class BrotliCompressor:
+    """The same interface as the zlib compressor has."""
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Chooses the best supported encoding the client accepts.
+    Encodings with 'q=0' are not accepted.
+    :param accept_encoding: value of the 'Accept-Encoding' header.
+    :return: 'br', 'gzip' or None.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: set[str] = set()
+    for item in accept_encoding.lower().split(','):
+        encoding, _, params = item.strip().partition(';')
+        quality: str = params.strip().removeprefix('q=')
+        if params and quality.replace('.', '').strip('0') == '':
+            continue
+        accepted.add(encoding.strip())
+
+    for encoding in ENCODINGS:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def make_compressor(encoding: str) -> Compressor:
+    """
+    Makes the streaming compressor.
+    :param encoding: 'br' or 'gzip'.
+    """
+    if encoding == 'br':
+        return BrotliCompressor()
+    # wbits=31 makes the gzip container.
+    return zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compresses the whole body.
+    :param body: response body.
+    :param encoding: 'br' or 'gzip'.
+    :return: compressed body.
+    """
+    compressor: Compressor = make_compressor(encoding)
+    return compressor.compress(body) + compressor.flush()
+
+
+def is_compressible(headers: Headers | MutableHeaders, body_size: int | None = None) -> bool:
+    """
+    Checks that the response is not compressed yet, its content type is allowed
+    and its body is not smaller than the minimum size.
+    :param headers: response headers.
+    :param body_size: body size if it is known.
+    """
+    content_type: str = headers.get('content-type', '').split(';')[0].strip()
+    return (
+        'content-encoding' not in headers
+        and content_type in settings.COMPRESSION_CONTENT_TYPES
+        and (body_size is None or body_size >= settings.COMPRESSION_MINIMUM_SIZE)
+    )
+
+
+def add_encoding_to_etag(etag: str, encoding: str) -> str:
+    """
+    Each encoding is another representation, so it has another strong ETag:
+    '"abc"' -> '"abc-gzip"'.
+    """
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def remove_encoding_from_etag(etag: str) -> str:
+    """Returns the ETag of the uncompressed representation."""
+    for encoding in ENCODINGS:
+        if etag.endswith(f'-{encoding}"'):
+            return etag.removesuffix(f'-{encoding}"') + '"'
+    return etag
+
+
+def set_encoding_headers(headers: MutableHeaders, encoding: str, body_size: int | None) -> None:
+    """Sets headers of the compressed response, 'Content-Length' is removed for streaming."""
+    headers['Content-Encoding'] = encoding
+    if body_size is None:
+        del headers['Content-Length']
+    else:
+        headers['Content-Length'] = str(body_size)
+    if 'etag' in headers:
+        headers['ETag'] = add_encoding_to_etag(headers['etag'], encoding)
+    headers.add_vary_header('Accept-Encoding')
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the allowed content type if they are not smaller than the minimum size.
+    Streaming responses are compressed by chunks.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding: str | None = None
+        if scope['type'] == 'http':
+            encoding = choose_encoding(Headers(scope=scope).get('accept-encoding'))
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self.app, encoding)
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.send: Send | None = None
+        self.initial_message: Message = {}
+        self.compressor: Compressor | None = None
+        self.started: bool = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type: str = message['type']
+        if message_type == 'http.response.start':
+            # Headers are sent with the first body chunk, when it is known how to compress.
+            self.initial_message = message
+            return
+
+        if message_type != 'http.response.body':
+            await self.send(message)
+            return
+
+        body: bytes = message.get('body', b'')
+        more_body: bool = message.get('more_body', False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message['headers'])
+            if not is_compressible(headers, None if more_body else len(body)):
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = make_compressor(self.encoding)
+            body = self.compressor.compress(body)
+            if not more_body:
+                body += self.compressor.flush()
+            set_encoding_headers(headers, self.encoding, None if more_body else len(body))
+            message['body'] = body
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if self.compressor is not None:
+            body = self.compressor.compress(body)
+            if not more_body:
+                body += self.compressor.flush()
+            message['body'] = body
+        await self.send(message)
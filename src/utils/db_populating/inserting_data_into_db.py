@@ -1,9 +1,11 @@
 # !!! Inserting data into an empty database only !!!
 
+from sqlalchemy import func, select
+
 from src.api.models.user import UserModel
 from src.api.models.table import TableModel
 from src.api.models.schedule import ScheduleModel
-from src.api.models.order import OrderModel
+from src.api.models.order import ORDERS_ID_SEQUENCE, OrderModel
 from src.utils.db_populating.data_preparation import prepare_data_for_insertion
 from src.utils.color_logging.main import logger
 
@@ -34,6 +36,8 @@ def insert_data_to_db(users_json: list,
             db.add_all(prepared_data['tables'])
             db.add_all(prepared_data['schedules'])
             db.add_all(prepared_data['orders'])
+            db.flush()
+            sync_orders_id_sequence(db)
 
             db.commit()
             logger.success("Data has been added to db")
@@ -42,3 +46,9 @@ def insert_data_to_db(users_json: list,
             logger.info("Data cannot be inserted into the database because the database is not empty")
     finally:
         db.close()
+
+
+def sync_orders_id_sequence(db) -> None:
+    """Moves the sequence of the order ids after the max id, the inserted orders have their ids."""
+    db.execute(select(func.setval(ORDERS_ID_SEQUENCE.name, func.coalesce(func.max(OrderModel.id), 0) + 1, False))
+               .execution_options(include_deleted=True))
@@ -0,0 +1,68 @@
+"""
+Delta sync (`GET /orders/changes?since=<cursor>`).
+
+Rows are returned in the stable order of ('updated_at', 'id'),
+the cursor is the position of the last returned row, so the next request continues after it.
+Deleted rows are returned as ids only.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from datetime import datetime as dt
+from typing import Any, Callable
+
+from fastapi import status
+
+from src.db.db_sqlalchemy import BaseModel
+from src.utils.exceptions import JSONException
+from src.utils.response_generation.main import get_text
+
+
+def encode_cursor(updated_at: dt, id_: int) -> str:
+    """
+    Makes the opaque cursor from the position of the row.
+    :param updated_at: row change time.
+    :param id_: row id.
+    :return: cursor string.
+    """
+    return urlsafe_b64encode(f'{updated_at.isoformat()}|{id_}'.encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> tuple[dt, int] | None:
+    """
+    Gets the position of the row from the cursor.
+    If the cursor is invalid, then raises the error.
+    :param cursor: value of the 'since' query parameter.
+    :return: row change time and id or None if there is no cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        updated_at, id_ = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return dt.fromisoformat(updated_at), int(id_)
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        raise JSONException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=get_text('err_invalid_cursor')
+        )
+
+
+def make_changes_response_data(objs: list[BaseModel],
+                               since: str | None,
+                               limit: int,
+                               convert: Callable[[BaseModel], Any]
+                               ) -> dict:
+    """
+    Makes the delta sync response data.
+    :param objs: changed and deleted objects in the ('updated_at', 'id') order.
+    :param since: cursor of the request.
+    :param limit: max number of objects in the response.
+    :param convert: function that converts the object to the response data.
+    :return: dict with changed items, deleted ids and the cursor for the next request.
+    """
+    return {
+        'items': [convert(obj) for obj in objs if obj.deleted_at is None],
+        'deleted_ids': [obj.id for obj in objs if obj.deleted_at is not None],
+        # Nothing has changed, so the next request starts from the same position.
+        'cursor': encode_cursor(objs[-1].updated_at, objs[-1].id) if objs else since,
+        'has_more': len(objs) == limit
+    }
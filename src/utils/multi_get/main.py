@@ -0,0 +1,64 @@
+"""
+Multi-get requests (`/orders/batch?ids=1,2,3`) and bulk changes (`PATCH /orders/bulk?ids=1,2,3`).
+
+All objects are found by one query instead of a request per object,
+ids that were not found (or are not available to the user) are returned as missing.
+"""
+from typing import Any, Callable
+
+from fastapi import status
+
+from src.config import get_settings
+from src.db.db_sqlalchemy import BaseModel
+from src.utils.exceptions import JSONException
+from src.utils.response_generation.main import get_text
+
+settings = get_settings()
+
+
+def parse_ids(ids: str) -> list[int]:
+    """
+    Converts the comma separated ids to the list without duplicates in the given order.
+    If there are too many ids, then raises the error.
+    :param ids: value of the 'ids' query parameter, e.g. '1,2,3'.
+    :return: ids list.
+    """
+    unique_ids: list[int] = list(dict.fromkeys(int(id_) for id_ in ids.split(',')))
+    if len(unique_ids) > settings.MULTI_GET_MAX_IDS:
+        raise JSONException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=get_text('err_too_many_ids').format(settings.MULTI_GET_MAX_IDS)
+        )
+    return unique_ids
+
+
+def make_batch_response_data(ids: list[int],
+                             objs: list[BaseModel],
+                             convert: Callable[[BaseModel], Any]
+                             ) -> dict:
+    """
+    Makes the multi-get response data.
+    :param ids: requested ids from 'parse_ids'.
+    :param objs: found objects.
+    :param convert: function that converts the object to the response data.
+    :return: dict with found items in the requested order and missing ids.
+    """
+    objs_by_id: dict[int, BaseModel] = {obj.id: obj for obj in objs}
+    return {
+        'items': [convert(objs_by_id[id_]) for id_ in ids if id_ in objs_by_id],
+        'missing_ids': [id_ for id_ in ids if id_ not in objs_by_id]
+    }
+
+
+def make_bulk_response_data(changed: list[int] | int) -> dict:
+    """
+    Makes the bulk change response data.
+    :param changed: ids of the changed objects or the number of objects to change if it's the dry run.
+    :return: dict with the number and ids of the changed objects.
+    """
+    dry_run: bool = isinstance(changed, int)
+    return {
+        'count': changed if dry_run else len(changed),
+        'ids': None if dry_run else changed,
+        'dry_run': dry_run
+    }
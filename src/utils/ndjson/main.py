@@ -0,0 +1,21 @@
+"""
+Newline delimited JSON (NDJSON) streaming: one JSON object per line.
+
+The response is sent by chunks while the rows are read from the db,
+so the first bytes arrive immediately and the memory usage does not depend on the number of rows.
+"""
+from typing import Iterable, Iterator
+
+from src.utils.response_cache.main import serialize_response_data
+
+NDJSON_MEDIA_TYPE: str = 'application/x-ndjson'
+
+
+def iterate_ndjson(chunks: Iterable[list]) -> Iterator[bytes]:
+    """
+    Serializes the items to NDJSON.
+    :param chunks: item lists, e.g. from 'OrderOperation.stream_all_by_params_as_dicts'.
+    :return: iterator of the serialized chunks.
+    """
+    for chunk in chunks:
+        yield b''.join(serialize_response_data(item) + b'\n' for item in chunk)
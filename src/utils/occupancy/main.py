@@ -0,0 +1,207 @@
+"""
+Occupancy heatmap of the tables: booked share of the opening hours by table, day of the week and hour.
+
+Only (table id, order start, order end) rows of the date range are read from the db,
+the booked and the opening time is accumulated into the hour bins by numpy,
+so the time of the computation does not depend on the number of orders in python.
+"""
+from datetime import date, datetime as dt, time, timedelta as td
+
+import numpy as np
+from sqlalchemy import and_, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.api.crud_operations.utils.other import bound_start_datetime
+from src.api.crud_operations.utils.schedule import WEEK_DAYS, get_schedules_by_day
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.schedule import ScheduleModel
+from src.api.models.table import TableModel
+
+HOUR: int = 3600  # seconds
+DAY: int = 24 * HOUR
+
+
+def make_bookings_query(start_date: date, end_date: date) -> Select:
+    """
+    Makes the query of the booked time of the tables, deleted orders are skipped.
+    The archive is read too, it is cheap, because its orders are searched by the start index.
+    :param start_date: orders from this date.
+    :param end_date: orders up to this date inclusive.
+    :return: select statement of (table_id, start_datetime, end_datetime) rows.
+    """
+    range_end: dt = dt.combine(end_date + td(days=1), time.min)
+    live = (
+        select(orders_tables.c.table_id, OrderModel.start_datetime, OrderModel.end_datetime)
+        .join_from(OrderModel, orders_tables, and_(OrderModel.id == orders_tables.c.order_id,
+                                                   OrderModel.start_datetime == orders_tables.c.start_datetime))
+        .where(OrderModel.deleted_at.is_(None),
+               *bound_start_datetime((OrderModel.start_datetime, orders_tables.c.start_datetime),
+                                     start_date, range_end))
+    )
+    archived = (
+        select(orders_tables_archive.c.table_id,
+               orders_archive.c.start_datetime,
+               orders_archive.c.end_datetime)
+        .join_from(orders_archive, orders_tables_archive,
+                   orders_archive.c.id == orders_tables_archive.c.order_id)
+        .where(orders_archive.c.deleted_at.is_(None),
+               *bound_start_datetime((orders_archive.c.start_datetime,), start_date, range_end))
+    )
+    return select(union_all(live, archived).subquery('bookings'))
+
+
+def accumulate_seconds(rows: np.ndarray,
+                       starts: np.ndarray,
+                       ends: np.ndarray,
+                       shape: tuple[int, int]
+                       ) -> np.ndarray:
+    """
+    Accumulates the time intervals into the hour bins without a loop over the intervals.
+    The covered time up to the moment T is sum(T - start) - sum(T - end) over the interval starts
+    and ends before T, so it is found at the bin boundaries from the cumulative sums
+    of the interval ends counted by bins. The covered time of a bin is the difference at its boundaries.
+    :param rows: row index of each interval.
+    :param starts: interval starts in seconds from the start of the first bin.
+    :param ends: interval ends in seconds from the start of the first bin.
+    :param shape: number of rows and number of hour bins.
+    :return: array of the covered seconds of the given shape.
+    """
+    n_rows, n_bins = shape
+    starts = np.clip(starts, 0, n_bins * HOUR)
+    ends = np.clip(ends, 0, n_bins * HOUR)
+    moments: np.ndarray = np.concatenate([starts, ends])
+    signs: np.ndarray = np.concatenate([np.ones(len(starts)), -np.ones(len(ends))])
+    # Moments at the end of the last bin are counted in the extra bin, they cover nothing.
+    indexes: np.ndarray = (np.concatenate([rows, rows]) * (n_bins + 1)
+                           + np.minimum(moments // HOUR, n_bins).astype(np.int64))
+    counts: np.ndarray = np.bincount(indexes, weights=signs, minlength=n_rows * (n_bins + 1))
+    moment_sums: np.ndarray = np.bincount(indexes, weights=signs * moments, minlength=n_rows * (n_bins + 1))
+
+    boundaries: np.ndarray = np.arange(1, n_bins + 1) * HOUR
+    covered_up_to_boundaries: np.ndarray = (
+        boundaries * np.cumsum(counts.reshape(n_rows, n_bins + 1)[:, :n_bins], axis=1)
+        - np.cumsum(moment_sums.reshape(n_rows, n_bins + 1)[:, :n_bins], axis=1)
+    )
+    return np.diff(covered_up_to_boundaries, axis=1, prepend=0)
+
+
+def fold_by_weekday(seconds_by_hour: np.ndarray, start_date: date) -> np.ndarray:
+    """
+    Sums the hour bins of the days by the day of the week.
+    :param seconds_by_hour: array of (rows, days * 24) starting from 'start_date'.
+    :param start_date: date of the first bin.
+    :return: array of (rows, 7, 24).
+    """
+    n_rows, n_bins = seconds_by_hour.shape
+    weekdays: np.ndarray = (start_date.weekday() + np.arange(n_bins // 24)) % 7
+    weekday_matrix: np.ndarray = (weekdays[:, None] == np.arange(7)).astype(np.float64)
+    by_hour: np.ndarray = seconds_by_hour.reshape(n_rows, -1, 24).transpose(0, 2, 1)
+    return (by_hour @ weekday_matrix).transpose(0, 2, 1)
+
+
+def find_opening_seconds(schedules_by_day: dict[str, ScheduleModel], start_date: date, days: int) -> np.ndarray:
+    """
+    Finds the opening time of each hour of the days from the schedules,
+    the schedule of the specific date is used instead of the schedule of the day of the week.
+    The break is not the opening time. Days without a schedule are closed.
+    Times are rounded up to the minute, the break until '13:59:59' ends at '14:00'.
+    :param schedules_by_day: schedules from 'get_schedules_by_day'.
+    :param start_date: first day.
+    :param days: number of days.
+    :return: array of (1, days * 24) of the opening seconds.
+    """
+    def to_seconds(time_: time) -> int:
+        return time_.hour * HOUR + time_.minute * 60 + (60 if time_.second else 0)
+
+    opening: list[tuple[int, int]] = []
+    breaks: list[tuple[int, int]] = []
+    for day in range(days):
+        current_date: date = start_date + td(days=day)
+        schedule: ScheduleModel | None = (schedules_by_day.get(str(current_date))
+                                          or schedules_by_day.get(WEEK_DAYS[current_date.weekday()]))
+        if schedule is None or schedule.open_time is None or schedule.close_time is None:
+            continue
+        opening.append((day * DAY + to_seconds(schedule.open_time), day * DAY + to_seconds(schedule.close_time)))
+        if schedule.break_start_time is not None and schedule.break_end_time is not None:
+            breaks.append((day * DAY + to_seconds(schedule.break_start_time),
+                           day * DAY + to_seconds(schedule.break_end_time)))
+
+    def accumulate(intervals: list[tuple[int, int]]) -> np.ndarray:
+        starts, ends = np.array(intervals, dtype=np.int64).reshape(-1, 2).T
+        return accumulate_seconds(np.zeros(len(intervals), dtype=np.int64), starts, ends, (1, days * 24))
+
+    return accumulate(opening) - accumulate(breaks)
+
+
+def compute_occupancy(table_ids: np.ndarray,
+                      booked_table_ids: np.ndarray,
+                      starts: np.ndarray,
+                      ends: np.ndarray,
+                      opening_seconds: np.ndarray,
+                      start_date: date
+                      ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes the heatmap from the booked intervals and the opening time.
+    :param table_ids: sorted ids of the tables of the heatmap.
+    :param booked_table_ids: table id of each booked interval, other tables are skipped.
+    :param starts: booked interval starts in seconds from the start of 'start_date'.
+    :param ends: booked interval ends in seconds from the start of 'start_date'.
+    :param opening_seconds: array from 'find_opening_seconds'.
+    :param start_date: first day.
+    :return: booked seconds of (tables, 7, 24), opening seconds of (7, 24)
+             and the booked share of the opening time of (tables, 7, 24).
+    """
+    rows: np.ndarray = np.searchsorted(table_ids, booked_table_ids)
+    known: np.ndarray = rows < len(table_ids)
+    known[known] = table_ids[rows[known]] == booked_table_ids[known]
+
+    booked: np.ndarray = fold_by_weekday(
+        accumulate_seconds(rows[known], starts[known], ends[known], (len(table_ids), opening_seconds.shape[1])),
+        start_date
+    )
+    opening: np.ndarray = fold_by_weekday(opening_seconds, start_date)[0]
+    occupancy: np.ndarray = np.divide(booked, opening, out=np.zeros_like(booked), where=opening > 0)
+    return booked, opening, occupancy
+
+
+def make_occupancy_heatmap(db: Session, start_date: date, end_date: date, type: str | None = None) -> dict:
+    """
+    Makes the occupancy heatmap of the not deleted tables for the date range.
+    :param db: db session.
+    :param start_date: first day.
+    :param end_date: last day inclusive.
+    :param type: heatmap of the tables of this type only.
+    :return: dictionary of the table ids, the days of the week and the arrays
+             of the booked hours and occupancy indexed by [table][day of the week][hour]
+             and of the opening hours indexed by [day of the week][hour].
+    """
+    days: int = (end_date - start_date).days + 1
+    table_ids: np.ndarray = np.array(db.execute(
+        select(TableModel.id)
+        .where(TableModel.deleted_at.is_(None), TableModel.type == type if type is not None else True)
+        .order_by(TableModel.id)
+    ).scalars().all(), dtype=np.int64)
+
+    bookings: list[tuple] = db.execute(make_bookings_query(start_date, end_date)).all()
+    booked_table_ids, starts, ends = zip(*bookings) if bookings else ((), (), ())
+    range_start: np.datetime64 = np.datetime64(dt.combine(start_date, time.min), 's')
+    booked, opening, occupancy = compute_occupancy(
+        table_ids,
+        np.array(booked_table_ids, dtype=np.int64),
+        (np.array(starts, dtype='datetime64[s]') - range_start).astype(np.int64),
+        (np.array(ends, dtype='datetime64[s]') - range_start).astype(np.int64),
+        find_opening_seconds(get_schedules_by_day(db), start_date, days),
+        start_date
+    )
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'table_ids': table_ids.tolist(),
+        'weekdays': list(WEEK_DAYS),
+        'opening_hours': (opening / HOUR).round(2).tolist(),
+        'booked_hours': (booked / HOUR).round(2).tolist(),
+        'occupancy': occupancy.round(3).tolist()
+    }
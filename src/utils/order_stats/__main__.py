@@ -0,0 +1,5 @@
+from src.utils.order_stats.cli import main
+
+
+if __name__ == '__main__':
+    main()
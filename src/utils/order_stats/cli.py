@@ -0,0 +1,39 @@
+import argparse
+
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.order_stats.main import find_drifted_user_ids, rebuild_user_order_stats
+from src.utils.color_logging.main import logger
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Order stats of the users",
+        description="Checks the order stats of the users kept by the db triggers "
+                    "and rebuilds them from the orders.",
+        epilog="Try '--check'"
+    )
+    parser.add_argument('--check', action='store_true', help='find the users whose stats have drifted')
+    parser.add_argument('--repair', action='store_true', help='rebuild the stats of the drifted users only')
+    parser.add_argument('--rebuild', action='store_true', help='rebuild the stats of all users')
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if not (args.check or args.repair or args.rebuild):
+        raise ValueError("one of the arguments '--check', '--repair' or '--rebuild' must be given.")
+
+    with SessionLocal() as db:
+        if args.rebuild:
+            users: int = rebuild_user_order_stats(db)
+            logger.success(f'Order stats of {users} users have been rebuilt')
+            return
+
+        drifted_user_ids: list[int] = find_drifted_user_ids(db)
+        if not drifted_user_ids:
+            logger.success('Order stats of all users are up to date')
+            return
+        logger.warning(f'Order stats of the users {drifted_user_ids} have drifted')
+        if args.repair:
+            rebuild_user_order_stats(db, drifted_user_ids)
+            logger.success(f'Order stats of {len(drifted_user_ids)} users have been repaired')
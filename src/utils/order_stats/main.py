@@ -0,0 +1,85 @@
+"""
+Check and rebuild of the order stats of the users ('user_order_stats').
+
+The stats are kept by the triggers of the orders and the archive,
+so they drift only if the triggers were disabled or the rows were changed around them.
+The stats are computed again from the not deleted live and archived orders,
+the drifted rows are found by comparing them with the kept stats.
+"""
+from sqlalchemy import Numeric, cast, delete, func, insert, or_, select, text, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.api.models.archive import orders_archive
+from src.api.models.order import OrderModel
+from src.api.models.user_order_stats import UserOrderStatsModel
+
+orders = OrderModel.__table__
+user_order_stats = UserOrderStatsModel.__table__
+
+
+def make_stats_query(user_ids: list[int] | None = None) -> Select:
+    """
+    Makes the query of the stats computed from the orders.
+    :param user_ids: stats of these users only or of all users if None.
+    :return: select statement of (user_id, orders_count, total_spent, last_order_at) rows.
+    """
+    all_orders = union_all(*(
+        select(table.c.user_id, table.c.cost, table.c.start_datetime)
+        .where(table.c.deleted_at.is_(None),
+               table.c.user_id.is_not(None),
+               table.c.user_id.in_(user_ids) if user_ids is not None else True)
+        for table in (orders, orders_archive)
+    )).subquery('all_orders')
+    return (select(all_orders.c.user_id,
+                   func.count().label('orders_count'),
+                   func.coalesce(func.sum(all_orders.c.cost), 0).label('total_spent'),
+                   func.max(all_orders.c.start_datetime).label('last_order_at'))
+            .group_by(all_orders.c.user_id))
+
+
+def find_drifted_user_ids(db: Session) -> list[int]:
+    """
+    Finds the users whose kept stats differ from the stats computed from the orders.
+    The totals are compared to the cent, because the sums of the floats depend on the order of addition.
+    :param db: db session.
+    :return: sorted user ids.
+    """
+    computed = make_stats_query().subquery('computed')
+
+    def to_cents(column):
+        return func.round(cast(column, Numeric), 2)
+
+    query: Select = (
+        select(func.coalesce(computed.c.user_id, user_order_stats.c.user_id))
+        .select_from(computed.outerjoin(user_order_stats,
+                                        computed.c.user_id == user_order_stats.c.user_id,
+                                        full=True))
+        .where(or_(computed.c.user_id.is_(None),
+                   user_order_stats.c.user_id.is_(None),
+                   computed.c.orders_count != user_order_stats.c.orders_count,
+                   to_cents(computed.c.total_spent) != to_cents(user_order_stats.c.total_spent),
+                   computed.c.last_order_at.is_distinct_from(user_order_stats.c.last_order_at)))
+    )
+    return sorted(db.execute(query).scalars().all())
+
+
+def rebuild_user_order_stats(db: Session, user_ids: list[int] | None = None) -> int:
+    """
+    Replaces the kept stats with the stats computed from the orders in one transaction.
+    The stats table is locked against the triggers, so the orders changed meanwhile
+    are counted after the rebuild.
+    :param db: db session.
+    :param user_ids: stats of these users only or of all users if None.
+    :return: number of the users with the orders.
+    """
+    db.execute(text('LOCK TABLE user_order_stats IN SHARE ROW EXCLUSIVE MODE'))
+    db.execute(delete(user_order_stats)
+               .where(user_order_stats.c.user_id.in_(user_ids) if user_ids is not None else True))
+    rows: int = db.execute(
+        insert(user_order_stats).from_select(
+            ['user_id', 'orders_count', 'total_spent', 'last_order_at'], make_stats_query(user_ids)
+        )
+    ).rowcount
+    db.commit()
+    return rows
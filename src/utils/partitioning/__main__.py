@@ -0,0 +1,5 @@
+from src.utils.partitioning.cli import main
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import argparse
+from datetime import datetime as dt
+
+from src.config import get_settings
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.color_logging.main import logger
+from src.utils.partitioning.main import create_partitions_ahead, detach_partitions
+
+settings = get_settings()
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Maintenance of the order partitions",
+        description="Creates the monthly partitions of the orders and their tables in advance "
+                    "and detaches the partitions of the old months.",
+        epilog="Try '--create_partitions'"
+    )
+    parser.add_argument('--create_partitions', action='store_true',
+                        help='create the partitions from the current month to the months ahead')
+    parser.add_argument('--months_ahead', type=int, metavar="", default=settings.ORDERS_PARTITION_MONTHS_AHEAD,
+                        help='number of the next months to create the partitions for')
+    parser.add_argument('--detach_before', type=lambda value: dt.strptime(value, '%Y-%m').date(), metavar="",
+                        default=None, help="detach the partitions of the months before the given one, 'YYYY-MM'")
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if not args.create_partitions and args.detach_before is None:
+        raise ValueError("arguments '--create_partitions' and '--detach_before' "
+                         "cannot be empty at the same time.")
+
+    with SessionLocal() as db:
+        if args.create_partitions:
+            created_partitions: list[str] = create_partitions_ahead(db, args.months_ahead)
+            db.commit()
+            logger.success(f"Created partitions: {', '.join(created_partitions) or 'none'}")
+        if args.detach_before is not None:
+            detached_partitions: list[str] = detach_partitions(db, args.detach_before)
+            db.commit()
+            logger.success(f"Detached partitions: {', '.join(detached_partitions) or 'none'}")
@@ -0,0 +1,134 @@
+"""
+Maintenance of the monthly partitions of the orders and their tables.
+
+Both tables are partitioned by range of the order start, one partition for each month:
+'orders_y2022m08' and 'orders_tables_y2022m08' hold the orders that start in August 2022.
+The rows of the months without partitions go to the default partitions,
+so the partitions of the next months are created in advance while the default ones are empty.
+Partitions of the old months are detached from the tables, it changes only the catalog,
+and the detached tables are left as they are to be archived or dropped.
+"""
+import re
+from datetime import date
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.utils.color_logging.main import logger
+
+# Parent tables go first, the partitions of the order tables refer to the partitions of the orders.
+PARTITIONED_TABLES: tuple[str, ...] = ('orders', 'orders_tables')
+ORDER_TABLES_FOREIGN_KEY: str = 'orders_tables_order_id_start_datetime_fkey'
+
+
+def get_first_day_of_next_month(month: date) -> date:
+    """:return: first day of the month after the month of the given date."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def iterate_months(start: date, end: date) -> Iterator[date]:
+    """:return: first days of the months from the month of the start to the month of the end inclusive."""
+    month: date = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = get_first_day_of_next_month(month)
+
+
+def make_partition_name(table: str, month: date) -> str:
+    return f'{table}_y{month.year}m{month.month:02}'
+
+
+def find_partitions(db: Session, table: str) -> list[str]:
+    """:return: names of the partitions of the table including the default one."""
+    return db.execute(text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE parent.relname = :table ORDER BY child.relname'
+    ), {'table': table}).scalars().all()
+
+
+def find_monthly_partitions(db: Session, table: str) -> dict[date, str]:
+    """:return: partition names by the first day of their month, the default partition is skipped."""
+    partitions: dict[date, str] = {}
+    for name in find_partitions(db, table):
+        if match := re.fullmatch(rf'{table}_y(\d{{4}})m(\d{{2}})', name):
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def check_default_partition_has_rows(db: Session, table: str, month: date) -> bool:
+    """Checks that the default partition holds the rows of the month."""
+    return db.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM {table}_default '
+        f'WHERE start_datetime >= :month_start AND start_datetime < :month_end)'
+    ), {'month_start': month, 'month_end': get_first_day_of_next_month(month)}).scalar()
+
+
+def create_partitions(db: Session, start: date, end: date) -> list[str]:
+    """
+    Creates the partitions of the tables for each month from the start to the end if they do not exist.
+    The partition cannot be created while the default partition holds the rows of its month,
+    such months are skipped with the warning, the rows must be moved from the default partition first.
+    The changes are not committed.
+    :param db: db session.
+    :param start: date of the first month.
+    :param end: date of the last month.
+    :return: names of the created partitions.
+    """
+    created_partitions: list[str] = []
+    for table in PARTITIONED_TABLES:
+        existing_partitions: dict[date, str] = find_monthly_partitions(db, table)
+        for month in iterate_months(start, end):
+            if month in existing_partitions:
+                continue
+            name: str = make_partition_name(table, month)
+            if check_default_partition_has_rows(db, table, month):
+                logger.warning(f"Partition '{name}' is not created, "
+                               f"the rows of its month are in '{table}_default'")
+                continue
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{get_first_day_of_next_month(month)}')"
+            ))
+            created_partitions.append(name)
+    return created_partitions
+
+
+def create_partitions_ahead(db: Session, months_ahead: int) -> list[str]:
+    """
+    Creates the partitions of the current month and the given number of the next months.
+    The changes are not committed.
+    :return: names of the created partitions.
+    """
+    end: date = date.today()
+    for _ in range(months_ahead):
+        end = get_first_day_of_next_month(end)
+    return create_partitions(db, date.today(), end)
+
+
+def detach_partitions(db: Session, before: date) -> list[str]:
+    """
+    Detaches the partitions of the months before the given one from the tables.
+    The partition of the order tables is detached first and its reference to the orders is dropped,
+    after that the partition of the orders is not referred and can be detached too.
+    The changes are not committed.
+    :param db: db session.
+    :param before: date of the first month that is kept.
+    :return: names of the detached partitions.
+    """
+    order_partitions: dict[date, str] = find_monthly_partitions(db, 'orders')
+    order_table_partitions: dict[date, str] = find_monthly_partitions(db, 'orders_tables')
+    detached_partitions: list[str] = []
+    for month in sorted(set(order_partitions) | set(order_table_partitions)):
+        if month >= before.replace(day=1):
+            break
+        if name := order_table_partitions.get(month):
+            db.execute(text(f'ALTER TABLE orders_tables DETACH PARTITION {name}'))
+            db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT IF EXISTS {ORDER_TABLES_FOREIGN_KEY}'))
+            detached_partitions.append(name)
+        if name := order_partitions.get(month):
+            db.execute(text(f'ALTER TABLE orders DETACH PARTITION {name}'))
+            detached_partitions.append(name)
+    return detached_partitions
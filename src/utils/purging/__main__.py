@@ -0,0 +1,5 @@
+from src.utils.purging.cli import main
+
+
+if __name__ == '__main__':
+    main()
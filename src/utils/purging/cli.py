@@ -0,0 +1,41 @@
+import argparse
+from datetime import datetime as dt
+
+from src.config import get_settings
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.purging.main import get_purge_horizon, purge_deleted_rows
+from src.utils.color_logging.main import logger
+
+settings = get_settings()
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Purge of the deleted rows",
+        description="Deletes the rows that were deleted before the purge horizon from the db by batches.",
+        epilog="Try '--purge_deleted'"
+    )
+    parser.add_argument('--purge_deleted', action='store_true', help='delete the old deleted rows from the db')
+    parser.add_argument('--before', type=dt.fromisoformat, metavar="", default=None,
+                        help="delete the rows that were deleted before the given ISO date or datetime, "
+                             "by default 'PURGE_DELETED_AFTER_DAYS' days ago")
+    parser.add_argument('--batch_size', type=int, metavar="", default=settings.PURGE_BATCH_SIZE,
+                        help='number of the rows purged in one transaction')
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if not args.purge_deleted:
+        raise ValueError("argument '--purge_deleted' cannot be empty.")
+
+    before: dt = args.before or get_purge_horizon(settings.PURGE_DELETED_AFTER_DAYS)
+    with SessionLocal() as db:
+        purged_rows: dict[str, int] = purge_deleted_rows(
+            db=db,
+            before=before,
+            batch_size=args.batch_size,
+            on_progress=lambda table_name, rows: logger.info(f'Purged rows of {table_name}: {rows}')
+        )
+    logger.success(f'{sum(purged_rows.values())} rows that were deleted before {before} have been purged: '
+                   f'{purged_rows}')
@@ -0,0 +1,104 @@
+"""
+Purge of the deleted rows.
+
+Rows are only marked as deleted by 'deleted_at', so the clients get them by the delta sync and the history is kept.
+The rows deleted more than 'PURGE_DELETED_AFTER_DAYS' days ago are deleted from the db by batches,
+each batch is deleted by one statement in its own transaction, so the locks are short.
+The db never cascades the purge: the order tables are deleted with their orders by the same statement,
+the orders are purged before their users, the users and tables that are still referred to
+by the kept orders (e.g. archived ones) are kept.
+"""
+from datetime import date, datetime as dt, time, timedelta as td
+from typing import Callable
+
+from sqlalchemy import Column, Table, delete, exists, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete
+
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.schedule import ScheduleModel
+from src.api.models.table import TableModel
+from src.api.models.user import UserModel
+
+# Tables in the order of the purge, the referring rows are purged first.
+PURGED_TABLES: tuple[Table, ...] = (OrderModel.__table__,
+                                    orders_archive,
+                                    UserModel.__table__,
+                                    TableModel.__table__,
+                                    ScheduleModel.__table__)
+# Table name: (table of the rows deleted with the purged rows, its columns that refer to the purged rows).
+DEPENDENT_ROWS: dict[str, tuple[Table, dict[str, str]]] = {
+    'orders': (orders_tables, {'order_id': 'id', 'start_datetime': 'start_datetime'}),
+    'orders_archive': (orders_tables_archive, {'order_id': 'id'})
+}
+# Table name: columns of the kept rows, the purged rows they refer to are kept.
+REFERRING_COLUMNS: dict[str, tuple[Column, ...]] = {
+    'users': (OrderModel.__table__.c.user_id, orders_archive.c.user_id),
+    'tables': (orders_tables.c.table_id, orders_tables_archive.c.table_id)
+}
+
+
+def get_purge_horizon(purge_after_days: int) -> dt:
+    """:return: start of the day, rows that were deleted earlier are purged."""
+    return dt.combine(date.today() - td(days=purge_after_days), time.min)
+
+
+def make_purge_batch_statement(table: Table, before: dt, batch_size: int) -> Delete:
+    """
+    Makes the statement that deletes one batch of the rows deleted before the given time with their dependent rows.
+    The rows locked by other transactions are skipped, they are deleted by the next run.
+    :param table: table of the purged rows.
+    :param before: rows that were deleted earlier are purged.
+    :param batch_size: max number of the purged rows.
+    :return: delete statement that returns the ids of the purged rows.
+    """
+    keys: list[Column] = list(table.primary_key.columns)
+    batch = (select(*keys)
+             .where(table.c.deleted_at < before,
+                    *(~exists().where(column == table.c.id) for column in REFERRING_COLUMNS.get(table.name, ())))
+             .limit(batch_size)
+             .with_for_update(skip_locked=True)
+             .cte('batch'))
+    statement: Delete = (delete(table)
+                         .where(*(key == batch.c[key.name] for key in keys))
+                         .returning(table.c.id))
+    if table.name in DEPENDENT_ROWS:
+        # Dependent rows are deleted before the rows, so they are not deleted by the cascade.
+        dependent_table, references = DEPENDENT_ROWS[table.name]
+        statement = statement.add_cte(
+            delete(dependent_table)
+            .where(*(dependent_table.c[column] == batch.c[key] for column, key in references.items()))
+            .cte('purged_dependent_rows')
+        )
+    return statement
+
+
+def purge_deleted_rows(db: Session,
+                       before: dt,
+                       batch_size: int,
+                       on_progress: Callable[[str, int], None] | None = None
+                       ) -> dict[str, int]:
+    """
+    Deletes the rows that were deleted before the given time from all tables by batches.
+    Each batch is committed separately.
+    :param db: db session.
+    :param before: rows that were deleted earlier are purged.
+    :param batch_size: max number of the rows purged in one transaction.
+    :param on_progress: called with the table name and the number of its purged rows after each batch.
+    :return: number of the purged rows by table name.
+    """
+    purged_rows: dict[str, int] = {}
+    for table in PURGED_TABLES:
+        statement: Delete = make_purge_batch_statement(table, before, batch_size)
+        purged_rows[table.name] = 0
+        while True:
+            purged_ids: list[int] = db.execute(statement).scalars().all()
+            db.commit()
+            purged_rows[table.name] += len(purged_ids)
+            if on_progress is not None:
+                on_progress(table.name, purged_rows[table.name])
+            if len(purged_ids) < batch_size:
+                break
+    return purged_rows
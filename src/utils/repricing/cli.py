@@ -0,0 +1,35 @@
+import argparse
+from datetime import datetime as dt
+
+from src.db.db_sqlalchemy import SessionLocal
+from src.utils.repricing.main import reprice_future_orders
+from src.utils.response_cache.main import invalidate_cached_responses
+from src.utils.color_logging.main import logger
+
+
+def create_arguments():
+    parser = argparse.ArgumentParser(
+        prog="Repricing of the future orders",
+        description="Computes the cost of the future orders again from the current prices of their tables.",
+        epilog="Try '--reprice_orders'"
+    )
+    parser.add_argument('--reprice_orders', action='store_true', help='reprice the future orders')
+    parser.add_argument('--tables', type=lambda ids: [int(id_) for id_ in ids.split(',')], metavar="",
+                        default=None, help='comma separated table ids, the orders of all tables by default')
+    parser.add_argument('--since', type=dt.fromisoformat, metavar="", default=None,
+                        help='reprice the orders that start at the given ISO date or datetime or later, '
+                             'now by default')
+    return parser.parse_args()
+
+
+def main():
+    args = create_arguments()
+    if not args.reprice_orders:
+        raise ValueError("argument '--reprice_orders' cannot be empty.")
+
+    with SessionLocal() as db:
+        order_ids: list[int] = reprice_future_orders(db, args.tables, args.since)
+        db.commit()
+    if order_ids:
+        invalidate_cached_responses('orders')
+    logger.success(f'Cost of {len(order_ids)} orders has been changed')
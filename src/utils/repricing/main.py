@@ -0,0 +1,77 @@
+"""
+Repricing of the future orders after the prices of their tables are changed.
+
+The cost of an order is computed once by 'calculate_cost' when the order is created,
+so the orders that have not started yet keep the old prices of their tables.
+Their cost is computed again by the same rule in SQL and changed by one 'UPDATE ... FROM' statement:
+the booked time rounded up to hours multiplied by the sum of the prices of the order tables.
+Past orders keep their cost.
+"""
+from datetime import datetime as dt
+
+from sqlalchemy import Integer, and_, any_, cast, extract, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Update
+
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+
+orders = OrderModel.__table__
+
+
+def get_booked_hours() -> ColumnElement:
+    """:return: expression of the booked time of the order rounded up to hours."""
+    # Seconds are cut off like in 'round_timedelta_to_hours'.
+    return func.ceil(func.floor(extract('epoch', orders.c.end_datetime - orders.c.start_datetime)) / 3600)
+
+
+def make_reprice_statement(table_ids: list[int] | None, since: dt) -> Update:
+    """
+    Makes the statement that sets the cost of the future orders computed from the current table prices.
+    Only the orders whose cost differs are changed, so their 'updated_at' is changed too.
+    :param table_ids: orders with these tables or all future orders if None.
+    :param since: orders that start at this time or later.
+    :return: update statement that returns the ids of the changed orders.
+    """
+    new_costs = (
+        select(orders.c.id,
+               orders.c.start_datetime,
+               (get_booked_hours() * func.sum(TableModel.price_per_hour)).label('cost'))
+        .join_from(orders, orders_tables, and_(orders.c.id == orders_tables.c.order_id,
+                                               orders.c.start_datetime == orders_tables.c.start_datetime))
+        .join(TableModel, TableModel.id == orders_tables.c.table_id)
+        .where(orders.c.deleted_at.is_(None),
+               orders.c.start_datetime >= since,
+               orders_tables.c.start_datetime >= since)
+        .group_by(orders.c.id, orders.c.start_datetime)
+    )
+    if table_ids is not None:
+        # Orders are found by any of the tables, the cost is computed from all of them.
+        new_costs = new_costs.where(orders.c.id.in_(
+            select(orders_tables.c.order_id)
+            .where(orders_tables.c.table_id == any_(literal(table_ids, ARRAY(Integer))),
+                   orders_tables.c.start_datetime >= since)
+        ))
+    new_costs = new_costs.subquery('new_costs')
+
+    return (update(orders)
+            .where(orders.c.id == new_costs.c.id,
+                   orders.c.start_datetime == new_costs.c.start_datetime,
+                   orders.c.cost.is_distinct_from(cast(new_costs.c.cost, orders.c.cost.type)))
+            .values(cost=new_costs.c.cost)
+            .returning(orders.c.id))
+
+
+def reprice_future_orders(db: Session, table_ids: list[int] | None = None, since: dt | None = None) -> list[int]:
+    """
+    Computes the cost of the future orders again from the current prices of their tables.
+    The changes are not committed, so the orders can be repriced in the transaction of the price change.
+    :param db: db session.
+    :param table_ids: orders with these tables or all future orders if None.
+    :param since: orders that start at this time or later, now by default.
+    :return: sorted ids of the orders whose cost is changed.
+    """
+    statement: Update = make_reprice_statement(table_ids, since or dt.now())
+    return sorted(db.execute(statement).scalars().all())
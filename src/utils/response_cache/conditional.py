@@ -0,0 +1,134 @@
+"""
+Conditional GET requests.
+
+Strong ETags are derived from the versions of the resources (db tables) the response depends on,
+so the request with the matching 'If-None-Match' gets 304 without loading rows from the db.
+'Last-Modified' is the last modification time of these resources.
+Compressed responses have the encoding in the ETag, e.g. '"abc-gzip"'.
+"""
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from hashlib import sha1
+from math import ceil
+from time import time
+from typing import Callable
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from redis.exceptions import RedisError
+
+from src.db.db_redis import get_redis
+from src.utils.color_logging.main import logger
+from src.utils.compression.main import add_encoding_to_etag, remove_encoding_from_etag
+from src.utils.response_cache.main import (MODIFIED_KEY,
+                                           get_resource_versions,
+                                           normalize_params)
+
+# Responses depend on the user's token, so only the client may store them,
+# and it must revalidate them every time.
+CACHE_CONTROL: str = 'private, no-cache'
+
+
+@dataclass
+class ConditionalGet:
+    """
+    Adds validators to the responses of one route and answers conditional requests.
+    :param route: route path, it is a part of the ETag.
+    :param resources: db table names the response depends on.
+    """
+    route: str
+    resources: tuple[str, ...]
+
+    def get_response(self,
+                     request: Request,
+                     params: dict,
+                     access_group: str,
+                     respond: Callable[[], Response]
+                     ) -> Response:
+        """
+        Returns 304 if the client already has the current response,
+        else returns the full response with 'ETag' and 'Last-Modified' headers.
+        If redis is unavailable, the full response is returned without validators.
+        :param request: current request.
+        :param params: query and path parameters of the request.
+        :param access_group: group of users who get the same response, e.g. 'client'.
+        :param respond: function that returns the full response.
+        :return: 304 response or the full response.
+        """
+        try:
+            etag, last_modified = self._make_validators(params, access_group)
+        except RedisError as err:
+            logger.warning(f"Response validators are unavailable for '{self.route}': {err}")
+            return respond()
+
+        headers: dict = {
+            'ETag': etag,
+            'Last-Modified': formatdate(last_modified, usegmt=True),
+            'Cache-Control': CACHE_CONTROL
+        }
+        matching_etag: str | None = self._find_matching_etag(request, etag, last_modified)
+        if matching_etag is not None:
+            headers['ETag'] = matching_etag
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response: Response = respond()
+        if response.status_code == status.HTTP_200_OK:
+            if 'content-encoding' in response.headers:
+                headers['ETag'] = add_encoding_to_etag(etag, response.headers['content-encoding'])
+            response.headers.update(headers)
+        return response
+
+    def _make_validators(self, params: dict, access_group: str) -> tuple[str, int]:
+        """
+        Makes the strong ETag: hash of route + versions of the resources + access group + params.
+        Resources that were never changed get the current time as the modification time.
+        :return: ETag and 'Last-Modified' timestamp rounded up to seconds.
+        """
+        versions: list[tuple[int, float | None]] = get_resource_versions(self.resources)
+        if any(modified_at is None for _, modified_at in versions):
+            versions = self._init_modified_times(versions)
+
+        versions_part: str = '.'.join(str(version) for version, _ in versions)
+        etag_source: str = f'{self.route}:{versions_part}:{access_group}:{normalize_params(params)}'
+        etag: str = f'"{sha1(etag_source.encode()).hexdigest()}"'
+        last_modified: int = ceil(max(modified_at for _, modified_at in versions))
+        return etag, last_modified
+
+    def _init_modified_times(self,
+                             versions: list[tuple[int, float | None]]
+                             ) -> list[tuple[int, float]]:
+        """Saves the current time for the resources without modification time."""
+        pipeline = get_redis().pipeline(transaction=False)
+        now: float = time()
+        for resource, (_, modified_at) in zip(self.resources, versions):
+            if modified_at is None:
+                pipeline.set(MODIFIED_KEY.format(resource), now, nx=True)
+        pipeline.execute()
+        return get_resource_versions(self.resources)
+
+    @staticmethod
+    def _find_matching_etag(request: Request, etag: str, last_modified: int) -> str | None:
+        """
+        Checks the conditional headers.
+        'If-Modified-Since' is ignored if 'If-None-Match' is given.
+        :return: ETag of the client's representation if it is not modified, else None.
+        """
+        if_none_match: str | None = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            for client_etag in if_none_match.split(','):
+                client_etag = client_etag.strip().removeprefix('W/')
+                if client_etag == '*':
+                    return etag
+                if remove_encoding_from_etag(client_etag) == etag:
+                    return client_etag
+            return None
+
+        if_modified_since: str | None = request.headers.get('if-modified-since')
+        if if_modified_since is not None:
+            try:
+                if last_modified <= parsedate_to_datetime(if_modified_since).timestamp():
+                    return etag
+            except (TypeError, ValueError):
+                return None
+
+        return None
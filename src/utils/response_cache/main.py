@@ -0,0 +1,291 @@
+"""
+Cache-aside layer for read-heavy GET endpoints.
+
+Serialized responses are stored in redis with TTL.
+Each cache key contains versions of the resources (db tables) the response depends on,
+so any write operation invalidates the responses by bumping the version.
+Concurrent identical cache misses are coalesced into one computation.
+Compressed variants of the response are stored alongside it,
+so hot responses are compressed once, not per request.
+"""
+import json
+from dataclasses import dataclass, field
+from datetime import date, time as dt_time
+from hashlib import sha1
+from time import time
+from typing import Any, Callable, NoReturn
+
+import orjson
+from fastapi import BackgroundTasks
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from redis.exceptions import RedisError
+
+from src.config import get_settings
+from src.db.db_redis import get_redis
+from src.utils.color_logging.main import logger
+from src.utils.compression.main import choose_encoding, compress
+from src.utils.response_cache.single_flight import FlightStatus, SingleFlight
+
+settings = get_settings()
+
+VERSION_KEY: str = 'response_cache:version:{}'
+MODIFIED_KEY: str = 'response_cache:modified:{}'
+ENTRY_KEY: str = 'response_cache:entry:{}:{}:{}:{}'
+LOCK_KEY: str = 'response_cache:lock:{}'
+STATS_KEY: str = 'response_cache:stats:{}'
+ENCODED_BODY_FIELD: str = 'body:{}'
+
+
+def invalidate_cached_responses(*resources: str) -> NoReturn:
+    """
+    Bumps versions of the given resources and saves their modification time.
+    All cached responses that depend on these resources become unreachable
+    and expire by their TTL.
+    Versions are also used as validators (ETag) of the conditional requests,
+    so they are bumped even if the response cache is disabled.
+    :param resources: db table names.
+    """
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        modified_at: float = time()
+        for resource in resources:
+            pipeline.incr(VERSION_KEY.format(resource))
+            pipeline.set(MODIFIED_KEY.format(resource), modified_at)
+        pipeline.execute()
+    except RedisError as err:
+        logger.warning(f"Failed to invalidate cached responses for {resources}: {err}")
+
+
+def get_resource_versions(resources: tuple[str, ...]) -> list[tuple[int, float | None]]:
+    """
+    Gets versions and modification times of the given resources.
+    Resources that were never changed have version 0 and no modification time.
+    Raises RedisError if redis is unavailable.
+    :param resources: db table names.
+    :return: list of (version, modified_at) pairs.
+    """
+    values: list = get_redis().mget([VERSION_KEY.format(resource) for resource in resources]
+                                    + [MODIFIED_KEY.format(resource) for resource in resources])
+    versions, modified_times = values[:len(resources)], values[len(resources):]
+    return [(int(version) if version else 0, float(modified_at) if modified_at else None)
+            for version, modified_at in zip(versions, modified_times)]
+
+
+def normalize_params(params: dict) -> str:
+    """
+    Converts query parameters to the stable string.
+    Empty parameters are dropped, keys and list values are sorted.
+    """
+    normalized: dict = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item) for item in value)
+        elif isinstance(value, (date, dt_time)):
+            value = value.isoformat()
+        else:
+            value = str(value)
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+
+
+def serialize_response_data(data: Any) -> bytes:
+    """
+    Serializes response data the same way as the default ORJSONResponse does.
+    Only the objects that orjson does not support (e.g. pydantic models) are passed to jsonable_encoder.
+    """
+    return orjson.dumps(data,
+                        default=jsonable_encoder,
+                        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+@dataclass
+class ResponseCache:
+    """
+    Caches serialized responses of one route.
+    :param route: route path, it is used as the key prefix and the stats name.
+    :param resources: db table names the response depends on.
+    """
+    route: str
+    resources: tuple[str, ...]
+    ttl: int = settings.RESPONSE_CACHE_TTL
+    stale_ttl: int = settings.RESPONSE_CACHE_STALE_TTL
+    single_flight: SingleFlight = field(default_factory=SingleFlight)
+
+    def get_response(self,
+                     params: dict,
+                     access_group: str,
+                     compute: Callable[[], Any],
+                     background_tasks: BackgroundTasks,
+                     accept_encoding: str | None = None
+                     ) -> Response:
+        """
+        Returns the cached response or computes, caches and returns a new one.
+        Concurrent identical requests wait for one computation and share its result.
+        If the cached response is stale, it is returned immediately
+        and refreshed in the background by only one request.
+        If the client accepts compression, the compressed variant is returned.
+        If redis is unavailable, the response is just computed.
+        :param params: query parameters of the request.
+        :param access_group: group of users who get the same response, e.g. 'client'.
+        :param compute: function that returns the response data.
+        :param background_tasks: request background tasks.
+        :param accept_encoding: value of the 'Accept-Encoding' request header.
+        :return: JSON response.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return self._make_response(serialize_response_data(compute()))
+
+        encoding: str | None = choose_encoding(accept_encoding)
+        try:
+            key: str = self._make_key(params, access_group)
+            body, fresh_until, encoded_body = get_redis().hmget(
+                key, 'body', 'fresh_until', ENCODED_BODY_FIELD.format(encoding)
+            )
+        except RedisError as err:
+            logger.warning(f"Response cache is unavailable for '{self.route}': {err}")
+            return self._make_response(serialize_response_data(compute()))
+
+        if body is None:
+            body, flight_status = self.single_flight.do(
+                key, lambda: serialize_response_data(compute())
+            )
+            self._count_flight(flight_status)
+            if flight_status != 'coalesced':
+                self._store(key, body)
+            return self._make_response(*self._encode(key, body, encoding, None), cache_status='MISS')
+
+        if float(fresh_until) < time():
+            self._count('stale_hits')
+            if self._acquire_refresh_lock(key):
+                background_tasks.add_task(self._refresh, key, compute)
+            return self._make_response(*self._encode(key, body, encoding, encoded_body),
+                                       cache_status='STALE')
+
+        self._count('hits')
+        return self._make_response(*self._encode(key, body, encoding, encoded_body),
+                                   cache_status='HIT')
+
+    @staticmethod
+    def get_stats() -> list[dict]:
+        """
+        Gets hit statistics of all cached routes.
+        :return: list of dicts with route name, counters and hit ratio.
+        """
+        stats: list[dict] = []
+        try:
+            redis = get_redis()
+            for stats_key in sorted(redis.scan_iter(match=STATS_KEY.format('*'))):
+                counters: dict = {name.decode(): int(value)
+                                  for name, value in redis.hgetall(stats_key).items()}
+                hits: int = counters.get('hits', 0)
+                stale_hits: int = counters.get('stale_hits', 0)
+                misses: int = counters.get('misses', 0)
+                coalesced: int = counters.get('coalesced', 0)
+                total: int = hits + stale_hits + misses + coalesced
+                stats.append({
+                    'route': stats_key.decode().removeprefix(STATS_KEY.format('')),
+                    'hits': hits,
+                    'stale_hits': stale_hits,
+                    'misses': misses,
+                    'coalesced': coalesced,
+                    'coalescing_timeouts': counters.get('coalescing_timeouts', 0),
+                    'hit_ratio': round((hits + stale_hits) / total, 4) if total else 0.0
+                })
+        except RedisError as err:
+            logger.warning(f"Response cache stats are unavailable: {err}")
+        return stats
+
+    def _make_key(self, params: dict, access_group: str) -> str:
+        """
+        Makes the entry key: route + versions of the resources + access group + params hash.
+        """
+        versions_part: str = '.'.join(str(version) for version, _
+                                      in get_resource_versions(self.resources))
+        params_hash: str = sha1(normalize_params(params).encode()).hexdigest()
+        return ENTRY_KEY.format(self.route, versions_part, access_group, params_hash)
+
+    def _store(self, key: str, body: bytes) -> NoReturn:
+        """Replaces the entry, compressed variants of the previous body are removed."""
+        try:
+            pipeline = get_redis().pipeline()
+            pipeline.delete(key)
+            pipeline.hset(key, mapping={'body': body, 'fresh_until': time() + self.ttl})
+            pipeline.expire(key, self.ttl + self.stale_ttl)
+            pipeline.execute()
+        except RedisError as err:
+            logger.warning(f"Failed to cache the response for '{self.route}': {err}")
+
+    def _encode(self,
+                key: str,
+                body: bytes,
+                encoding: str | None,
+                encoded_body: bytes | None
+                ) -> tuple[bytes, str | None]:
+        """
+        Gets the compressed variant of the body.
+        If it is not cached yet, it compresses the body and stores the variant alongside it.
+        Small bodies are not compressed.
+        :return: body and its encoding or the uncompressed body and None.
+        """
+        if encoding is None or len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+            return body, None
+
+        if encoded_body is None:
+            encoded_body = compress(body, encoding)
+            try:
+                pipeline = get_redis().pipeline()
+                pipeline.hset(key, ENCODED_BODY_FIELD.format(encoding), encoded_body)
+                # If the entry has expired in the meantime, the variant expires too.
+                pipeline.expire(key, self.ttl + self.stale_ttl, nx=True)
+                pipeline.execute()
+            except RedisError as err:
+                logger.warning(f"Failed to cache the compressed response for '{self.route}': {err}")
+        return encoded_body, encoding
+
+    def _refresh(self, key: str, compute: Callable[[], Any]) -> NoReturn:
+        """Recomputes the stale entry, it runs after the stale response was sent."""
+        self._store(key, serialize_response_data(compute()))
+        try:
+            get_redis().delete(LOCK_KEY.format(key))
+        except RedisError:
+            pass
+
+    def _acquire_refresh_lock(self, key: str) -> bool:
+        """Only one request refreshes the stale entry, other requests get the stale one."""
+        try:
+            return bool(get_redis().set(LOCK_KEY.format(key), 1, nx=True, ex=self.ttl))
+        except RedisError:
+            return False
+
+    def _count_flight(self, flight_status: FlightStatus) -> NoReturn:
+        """
+        Only the leader of the coalesced requests is counted as the miss,
+        because only it has queried the db.
+        """
+        match flight_status:
+            case 'coalesced':
+                self._count('coalesced')
+            case 'timeout':
+                self._count('misses')
+                self._count('coalescing_timeouts')
+            case _:
+                self._count('misses')
+
+    def _count(self, counter_name: str) -> NoReturn:
+        try:
+            get_redis().hincrby(STATS_KEY.format(self.route), counter_name, 1)
+        except RedisError:
+            pass
+
+    @staticmethod
+    def _make_response(body: bytes,
+                       encoding: str | None = None,
+                       cache_status: str | None = None
+                       ) -> Response:
+        headers: dict = {'X-Cache': cache_status} if cache_status else {}
+        if encoding:
+            headers.update({'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+        return Response(content=body, media_type='application/json', headers=headers)
@@ -0,0 +1,66 @@
+"""
+Request coalescing (single-flight).
+
+Concurrent identical computations wait on one in-flight computation
+and share its result instead of running the same query many times.
+Sync routes are executed in the thread pool, so the waiting is done with thread futures.
+"""
+from concurrent.futures import Future, TimeoutError
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Literal
+
+from src.config import get_settings
+from src.utils.color_logging.main import logger
+
+settings = get_settings()
+
+FlightStatus = Literal['leader', 'coalesced', 'timeout']
+
+
+@dataclass
+class SingleFlight:
+    """
+    Runs only one computation per key at the same time in this process.
+    :param timeout: seconds the request waits for the in-flight computation,
+    then it computes the result by itself.
+    """
+    timeout: float = settings.RESPONSE_COALESCING_TIMEOUT
+    _in_flight: dict[str, Future] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock)
+
+    def do(self, key: str, compute: Callable[[], Any]) -> tuple[Any, FlightStatus]:
+        """
+        Computes the result or waits for the same computation that is already running.
+        If the computation raises an error, the waiting requests get the same error.
+        The result must be safe for sharing between threads (e.g. serialized bytes).
+        :param key: computation key, e.g. route + normalized params + access group.
+        :param compute: function that returns the result.
+        :return: result and flight status: 'leader', 'coalesced' or 'timeout'.
+        """
+        with self._lock:
+            future: Future | None = self._in_flight.get(key)
+            is_leader: bool = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            try:
+                return future.result(timeout=self.timeout), 'coalesced'
+            except TimeoutError:
+                logger.warning(f"In-flight computation '{key}' took more than {self.timeout}s, "
+                               f"the request computes the result by itself.")
+                return compute(), 'timeout'
+
+        try:
+            result: Any = compute()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result, 'leader'
+        finally:
+            with self._lock:
+                del self._in_flight[key]
@@ -0,0 +1,102 @@
+"""
+Sparse fieldsets (`?fields=id,start_datetime`) and relationship expansion (`?include=tables`).
+
+Only the requested fields are loaded from the db and returned by the trimmed response schema.
+"""
+from functools import lru_cache
+from typing import Any, get_type_hints
+
+from fastapi import status
+from pydantic import BaseModel as BaseSchema, create_model
+from sqlalchemy import inspect
+
+from src.db.db_sqlalchemy import BaseModel
+from src.utils.exceptions import JSONException
+from src.utils.response_generation.main import get_text
+
+
+def parse_fields(fields: str | None, schema: type[BaseSchema]) -> tuple[str, ...]:
+    """
+    Converts the comma separated field names to the tuple in the schema field order.
+    If no fields are given, all schema fields are returned.
+    If there are unknown fields, then raises the error.
+    :param fields: value of the 'fields' query parameter, e.g. 'id,start_datetime'.
+    :param schema: full response schema.
+    :return: field names.
+    """
+    available_fields: tuple[str, ...] = tuple(schema.__fields__)
+    if not fields:
+        return available_fields
+
+    requested_fields: set[str] = {field.strip() for field in fields.split(',') if field.strip()}
+    if unknown_fields := requested_fields.difference(available_fields):
+        raise JSONException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=get_text('err_unknown_fields').format(', '.join(sorted(unknown_fields)),
+                                                          ', '.join(available_fields))
+        )
+    return tuple(field for field in available_fields if field in requested_fields)
+
+
+def parse_include(include: str | None,
+                  fields: tuple[str, ...],
+                  model: type[BaseModel]
+                  ) -> tuple[str, ...]:
+    """
+    Removes the nested relationships that are not included from the fields.
+    If 'include' is not given, all relationships are included, an empty value includes nothing.
+    If there are unknown relationships, then raises the error.
+    :param include: value of the 'include' query parameter, e.g. 'tables'.
+    :param fields: field names from 'parse_fields'.
+    :param model: db model.
+    :return: field names.
+    """
+    if include is None:
+        return fields
+
+    relationships: list[str] = inspect(model).relationships.keys()
+    included: set[str] = {name.strip() for name in include.split(',') if name.strip()}
+    if unknown_relationships := included.difference(relationships):
+        raise JSONException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=get_text('err_unknown_include').format(', '.join(sorted(unknown_relationships)),
+                                                           ', '.join(relationships))
+        )
+    return tuple(field for field in fields if field not in relationships or field in included)
+
+
+@lru_cache()
+def get_response_schema(schema: type[BaseSchema], fields: tuple[str, ...]) -> type[BaseSchema]:
+    """
+    Gets the schema with the given fields only.
+    :param schema: full response schema.
+    :param fields: field names from 'parse_fields'.
+    :return: full schema if all fields are requested, else the trimmed schema.
+    """
+    if fields == tuple(schema.__fields__):
+        return schema
+
+    # Original annotations, constraints are applied again from the field info.
+    annotations: dict = get_type_hints(schema)
+    return create_model(
+        f'Trimmed{schema.__name__}',
+        __config__=schema.__config__,
+        **{name: (annotations[name], schema.__fields__[name].field_info) for name in fields}
+    )
+
+
+def convert_to_response_data(obj: Any,
+                             schema: type[BaseSchema],
+                             fields: tuple[str, ...]
+                             ) -> dict | None:
+    """
+    Converts the db object to the dict with the given fields only.
+    Only these fields are read from the object, so deferred columns are not loaded.
+    :param obj: db object or None.
+    :param schema: full response schema.
+    :param fields: field names from 'parse_fields'.
+    :return: dict or None if there is no object.
+    """
+    if obj is None:
+        return None
+    return get_response_schema(schema, fields).from_orm(obj).dict()
@@ -0,0 +1,60 @@
+"""
+Bandwidth and CPU cost of the response compression at several body sizes.
+
+Bodies are GET /orders/ responses with the given number of orders.
+'per request' is the CPU time the middleware spends on every response,
+a precompressed cached response costs only the redis read.
+Run from the project root:
+    python -m tests.benchmarks.bench_compression
+"""
+import time
+from datetime import datetime as dt, timedelta as td
+
+from src.utils.compression.main import ENCODINGS, compress
+from src.utils.response_cache.main import serialize_response_data
+
+ORDERS_NUMBERS: tuple[int, ...] = (5, 50, 500, 5_000, 50_000)
+MIN_MEASURING_TIME: float = 0.5  # seconds
+
+
+def make_body(orders_number: int) -> bytes:
+    start = dt(2022, 1, 1, 10)
+    return serialize_response_data([
+        {
+            'start_datetime': start + td(hours=id_),
+            'end_datetime': start + td(hours=id_, minutes=59),
+            'user_id': id_ % 50 + 1,
+            'id': id_,
+            'status': 'confirmed' if id_ % 3 else 'processing',
+            'cost': 1000.0 + id_ % 7 * 250,
+            'tables': [{'type': 'standard', 'number_of_seats': 4,
+                        'price_per_hour': 500.0, 'id': id_ % 20 + 1}]
+        }
+        for id_ in range(1, orders_number + 1)
+    ])
+
+
+def measure(body: bytes, encoding: str) -> tuple[int, float]:
+    """:return: compressed size and compression time in ms."""
+    rounds: int = 0
+    compressed: bytes = b''
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < MIN_MEASURING_TIME:
+        compressed = compress(body, encoding)
+        rounds += 1
+    return len(compressed), elapsed / rounds * 1000
+
+
+def main():
+    print(f"{'orders':>7} {'raw':>11} {'encoding':>9} {'compressed':>11} {'ratio':>6} "
+          f"{'per request':>12}")
+    for orders_number in ORDERS_NUMBERS:
+        body = make_body(orders_number)
+        for encoding in ENCODINGS:
+            size, ms = measure(body, encoding)
+            print(f'{orders_number:>7} {len(body):>9} B {encoding:>9} {size:>9} B '
+                  f'{len(body) / size:>5.1f}x {ms:>9.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
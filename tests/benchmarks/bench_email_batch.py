@@ -0,0 +1,91 @@
+"""
+Throughput of sending letters: one SMTP session per letter vs one session per batch.
+
+A local SMTP stand-in accepts every command, so only the client side is measured.
+Run from the project root:
+    python -m tests.benchmarks.bench_email_batch
+"""
+import asyncio
+import time
+
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+
+from src.utils.composing_email.main import CachedTemplateFastMail, email_config
+
+LETTERS: int = 500
+SMTP_HOST: str = '127.0.0.1'
+SMTP_PORT: int = 8025
+
+
+async def handle_smtp_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal SMTP server that accepts everything."""
+    writer.write(b'220 localhost stand-in\r\n')
+    in_data = False
+    while line := await reader.readline():
+        if in_data:
+            if line == b'.\r\n':
+                in_data = False
+                writer.write(b'250 OK\r\n')
+            continue
+
+        command: bytes = line[:4].upper()
+        if command in (b'EHLO', b'HELO'):
+            writer.write(b'250 localhost\r\n')
+        elif command == b'DATA':
+            in_data = True
+            writer.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+        elif command == b'QUIT':
+            writer.write(b'221 Bye\r\n')
+            await writer.drain()
+            break
+        else:
+            writer.write(b'250 OK\r\n')
+        await writer.drain()
+    writer.close()
+
+
+def compose_letters() -> list[list[MessageSchema, str]]:
+    return [
+        [
+            MessageSchema(
+                subject='Restaurant-API: registration for the service.',
+                recipients=[f'user_{number}@example.com'],
+                template_body={'heading': 'Heading', 'text': 'Text: ',
+                               'email': f'user_{number}@example.com',
+                               'expire': '2022-01-01 00:00:00', 'url': 'http://localhost/'}
+            ),
+            'confirm_email.html'
+        ]
+        for number in range(LETTERS)
+    ]
+
+
+async def main():
+    server = await asyncio.start_server(handle_smtp_client, SMTP_HOST, SMTP_PORT)
+    config = ConnectionConfig(**email_config.dict(exclude={'MAIL_SERVER', 'MAIL_PORT', 'MAIL_TLS',
+                                                           'USE_CREDENTIALS'}),
+                              MAIL_SERVER=SMTP_HOST,
+                              MAIL_PORT=SMTP_PORT,
+                              MAIL_TLS=False,
+                              USE_CREDENTIALS=False)
+
+    async with server:
+        letters = compose_letters()
+        start = time.perf_counter()
+        for message, template_name in letters:
+            await FastMail(config).send_message(message, template_name=template_name)
+        per_letter_time = time.perf_counter() - start
+
+        letters = compose_letters()
+        start = time.perf_counter()
+        await CachedTemplateFastMail(config).send_messages(letters)
+        batch_time = time.perf_counter() - start
+
+    print(f'{LETTERS} letters, session per letter: {per_letter_time:.2f}s '
+          f'({LETTERS / per_letter_time:.0f} letters/s)')
+    print(f'{LETTERS} letters, one session:        {batch_time:.2f}s '
+          f'({LETTERS / batch_time:.0f} letters/s)')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Occupancy heatmap of a year: the whole heatmap with the db query vs the numpy part only.
+
+The db is an in-memory SQLite with an order each hour of the year, two tables each.
+The numpy part is also measured with many more booked intervals than the db holds.
+Run from the project root:
+    python -m tests.benchmarks.bench_occupancy_heatmap
+"""
+import time
+from datetime import date, time as time_
+
+import numpy as np
+from sqlalchemy import insert
+
+from src.api.crud_operations.utils.schedule import WEEK_DAYS
+from src.api.models.schedule import ScheduleModel
+from src.utils.occupancy.main import DAY, HOUR, compute_occupancy, find_opening_seconds, make_occupancy_heatmap
+from tests.benchmarks import bench_orders_serialization as serialization
+
+ORDERS: int = 365 * 24
+INTERVALS: int = 1_000_000
+TABLES: int = 100
+START_DATE: date = date(2022, 1, 1)
+END_DATE: date = date(2022, 12, 31)
+ROUNDS: int = 5
+
+
+def populate_db():
+    serialization.ORDERS = ORDERS
+    serialization.populate_db()
+    with serialization.engine.begin() as connection:
+        connection.execute(insert(ScheduleModel), [
+            {'id': id_, 'day': day, 'open_time': time_(8), 'close_time': time_(22),
+             'break_start_time': time_(13), 'break_end_time': time_(13, 59, 59)}
+            for id_, day in enumerate(WEEK_DAYS, start=1)
+        ])
+
+
+def measure(function) -> float:
+    """:return: the best time of the rounds."""
+    times: list[float] = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    populate_db()
+    db = serialization.TestingSession()
+    heatmap_time: float = measure(lambda: make_occupancy_heatmap(db, START_DATE, END_DATE))
+    db.close()
+
+    days: int = (END_DATE - START_DATE).days + 1
+    rng = np.random.default_rng(0)
+    starts: np.ndarray = rng.integers(0, days, INTERVALS) * DAY + rng.integers(8 * HOUR, 20 * HOUR, INTERVALS)
+    ends: np.ndarray = starts + rng.integers(HOUR // 2, 2 * HOUR, INTERVALS)
+    table_ids: np.ndarray = np.arange(1, TABLES + 1)
+    booked_table_ids: np.ndarray = rng.integers(1, TABLES + 1, INTERVALS)
+    opening_seconds: np.ndarray = find_opening_seconds(
+        {day: ScheduleModel(day=day, open_time=time_(8), close_time=time_(22)) for day in WEEK_DAYS},
+        START_DATE,
+        days
+    )
+    numpy_time: float = measure(lambda: compute_occupancy(table_ids, booked_table_ids, starts, ends,
+                                                          opening_seconds, START_DATE))
+
+    print(f'heatmap of {days} days, {ORDERS} orders with the db query: {heatmap_time * 1000:>7.0f} ms')
+    print(f'numpy part, {INTERVALS} intervals of {TABLES} tables:       {numpy_time * 1000:>7.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Archival throughput with 2M synthetic orders over the last two years:
+orders moved per second for several batch sizes and the time of the booking check before and after.
+
+The archival statements are PostgreSQL only, so the test database is used,
+it is dropped and created again like in the functional tests.
+Run from the project root:
+    python -m tests.benchmarks.bench_orders_archival
+"""
+import time
+from datetime import date, datetime as dt, timedelta as td
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.api.crud_operations.utils.table import get_table_ids_by_booking_time
+from src.config import get_settings
+from src.db.db_sqlalchemy import BaseModel
+from src.db.tools.db_operations import DatabaseOperation, PsqlDatabaseConnection
+from src.utils.archiving.main import archive_orders
+from src.utils.partitioning.main import create_partitions
+
+ORDERS: int = 2_000_000
+DAYS: int = 730
+TABLES: int = 50
+BATCH_SIZES: tuple[int, ...] = (1_000, 5_000, 20_000)
+
+settings = get_settings()
+engine = create_engine(settings.get_test_database_url())
+TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def populate_db() -> None:
+    """Creates the test db with the orders of the last 'DAYS' days, several orders each hour."""
+    with PsqlDatabaseConnection() as conn:
+        database = DatabaseOperation(connection=conn,
+                                     db_name=settings.TEST_DATABASE['db_name'],
+                                     user_name=settings.TEST_DATABASE['username'],
+                                     user_password=settings.TEST_DATABASE['user_password'])
+        database.drop_all()
+        database.create_all()
+    BaseModel.metadata.create_all(bind=engine)
+
+    first_day: date = date.today() - td(days=DAYS)
+    with TestingSession() as db:
+        create_partitions(db, first_day, date.today())
+        db.execute(text("INSERT INTO users (id, username, role, status) "
+                        "VALUES (1, 'superuser', 'superuser', 'confirmed')"))
+        db.execute(text("INSERT INTO tables (id, type, number_of_seats, price_per_hour) "
+                        "SELECT n, 'standard', 4, 500 FROM generate_series(1, :tables) AS n"), {'tables': TABLES})
+        # Orders go day by day, then hour by hour from 8 to 21.
+        db.execute(text("INSERT INTO orders (id, start_datetime, end_datetime, status, cost, user_id) "
+                        "SELECT n, start_datetime, start_datetime + interval '59 minutes', 'confirmed', 500, 1 "
+                        "FROM (SELECT n, CAST(:first_day AS timestamp) "
+                        "             + ((n - 1) % :days) * interval '1 day' "
+                        "             + (8 + (n - 1) / :days % 14) * interval '1 hour' AS start_datetime "
+                        "      FROM generate_series(1, :orders) AS n) AS numbers"),
+                   {'first_day': first_day, 'days': DAYS, 'orders': ORDERS})
+        db.execute(text("INSERT INTO orders_tables (order_id, table_id, start_datetime) "
+                        "SELECT id, id % :tables + 1, start_datetime FROM orders"), {'tables': TABLES})
+        db.commit()
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level='AUTOCOMMIT').execute(text('VACUUM ANALYZE'))
+
+
+def measure_booking_check() -> float:
+    """:return: time of the booking check of today in ms."""
+    with TestingSession() as db:
+        start = time.perf_counter()
+        get_table_ids_by_booking_time(dt.combine(date.today(), dt.min.time()), date.today(), db)
+        return (time.perf_counter() - start) * 1000
+
+
+def main():
+    before: dt = dt.combine(date.today() - td(days=DAYS // 2), dt.min.time())
+    print(f"{ORDERS} orders {'archived':>10} {'time':>9} {'orders/s':>10} "
+          f"{'check before':>13} {'check after':>12}")
+    for batch_size in BATCH_SIZES:
+        populate_db()
+        check_before: float = measure_booking_check()
+        with TestingSession() as db:
+            start = time.perf_counter()
+            archived_orders: int = archive_orders(db, before=before, batch_size=batch_size)
+            archival_time: float = time.perf_counter() - start
+        check_after: float = measure_booking_check()
+        print(f'batch {batch_size:>7} {archived_orders:>10} {archival_time:>7.1f} s '
+              f'{archived_orders / archival_time:>10.0f} {check_before:>10.1f} ms {check_after:>9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
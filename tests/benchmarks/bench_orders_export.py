@@ -0,0 +1,78 @@
+"""
+GET /orders/ vs streaming GET /orders/export with 50k orders:
+time to the first body chunk, total time and peak python memory while the response is sent.
+
+The app is called directly as ASGI app, because the test client collects the whole body first.
+The db is an in-memory SQLite, so the server-side cursor is not used, but the rows are still
+fetched and serialized by chunks.
+Run from the project root:
+    python -m tests.benchmarks.bench_orders_export
+"""
+import time
+import tracemalloc
+
+import anyio
+
+from src.api.dependencies.auth import get_current_admin_or_superuser
+from tests.benchmarks import bench_orders_serialization as serialization
+
+ORDERS: int = 50_000
+
+
+async def request(app, path: str) -> tuple[float, float, int]:
+    """:return: time to the first body chunk, total time and body size."""
+    first_chunk_time: float | None = None
+    body_size: int = 0
+    request_sent: bool = False
+
+    async def receive() -> dict:
+        # The streaming response listens for the disconnect until the body is sent.
+        nonlocal request_sent
+        if request_sent:
+            await anyio.sleep_forever()
+        request_sent = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: dict) -> None:
+        nonlocal first_chunk_time, body_size
+        if message['type'] == 'http.response.body':
+            if first_chunk_time is None:
+                first_chunk_time = time.perf_counter() - start
+            body_size += len(message.get('body', b''))
+
+    scope: dict = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [], 'server': ('testserver', 80), 'client': ('testclient', 50000)
+    }
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return first_chunk_time, time.perf_counter() - start, body_size
+
+
+def measure(app, path: str) -> tuple[float, float, int, int]:
+    """:return: time to the first chunk, total time, body size and peak memory."""
+    first_chunk_time, total_time, body_size = anyio.run(request, app, path)
+
+    tracemalloc.start()
+    anyio.run(request, app, path)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_chunk_time, total_time, body_size, peak_memory
+
+
+def main():
+    serialization.ORDERS = ORDERS
+    serialization.populate_db()
+    app = serialization.make_client().app
+    app.dependency_overrides[get_current_admin_or_superuser] = lambda: serialization.superuser
+
+    print(f"{ORDERS} orders {'first chunk':>14} {'total':>10} {'body':>10} {'peak memory':>12}")
+    for name, path in (('list', '/api/v1/orders/'), ('export', '/api/v1/orders/export')):
+        first_chunk_time, total_time, body_size, peak_memory = measure(app, path)
+        print(f'{name:>12} {first_chunk_time * 1000:>11.0f} ms {total_time * 1000:>7.0f} ms '
+              f'{body_size / 2 ** 20:>7.1f} MB {peak_memory / 2 ** 20:>9.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
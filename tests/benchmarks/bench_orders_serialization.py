@@ -0,0 +1,111 @@
+"""
+GET /orders/ with 10k orders: ORM objects + response model validation + json
+vs rows built into dicts + orjson.
+
+The db is an in-memory SQLite, so the measured difference is only the python side.
+Run from the project root:
+    python -m tests.benchmarks.bench_orders_serialization
+"""
+import time
+from datetime import datetime as dt, timedelta as td
+
+from fastapi import Depends
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.factory_app import create_app
+from src.api.crud_operations.order import OrderOperation
+from src.api.dependencies.auth import get_current_confirmed_user
+from src.api.dependencies.db import get_db
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+from src.api.models.user import UserModel
+from src.api.schemes.order.base_schemes import OrderGetSchema
+from src.db.db_sqlalchemy import BaseModel
+
+ORDERS: int = 10_000
+TABLES: int = 20
+TABLES_PER_ORDER: int = 2
+ROUNDS: int = 3
+
+engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+superuser = UserModel(id=1, username='superuser', role='superuser', status='confirmed')
+
+
+def populate_db():
+    BaseModel.metadata.create_all(engine)
+    start = dt(2022, 1, 1, 10)
+    with engine.begin() as connection:
+        connection.execute(insert(UserModel), [{'id': 1, 'username': 'superuser',
+                                                'email': 'superuser@example.com', 'phone': '123456789',
+                                                'role': 'superuser', 'status': 'confirmed'}])
+        connection.execute(insert(TableModel), [
+            {'id': id_, 'type': 'standard', 'number_of_seats': 4, 'price_per_hour': 500.0}
+            for id_ in range(1, TABLES + 1)
+        ])
+        connection.execute(insert(OrderModel), [
+            {'id': id_, 'start_datetime': start + td(hours=id_), 'user_id': 1,
+             'end_datetime': start + td(hours=id_, minutes=59), 'status': 'processing', 'cost': 1000.0}
+            for id_ in range(1, ORDERS + 1)
+        ])
+        # SQLite does not generate the ids of the composite primary key.
+        connection.execute(insert(orders_tables), [
+            {'id': (order_id - 1) * TABLES_PER_ORDER + shift + 1, 'order_id': order_id,
+             'table_id': (order_id + shift) % TABLES + 1, 'start_datetime': start + td(hours=order_id)}
+            for order_id in range(1, ORDERS + 1)
+            for shift in range(TABLES_PER_ORDER)
+        ])
+
+
+def get_testing_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def make_client() -> TestClient:
+    app = create_app(with_logger=False)
+    app.dependency_overrides[get_db] = get_testing_db
+    app.dependency_overrides[get_current_confirmed_user] = lambda: superuser
+
+    # The previous implementation of GET /orders/.
+    @app.get('/orders_via_orm/', response_model=list[OrderGetSchema], response_class=JSONResponse)
+    def get_all_orders_via_orm(db: Session = Depends(get_testing_db)):
+        return OrderOperation(db=db, user=superuser).find_all_by_params()
+
+    return TestClient(app)
+
+
+def measure(client: TestClient, url: str) -> tuple[float, list]:
+    best: float = float('inf')
+    data: list = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - start)
+        data = response.json()
+    return best, data
+
+
+def main():
+    populate_db()
+    client = make_client()
+
+    orm_time, orm_data = measure(client, '/orders_via_orm/')
+    fast_time, fast_data = measure(client, '/api/v1/orders/')
+    assert orm_data == fast_data and len(fast_data) == ORDERS
+
+    print(f'{ORDERS} orders, ORM + response model + json: {orm_time * 1000:.0f} ms')
+    print(f'{ORDERS} orders, rows as dicts + orjson:      {fast_time * 1000:.0f} ms '
+          f'({orm_time / fast_time:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,7 @@ from src.db.tools.db_operations import PsqlDatabaseConnection, DatabaseOperation
 from src.api.factory_app import create_app
 from src.config import get_settings
 from src.api.dependencies.db import get_db
-from src.utils.db_populating.inserting_data_into_db import insert_data_to_db
+from src.utils.db_populating.inserting_data_into_db import insert_data_to_db, sync_orders_id_sequence
 
 from tests.functional_tests.test_data import users_json, tables_json, schedules_json, order_json
 from tests.functional_tests.utils import (get_superuser_token_headers,
@@ -19,6 +19,13 @@ from tests.functional_tests.utils import (get_superuser_token_headers,
 setting = get_settings()
 
 api_url = setting.API_URL
+# Every test is rolled back, so cached responses could outlive the data they were built from.
+setting.RESPONSE_CACHE_ENABLED = False
+# Changes are made in the test transaction, so they are returned by the delta sync without waiting.
+setting.CHANGES_SAFETY_LAG = 0
+# There is no celery worker in the tests, so the future orders are repriced in the table update transaction.
+setting.ORDERS_REPRICE_IN_BACKGROUND = False
+setting.DELETE_CASCADE_IN_BACKGROUND = False
 db_config = setting.TEST_DATABASE
 URL = setting.get_test_database_url()
 engine = create_engine(URL)
@@ -49,6 +56,8 @@ def db_session():
     connection = engine.connect()
     transaction = connection.begin()
     session_ = TestingSessionLocal(bind=connection)
+    # The sequence is not rolled back with the test, so the new orders of each test get the same ids.
+    sync_orders_id_sequence(session_)
 
     yield session_
 
@@ -0,0 +1,110 @@
+import pytest
+
+from tests.functional_tests.conftest import (api_url,
+                                             superuser_token,
+                                             admin_token,
+                                             confirmed_client_token)
+
+from src.utils.response_generation.main import get_text
+
+
+class TestBatch:
+    # POST
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_execute_batch(self, token, client):
+        response = client.post(
+            f'{api_url}/batch', json={'operations': [
+                {'method': 'PATCH', 'resource': 'tables', 'id': 1, 'data': {'number_of_seats': 8}},
+                {'method': 'POST', 'resource': 'tables',
+                 'data': {'type': 'vip_room', 'number_of_seats': 8, 'price_per_hour': 30000}},
+                {'method': 'DELETE', 'resource': 'orders', 'id': 1}
+            ]}, headers=token
+        )
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json() == {'committed': True, 'results': [
+            {'status_code': 200, 'id': 1, 'message': get_text('patch').format('table', 1)},
+            {'status_code': 201, 'id': 7, 'message': get_text('post').format('table', 7)},
+            {'status_code': 200, 'id': 1, 'message': get_text('delete').format('order', 1)}
+        ]}
+
+        response = client.get(f'{api_url}/tables/1?fields=number_of_seats&include=', headers=token)
+        assert response.json() == {'number_of_seats': 8}
+        response = client.get(f'{api_url}/orders/?fields=id', headers=token)
+        assert response.json() == [{'id': 3}, {'id': 2}]
+
+    def test_execute_atomic_batch_with_error(self, client):
+        response = client.post(
+            f'{api_url}/batch', json={'operations': [
+                {'method': 'PATCH', 'resource': 'tables', 'id': 1, 'data': {'number_of_seats': 8}},
+                {'method': 'PATCH', 'resource': 'tables', 'id': 100, 'data': {'number_of_seats': 8}},
+                {'method': 'DELETE', 'resource': 'orders', 'id': 1}
+            ]}, headers=superuser_token
+        )
+        assert response.status_code == 200
+        assert response.json() == {'committed': False, 'results': [
+            {'status_code': 200, 'id': 1, 'message': get_text('patch').format('table', 1)},
+            {'status_code': 404, 'id': 100, 'message': get_text('not_found').format('table', 100)}
+        ]}
+
+        # The first operation is rolled back and the last one is not executed.
+        response = client.get(f'{api_url}/tables/1?fields=number_of_seats&include=',
+                              headers=superuser_token)
+        assert response.json() == {'number_of_seats': 6}
+        response = client.get(f'{api_url}/orders/?fields=id', headers=superuser_token)
+        assert len(response.json()) == 3
+
+    def test_execute_not_atomic_batch_with_error(self, client):
+        response = client.post(
+            f'{api_url}/batch', json={'atomic': False, 'operations': [
+                {'method': 'PATCH', 'resource': 'tables', 'id': 1, 'data': {'number_of_seats': 8}},
+                {'method': 'PATCH', 'resource': 'tables', 'id': 2, 'data': {'number_of_seats': 'many'}},
+                {'method': 'DELETE', 'resource': 'orders', 'id': 1}
+            ]}, headers=superuser_token
+        )
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert response.json()['committed'] is True
+        assert [result['status_code'] for result in results] == [200, 422, 200]
+        assert results[1]['message'][0]['loc'] == ['number_of_seats']
+
+        # Only the failed operation is rolled back.
+        response = client.get(f'{api_url}/tables/1?fields=number_of_seats&include=',
+                              headers=superuser_token)
+        assert response.json() == {'number_of_seats': 8}
+        response = client.get(f'{api_url}/orders/?fields=id', headers=superuser_token)
+        assert response.json() == [{'id': 3}, {'id': 2}]
+
+    def test_execute_batch_by_client(self, client):
+        response = client.post(
+            f'{api_url}/batch', json={'atomic': False, 'operations': [
+                {'method': 'PATCH', 'resource': 'tables', 'id': 1, 'data': {'number_of_seats': 8}},
+                {'method': 'DELETE', 'resource': 'orders', 'id': 1},
+                {'method': 'DELETE', 'resource': 'orders', 'id': 2}
+            ]}, headers=confirmed_client_token
+        )
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'status_code': 403, 'id': 1, 'message': get_text('forbidden_request')},
+            # not the client's order
+            {'status_code': 404, 'id': 1, 'message': get_text('not_found').format('order', 1)},
+            {'status_code': 200, 'id': 2, 'message': get_text('delete').format('order', 2)}
+        ]
+
+
+class TestBatchException:
+    @pytest.mark.parametrize("json_to_send", [
+        # no operations
+        {'operations': []},
+        # no id
+        {'operations': [{'method': 'DELETE', 'resource': 'orders'}]},
+        # no data
+        {'operations': [{'method': 'PATCH', 'resource': 'orders', 'id': 1}]},
+        # unknown resource
+        {'operations': [{'method': 'DELETE', 'resource': 'cache', 'id': 1}]}
+    ])
+    def test_execute_invalid_batch(self, json_to_send, client):
+        response = client.post(
+            f'{api_url}/batch', json=json_to_send, headers=superuser_token
+        )
+        assert response.status_code == 422
@@ -0,0 +1,28 @@
+from tests.functional_tests.conftest import (api_url,
+                                             superuser_token,
+                                             admin_token,
+                                             confirmed_client_token)
+
+from src.utils.response_generation.main import get_text
+
+
+class TestCache:
+    # GET
+    def test_get_cache_stats(self, client):
+        for token in superuser_token, admin_token:
+            response = client.get(
+                f'{api_url}/cache/stats/', headers=token
+            )
+            assert response.status_code == 200
+            assert 'application/json' in response.headers['Content-Type']
+            assert isinstance(response.json(), list)
+
+
+class TestCacheException:
+    def test_forbidden_request(self, client):
+        response = client.get(
+            f'{api_url}/cache/stats/', headers=confirmed_client_token
+        )
+        assert response.status_code == 403
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json()['message'] == get_text('forbidden_request')
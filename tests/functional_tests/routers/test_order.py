@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from tests.functional_tests.test_data import order_json
@@ -21,6 +23,32 @@ class TestOrderViaSuperUserOrAdmin:
         assert 'application/json' in response.headers['Content-Type']
         assert len(response.json()) == 3
 
+    @pytest.mark.parametrize("url, result_ids, result_headers", [
+        # filtered orders are counted exactly
+        ('/orders/?status=confirmed&limit=1&with=count,sum_cost', [3],
+         {'X-Total-Count': '2', 'X-Total-Count-Type': 'exact', 'X-Total-Sum-Cost': '33000.0'}),
+        ('/orders/?status=confirmed&limit=1&offset=1&with=count', [2],
+         {'X-Total-Count': '2', 'X-Total-Count-Type': 'exact'}),
+        # empty page
+        ('/orders/?status=confirmed&offset=5&with=count,sum_cost', [],
+         {'X-Total-Count': '2', 'X-Total-Count-Type': 'exact', 'X-Total-Sum-Cost': '33000.0'}),
+        # all orders are counted by the db statistics
+        ('/orders/?limit=2&with=count', [3, 1],
+         {'X-Total-Count': '3', 'X-Total-Count-Type': 'estimated'})
+    ])
+    def test_get_all_orders_with_totals(self, url, result_ids, result_headers, client):
+        response = client.get(f'{api_url}{url}', headers=superuser_token)
+        assert response.status_code == 200
+        assert [order['id'] for order in response.json()] == result_ids
+        for header, value in result_headers.items():
+            assert response.headers[header] == value
+
+    def test_get_all_orders_without_totals(self, client):
+        response = client.get(f'{api_url}/orders/?limit=1', headers=superuser_token)
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert 'X-Total-Count' not in response.headers
+
     @pytest.mark.parametrize("order_id", [1, 2, 3])
     def test_get_order_by_id(self, order_id, client):
         for token in superuser_token, admin_token:
@@ -36,6 +64,106 @@ class TestOrderViaSuperUserOrAdmin:
 
             assert response_without_tables == data_to_compare
 
+    @pytest.mark.parametrize("order_id", [1, 2, 3])
+    def test_conditional_get_order_by_id(self, order_id, client):
+        response = client.get(f'{api_url}/orders/{order_id}', headers=superuser_token)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+
+        response = client.get(
+            f'{api_url}/orders/{order_id}', headers={**superuser_token, 'If-None-Match': etag}
+        )
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+
+        # The same order has another representation for another role.
+        response = client.get(
+            f'{api_url}/orders/{order_id}', headers={**confirmed_client_token, 'If-None-Match': etag}
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("fields, result_fields", [
+        ('id,start_datetime,end_datetime', {'id', 'start_datetime', 'end_datetime'}),
+        ('cost,tables', {'cost', 'tables'})
+    ])
+    def test_get_orders_with_fields(self, fields, result_fields, client):
+        all_orders_response = client.get(
+            f'{api_url}/orders/?fields={fields}', headers=superuser_token
+        )
+        order_response = client.get(
+            f'{api_url}/orders/1?fields={fields}', headers=superuser_token
+        )
+        assert all_orders_response.status_code == 200
+        assert order_response.status_code == 200
+        assert len(all_orders_response.json()) == 3
+        assert all(set(order) == result_fields for order in all_orders_response.json())
+        assert set(order_response.json()) == result_fields
+
+    def test_get_orders_without_tables(self, client):
+        all_orders_response = client.get(
+            f'{api_url}/orders/?include=', headers=superuser_token
+        )
+        order_response = client.get(
+            f'{api_url}/orders/1?include=', headers=superuser_token
+        )
+        assert all_orders_response.status_code == 200
+        assert order_response.status_code == 200
+        assert all('tables' not in order for order in all_orders_response.json())
+        assert 'tables' not in order_response.json()
+        assert order_response.json()['id'] == 1
+
+    @pytest.mark.parametrize("ids, result_ids, missing_ids", [
+        ('3,1', [3, 1], []),
+        ('2,2,10', [2], [10])
+    ])
+    def test_get_orders_batch(self, ids, result_ids, missing_ids, client):
+        for token in superuser_token, admin_token:
+            response = client.get(
+                f'{api_url}/orders/batch?ids={ids}', headers=token
+            )
+            assert response.status_code == 200
+            assert [order['id'] for order in response.json()['items']] == result_ids
+            assert response.json()['missing_ids'] == missing_ids
+
+    def test_get_orders_changes(self, client):
+        first_page = client.get(
+            f'{api_url}/orders/changes?limit=2&fields=id', headers=superuser_token
+        ).json()
+        second_page = client.get(
+            f'{api_url}/orders/changes?since={first_page["cursor"]}&fields=id', headers=superuser_token
+        ).json()
+        assert first_page['items'] == [{'id': 1}, {'id': 2}]
+        assert first_page['has_more'] is True
+        assert second_page['items'] == [{'id': 3}]
+        assert second_page['has_more'] is False
+
+        client.delete(f'{api_url}/orders/1', headers=superuser_token)
+        client.patch(f'{api_url}/orders/2', json={'status': 'confirmed'}, headers=superuser_token)
+        changes = client.get(
+            f'{api_url}/orders/changes?since={second_page["cursor"]}&fields=id,status',
+            headers=superuser_token
+        ).json()
+        assert changes['items'] == [{'id': 2, 'status': 'confirmed'}]
+        assert changes['deleted_ids'] == [1]
+
+        nothing_changed = client.get(
+            f'{api_url}/orders/changes?since={changes["cursor"]}', headers=superuser_token
+        ).json()
+        assert nothing_changed == {'items': [], 'deleted_ids': [], 'cursor': changes['cursor'],
+                                   'has_more': False}
+
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_export_orders(self, token, client):
+        all_orders_response = client.get(
+            f'{api_url}/orders/', headers=token
+        )
+        export_response = client.get(
+            f'{api_url}/orders/export', headers=token
+        )
+        assert export_response.status_code == 200
+        assert 'application/x-ndjson' in export_response.headers['Content-Type']
+        assert [json.loads(line) for line in export_response.text.splitlines()] == all_orders_response.json()
+
     @pytest.mark.parametrize("start_dt, number_of_orders", [
         ("2022-08-03", 2),
         ("2022-08-03T15:00", 1),
@@ -235,6 +363,83 @@ class TestOrderViaSuperUserOrAdmin:
         assert main_response.json() == result_json
         assert len(before_post_response.json()) != len(after_post_response.json())
 
+    @pytest.mark.parametrize('token', [superuser_token, admin_token, confirmed_client_token])
+    def test_post_orders_bulk(self, token, client):
+        def make_order(start_datetime: str, end_datetime: str, tables: list[int]) -> dict:
+            return {'start_datetime': start_datetime, 'end_datetime': end_datetime, 'user_id': 1, 'tables': tables}
+
+        response = client.post(f'{api_url}/orders/bulk', json={'orders': [
+            make_order('2022-08-04T10:00', '2022-08-04T11:00', [1, 2]),
+            # overlaps the first order at table 2
+            make_order('2022-08-04T10:30', '2022-08-04T12:00', [2, 3]),
+            # overlaps the previous order, but it is not added
+            make_order('2022-08-04T11:30', '2022-08-04T12:00', [3]),
+            # already taken in db
+            make_order('2022-08-03T08:30', '2022-08-03T09:30', [5, 6]),
+            # outside the daily schedule
+            make_order('2022-08-15T14:00', '2022-08-15T22:00', [1]),
+            # wrong table id
+            make_order('2022-08-05T10:00', '2022-08-05T11:00', [1, 200]),
+            # no tables
+            {'start_datetime': '2022-08-05T10:00', 'end_datetime': '2022-08-05T11:00', 'user_id': 1}
+        ]}, headers=token)
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json()['created'] == 2
+        assert response.json()['results'][:6] == [
+            {'status_code': 201, 'id': 4, 'message': get_text('post').format('order', 4)},
+            {'status_code': 400, 'id': None,
+             'message': get_text('order_err_busy_time_in_request').format([2], 0)},
+            {'status_code': 201, 'id': 5, 'message': get_text('post').format('order', 5)},
+            {'status_code': 400, 'id': None, 'message': get_text('order_err_busy_time').format([6])},
+            {'status_code': 400, 'id': None,
+             'message': get_text('time_out_of_schedule').format('2022-08-15T08:00:00 - 2022-08-15T17:00:00')},
+            {'status_code': 404, 'id': None, 'message': get_text('not_found').format('table', 200)}
+        ]
+        assert response.json()['results'][6]['status_code'] == 422
+
+        response = client.get(f'{api_url}/orders/4', headers=superuser_token)
+        assert [table['id'] for table in response.json()['tables']] == [1, 2]
+        response = client.get(f'{api_url}/orders/?fields=id&start_datetime=2022-08-04', headers=superuser_token)
+        assert response.json() == [{'id': 4}, {'id': 5}]
+
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_patch_orders_bulk(self, token, client):
+        # dry run
+        response = client.patch(f'{api_url}/orders/bulk?status=processing&dry_run=true',
+                                json={'status': 'confirmed'}, headers=token)
+        assert response.status_code == 200
+        assert response.json() == {'count': 1, 'ids': None, 'dry_run': True}
+
+        response = client.patch(f'{api_url}/orders/bulk?status=processing',
+                                json={'status': 'confirmed'}, headers=token)
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json() == {'count': 1, 'ids': [1], 'dry_run': False}
+
+        response = client.patch(f'{api_url}/orders/bulk?ids=1,2,100&tables=1',
+                                json={'cost': 5000}, headers=token)
+        assert response.json() == {'count': 1, 'ids': [2], 'dry_run': False}
+
+        response = client.get(f'{api_url}/orders/?fields=id,status,cost', headers=token)
+        assert response.json() == [{'id': 3, 'status': 'confirmed', 'cost': 26000.0},
+                                   {'id': 1, 'status': 'confirmed', 'cost': 15000.0},
+                                   {'id': 2, 'status': 'confirmed', 'cost': 5000.0}]
+
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_delete_orders_bulk(self, token, client):
+        response = client.delete(f'{api_url}/orders/bulk?ids=1,2,3&dry_run=true', headers=token)
+        assert response.status_code == 200
+        assert response.json() == {'count': 3, 'ids': None, 'dry_run': True}
+
+        response = client.delete(f'{api_url}/orders/bulk?start_datetime=2022-08-03', headers=token)
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json() == {'count': 2, 'ids': [1, 2], 'dry_run': False}
+
+        response = client.get(f'{api_url}/orders/?fields=id', headers=token)
+        assert response.json() == [{'id': 3}]
+
 
 class TestOrderViaConfirmedUser:
     # GET
@@ -246,6 +451,16 @@ class TestOrderViaConfirmedUser:
         assert 'application/json' in response.headers['Content-Type']
         assert len(response.json()) == 1
 
+    def test_get_all_orders_with_totals(self, client):
+        # Client orders are always filtered by the user id, so they are counted exactly.
+        response = client.get(
+            f'{api_url}/orders/?with=count,sum_cost', headers=confirmed_client_token
+        )
+        assert response.status_code == 200
+        assert response.headers['X-Total-Count'] == '1'
+        assert response.headers['X-Total-Count-Type'] == 'exact'
+        assert response.headers['X-Total-Sum-Cost'] == '7000.0'
+
     @pytest.mark.parametrize("order_id, result_order_id", [
         (1, None),
         (2, 2),
@@ -266,6 +481,21 @@ class TestOrderViaConfirmedUser:
 
             assert response_without_tables == data_to_compare
 
+    def test_get_orders_batch(self, client):
+        response = client.get(
+            f'{api_url}/orders/batch?ids=1,2,3', headers=confirmed_client_token
+        )
+        assert response.status_code == 200
+        assert [order['id'] for order in response.json()['items']] == [2]
+        assert response.json()['missing_ids'] == [1, 3]
+
+    def test_get_orders_changes(self, client):
+        response = client.get(
+            f'{api_url}/orders/changes?fields=id', headers=confirmed_client_token
+        )
+        assert response.status_code == 200
+        assert response.json()['items'] == [{'id': 2}]
+
     @pytest.mark.parametrize("start_dt, number_of_orders", [
         ("2022-08-03", 1),
         ("2022-08-03T08:00", 1),
@@ -438,6 +668,22 @@ class TestOrderViaConfirmedUser:
         assert main_response.json() == result_json
         assert len(before_post_response.json()) != len(after_post_response.json())
 
+    def test_patch_orders_bulk(self, client):
+        # 'status', 'cost' and 'user_id' cannot be changed by the client.
+        response = client.patch(f'{api_url}/orders/bulk?ids=1,2',
+                                json={'status': 'processing', 'user_id': 1}, headers=confirmed_client_token)
+        assert response.status_code == 400
+        assert response.json() == {'message': get_text('err_patch_no_data')}
+
+    def test_delete_orders_bulk(self, client):
+        # Only the client's orders are deleted.
+        response = client.delete(f'{api_url}/orders/bulk?ids=1,2,3', headers=confirmed_client_token)
+        assert response.status_code == 200
+        assert response.json() == {'count': 1, 'ids': [2], 'dry_run': False}
+
+        response = client.get(f'{api_url}/orders/?fields=id', headers=superuser_token)
+        assert response.json() == [{'id': 3}, {'id': 1}]
+
 
 class TestOrderException:
     # PATCH
@@ -674,6 +920,29 @@ class TestOrderException:
             assert response.json() == result_json
 
 
+    @pytest.mark.parametrize("json_to_send", [
+        # no orders
+        {'orders': []},
+        # not a list
+        {'orders': {'start_datetime': '2022-08-05T10:00'}}
+    ])
+    def test_post_wrong_orders_bulk(self, json_to_send, client):
+        response = client.post(
+            f'{api_url}/orders/bulk', json=json_to_send, headers=superuser_token
+        )
+        assert response.status_code == 422
+
+    def test_change_orders_bulk_without_condition(self, client):
+        # All orders are never changed by mistake.
+        responses: tuple = (
+            client.patch(f'{api_url}/orders/bulk', json={'status': 'confirmed'}, headers=superuser_token),
+            client.delete(f'{api_url}/orders/bulk?dry_run=true', headers=superuser_token)
+        )
+        for response in responses:
+            assert response.status_code == 400
+            assert response.json() == {'message': get_text('err_bulk_no_condition')}
+
+
 class TestOtherException:
     @pytest.mark.parametrize("json_to_send", [
         {
@@ -695,6 +964,25 @@ class TestOtherException:
             assert 'application/json' in response.headers['Content-Type']
             assert response.json()['message'] == get_text('not_found').format('order', 1)
 
+    def test_export_orders_by_client(self, client):
+        response = client.get(
+            f'{api_url}/orders/export', headers=confirmed_client_token
+        )
+        assert response.status_code == 403
+        assert response.json()['message'] == get_text('forbidden_request')
+
+    @pytest.mark.parametrize("method, url", [
+        ('post', '/orders/export/jobs'),
+        ('get', '/orders/export/jobs/8e094a62-ca7e-4bc9-80b2-2f8a1f79ea97'),
+        ('get', '/orders/export/jobs/8e094a62-ca7e-4bc9-80b2-2f8a1f79ea97/file')
+    ])
+    def test_export_jobs_by_client(self, method, url, client):
+        response = getattr(client, method)(
+            f'{api_url}{url}', headers=confirmed_client_token
+        )
+        assert response.status_code == 403
+        assert response.json()['message'] == get_text('forbidden_request')
+
     @pytest.mark.parametrize("json_to_send_patch, json_to_send_post", [
         (
                 {
@@ -0,0 +1,123 @@
+import pytest
+
+from tests.functional_tests.conftest import (api_url,
+                                             superuser_token,
+                                             admin_token,
+                                             confirmed_client_token)
+
+from src.api.crud_operations.report import ReportOperation
+from src.utils.response_generation.main import get_text
+
+
+@pytest.fixture(scope='function')
+def refreshed_client(client, db_session):
+    # The views are created before the test data is inserted.
+    ReportOperation(db=db_session).refresh_views()
+    return client
+
+
+class TestReport:
+    # GET
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_get_table_revenue(self, token, refreshed_client):
+        response = refreshed_client.get(f'{api_url}/reports/revenue/tables/', headers=token)
+        assert response.status_code == 200
+        assert [(row['day'], row['table_id'], row['revenue']) for row in response.json()] == [
+            ('2022-03-08', 4, 4000), ('2022-03-08', 5, 7000), ('2022-03-08', 6, 15000),
+            ('2022-08-03', 1, 1500), ('2022-08-03', 2, 2500), ('2022-08-03', 3, 3000),
+            ('2022-08-03', 6, 15000)
+        ]
+
+    def test_get_table_revenue_by_params(self, refreshed_client):
+        response = refreshed_client.get(
+            f'{api_url}/reports/revenue/tables/?start_date=2022-08-01&type=vip_room', headers=admin_token
+        )
+        assert response.json() == [
+            {'day': '2022-08-03', 'table_id': 6, 'table_type': 'vip_room', 'bookings': 1, 'revenue': 15000}
+        ]
+
+    def test_get_type_revenue(self, refreshed_client):
+        response = refreshed_client.get(
+            f'{api_url}/reports/revenue/types/?start_date=2022-08-03&end_date=2022-08-03', headers=admin_token
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {'day': '2022-08-03', 'table_type': 'private', 'bookings': 1, 'revenue': 3000},
+            {'day': '2022-08-03', 'table_type': 'standard', 'bookings': 2, 'revenue': 4000},
+            {'day': '2022-08-03', 'table_type': 'vip_room', 'bookings': 1, 'revenue': 15000}
+        ]
+
+    def test_get_booked_hours(self, refreshed_client):
+        response = refreshed_client.get(f'{api_url}/reports/booked_hours/?table_id=6', headers=admin_token)
+        assert response.status_code == 200
+        assert response.json() == [
+            {'day': '2022-03-08', 'table_id': 6, 'bookings': 1, 'booked_hours': 1},
+            {'day': '2022-08-03', 'table_id': 6, 'bookings': 1, 'booked_hours': 2}
+        ]
+
+    def test_get_user_orders(self, refreshed_client):
+        response = refreshed_client.get(f'{api_url}/reports/users/', headers=admin_token)
+        assert response.status_code == 200
+        assert [(row['user_id'], row['orders'], row['confirmed_orders'], row['total_cost'])
+                for row in response.json()] == [(2, 1, 0, 15000), (3, 1, 1, 7000), (4, 1, 1, 26000)]
+
+        response = refreshed_client.get(f'{api_url}/reports/users/?user_id=4', headers=admin_token)
+        assert response.json() == [{'user_id': 4, 'orders': 1, 'confirmed_orders': 1, 'total_cost': 26000,
+                                    'first_order_at': '2022-03-08T15:00:00',
+                                    'last_order_at': '2022-03-08T15:00:00'}]
+
+    def test_get_occupancy(self, client):
+        response = client.get(
+            f'{api_url}/reports/occupancy/?start_date=2022-08-03&end_date=2022-08-03&type=vip_room',
+            headers=admin_token
+        )
+        assert response.status_code == 200
+        heatmap = response.json()
+        assert heatmap['table_ids'] == [5, 6]
+        assert heatmap['weekdays'][2] == 'Wednesday'
+        # Only wednesday is in the range, it is open from 8:00 to 16:00.
+        assert heatmap['opening_hours'][2] == [0] * 8 + [1] * 8 + [0] * 8
+        assert not any(any(hours) for weekday, hours in enumerate(heatmap['opening_hours']) if weekday != 2)
+        # Order 1 books table 6 from 8:00 to 9:59.
+        assert heatmap['booked_hours'][1][2][8:10] == [1, 0.98]
+        assert heatmap['occupancy'][1][2][8:10] == [1, 0.983]
+        assert sum(map(sum, heatmap['booked_hours'][0])) == 0
+        assert sum(map(sum, heatmap['booked_hours'][1])) == 1.98
+
+    def test_get_occupancy_by_date_schedule(self, client):
+        response = client.get(f'{api_url}/reports/occupancy/?start_date=2022-03-08&end_date=2022-03-08',
+                              headers=superuser_token)
+        heatmap = response.json()
+        # The schedule of this date is used instead of the tuesday schedule.
+        assert heatmap['opening_hours'][1] == [0] * 15 + [1] * 8 + [0]
+        assert heatmap['occupancy'][heatmap['table_ids'].index(4)][1][15] == 0.983
+
+    def test_views_are_stale_until_refreshed(self, refreshed_client):
+        response = refreshed_client.delete(f'{api_url}/orders/1', headers=admin_token)
+        assert response.status_code == 200
+
+        response = refreshed_client.get(f'{api_url}/reports/users/?user_id=2', headers=admin_token)
+        assert len(response.json()) == 1
+
+
+class TestReportException:
+    @pytest.mark.parametrize('path', ['revenue/tables/', 'revenue/types/', 'booked_hours/', 'users/',
+                                      'occupancy/?start_date=2022-08-03&end_date=2022-08-03'])
+    def test_forbidden_request(self, path, client):
+        response = client.get(f'{api_url}/reports/{path}', headers=confirmed_client_token)
+        assert response.status_code == 403
+        assert response.json()['message'] == get_text('forbidden_request')
+
+    @pytest.mark.parametrize('params', ['start_date=2022-08-03&end_date=2022-08-01',
+                                        'start_date=2020-01-01&end_date=2022-12-31'])
+    def test_get_occupancy_by_invalid_range(self, params, client):
+        response = client.get(f'{api_url}/reports/occupancy/?{params}', headers=admin_token)
+        assert response.status_code == 400
+
+    def test_get_occupancy_without_range(self, client):
+        response = client.get(f'{api_url}/reports/occupancy/?start_date=2022-08-03', headers=admin_token)
+        assert response.status_code == 422
+
+    def test_invalid_date(self, client):
+        response = client.get(f'{api_url}/reports/revenue/tables/?start_date=yesterday', headers=admin_token)
+        assert response.status_code == 422
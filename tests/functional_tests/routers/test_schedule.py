@@ -36,6 +36,49 @@ class TestSchedule:
             assert 'application/json' in response.headers['Content-Type']
             assert response_day == output_day
 
+    def test_get_schedules_batch(self, client):
+        response = client.get(
+            f'{api_url}/schedules/batch?ids=1,4,6,20&fields=day', headers=confirmed_client_token
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            'items': [{'day': 'Monday'}, {'day': 'Thursday'}, {'day': 'Saturday'}],
+            'missing_ids': [20]
+        }
+
+    def test_get_schedules_changes_with_invalid_cursor(self, client):
+        response = client.get(
+            f'{api_url}/schedules/changes?since=invalid_cursor', headers=confirmed_client_token
+        )
+        assert response.status_code == 400
+        assert response.json() == {'message': get_text('err_invalid_cursor')}
+
+    def test_conditional_get_all_schedules(self, client):
+        response = client.get(f'{api_url}/schedules/', headers=superuser_token)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+
+        response = client.get(
+            f'{api_url}/schedules/', headers={**superuser_token, 'If-None-Match': etag}
+        )
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert not response.content
+
+        response = client.get(
+            f'{api_url}/schedules/',
+            headers={**superuser_token, 'If-Modified-Since': response.headers['Last-Modified']}
+        )
+        assert response.status_code == 304
+
+        client.patch(f'{api_url}/schedules/1', json={"open_time": "07:00"}, headers=superuser_token)
+        response = client.get(
+            f'{api_url}/schedules/', headers={**superuser_token, 'If-None-Match': etag}
+        )
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(response.json()) == len(schedules_json)
+
     @pytest.mark.parametrize("day", ['Monday', 'Wednesday', 'Friday'])
     def test_get_by_day(self, day, client):
         for token in superuser_token, admin_token, confirmed_client_token:
@@ -38,6 +38,35 @@ class TestTable:
                     assert status is not None
                     assert user_id is not None
 
+    @pytest.mark.parametrize("include, with_orders", [
+        ('', False),
+        ('orders', True)
+    ])
+    def test_get_tables_with_include(self, include, with_orders, client):
+        for token in superuser_token, admin_token, confirmed_client_token:
+            all_tables_response = client.get(
+                f'{api_url}/tables/?include={include}', headers=token
+            )
+            table_response = client.get(
+                f'{api_url}/tables/1?include={include}', headers=token
+            )
+            assert all_tables_response.status_code == 200
+            assert table_response.status_code == 200
+            assert len(all_tables_response.json()) == len(tables_json)
+            assert all(('orders' in table) is with_orders for table in all_tables_response.json())
+            assert ('orders' in table_response.json()) is with_orders
+
+    def test_get_tables_batch(self, client):
+        for token in superuser_token, admin_token, confirmed_client_token:
+            response = client.get(
+                f'{api_url}/tables/batch?ids=6,1,100&fields=id,number_of_seats', headers=token
+            )
+            assert response.status_code == 200
+            assert response.json() == {
+                'items': [{'id': 6, 'number_of_seats': 15}, {'id': 1, 'number_of_seats': 6}],
+                'missing_ids': [100]
+            }
+
     @pytest.mark.parametrize("table_id, number_of_seats", [
         (1, 6),
         (4, 3),
@@ -165,6 +194,20 @@ class TestTable:
         assert 'application/json' in response.headers['Content-Type']
         assert response_msg == get_text('delete').format('table', 6)
 
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_delete_tables_bulk(self, token, client):
+        response = client.delete(f'{api_url}/tables/bulk?type=vip_room&dry_run=true', headers=token)
+        assert response.status_code == 200
+        assert response.json() == {'count': 2, 'ids': None, 'dry_run': True}
+
+        response = client.delete(f'{api_url}/tables/bulk?type=vip_room&number_of_seats=6', headers=token)
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json() == {'count': 1, 'ids': [5], 'dry_run': False}
+
+        response = client.get(f'{api_url}/tables/?type=vip_room&fields=id', headers=token)
+        assert response.json() == [{'id': 6}]
+
     # PATCH
     @pytest.mark.parametrize("table_id, json_to_send, result_json, token", [
         (
@@ -193,6 +236,17 @@ class TestTable:
         assert response.status_code == 200
         assert 'application/json' in response.headers['Content-Type']
         assert response.json() == result_json
+
+    @pytest.mark.parametrize('token', [superuser_token, admin_token])
+    def test_patch_tables_bulk(self, token, client):
+        response = client.patch(f'{api_url}/tables/bulk?type=vip_room',
+                                json={'price_per_hour': 20000}, headers=token)
+        assert response.status_code == 200
+        assert 'application/json' in response.headers['Content-Type']
+        assert response.json() == {'count': 2, 'ids': [5, 6], 'dry_run': False}
+
+        response = client.get(f'{api_url}/tables/?type=vip_room&fields=id,price_per_hour', headers=token)
+        assert response.json() == [{'id': 5, 'price_per_hour': 20000.0}, {'id': 6, 'price_per_hour': 20000.0}]
         
     # POST
     @pytest.mark.parametrize("json_to_send, result_json, token", [
@@ -249,7 +303,14 @@ class TestTableException:
         response_post = client.post(
             f'{api_url}/tables/create', json=post_json_to_send, headers=confirmed_client_token
         )
-        responses: tuple = (response_delete, response_patch, response_post)
+        response_delete_bulk = client.delete(
+            f'{api_url}/tables/bulk?ids=1', headers=confirmed_client_token
+        )
+        response_patch_bulk = client.patch(
+            f'{api_url}/tables/bulk?ids=1', json=patch_json_to_send, headers=confirmed_client_token
+        )
+        responses: tuple = (response_delete, response_patch, response_post,
+                            response_delete_bulk, response_patch_bulk)
         for response in responses:
             assert response.status_code == 403
             assert 'application/json' in response.headers['Content-Type']
@@ -53,6 +53,64 @@ class TestUser:
         assert 'application/json' in response.headers['Content-Type']
         assert len(response.json()) == number_of_users
 
+    @pytest.mark.parametrize("fields, result_fields", [
+        ('id,username', {'id', 'username'}),
+        ('email, phone,id', {'id', 'email', 'phone'})
+    ])
+    def test_get_users_with_fields(self, fields, result_fields, client):
+        all_users_response = client.get(
+            f'{api_url}/users/?fields={fields}', headers=superuser_token
+        )
+        user_response = client.get(
+            f'{api_url}/users/1?fields={fields}', headers=superuser_token
+        )
+        assert all_users_response.status_code == 200
+        assert user_response.status_code == 200
+        assert all(set(user) == result_fields for user in all_users_response.json())
+        assert set(user_response.json()) == result_fields
+
+    def test_get_users_with_order_stats(self, client):
+        response = client.get(f'{api_url}/users/?fields=id&include=order_stats', headers=superuser_token)
+        assert response.status_code == 200
+        assert response.json()[:4] == [
+            {'id': 1, 'order_stats': None},
+            {'id': 2, 'order_stats': {'orders_count': 1, 'total_spent': 15000,
+                                      'last_order_at': '2022-08-03T08:00:00'}},
+            {'id': 3, 'order_stats': {'orders_count': 1, 'total_spent': 7000,
+                                      'last_order_at': '2022-08-03T15:00:00'}},
+            {'id': 4, 'order_stats': {'orders_count': 1, 'total_spent': 26000,
+                                      'last_order_at': '2022-03-08T15:00:00'}}
+        ]
+
+        # The order stats are not returned by default.
+        response = client.get(f'{api_url}/users/?fields=id,order_stats', headers=superuser_token)
+        assert response.json()[0] == {'id': 1}
+
+    def test_get_users_batch(self, client):
+        response = client.get(
+            f'{api_url}/users/batch?ids=2,1,7&fields=id,username', headers=superuser_token
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            'items': [{'id': 2, 'username': 'admin'}, {'id': 1, 'username': 'superuser'}],
+            'missing_ids': [7]
+        }
+
+    def test_get_users_changes_after_delete(self, client):
+        cursor = client.get(f'{api_url}/users/changes', headers=superuser_token).json()['cursor']
+        client.delete(f'{api_url}/users/4', headers=superuser_token)
+
+        users_changes = client.get(
+            f'{api_url}/users/changes?since={cursor}', headers=superuser_token
+        ).json()
+        orders_changes = client.get(
+            f'{api_url}/orders/changes?fields=id', headers=superuser_token
+        ).json()
+        assert users_changes['items'] == []
+        assert users_changes['deleted_ids'] == [4]
+        # The user's orders are deleted with the user.
+        assert orders_changes['deleted_ids'] == [3]
+
     # DELETE
     def test_delete_user_by_id(self, client):
         response = client.delete(
@@ -107,6 +165,25 @@ class TestUser:
 
 
 class TestUserException:
+    def test_get_users_with_unknown_fields(self, client):
+        response = client.get(
+            f'{api_url}/users/?fields=id,hashed_password', headers=superuser_token
+        )
+        assert response.status_code == 400
+        assert response.json() == {
+            'message': get_text('err_unknown_fields').format(
+                'hashed_password', 'username, email, phone, role, id, status, order_stats'
+            )
+        }
+
+    def test_get_users_batch_with_too_many_ids(self, client):
+        ids = ','.join(str(id_) for id_ in range(1, 102))
+        response = client.get(
+            f'{api_url}/users/batch?ids={ids}', headers=superuser_token
+        )
+        assert response.status_code == 400
+        assert response.json() == {'message': get_text('err_too_many_ids').format(100)}
+
     @pytest.mark.parametrize("user_id, json_to_send, result_json, status", [
         # give existent username
         pytest.param(
@@ -0,0 +1,37 @@
+from datetime import datetime as dt
+
+from sqlalchemy import select
+
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import OrderModel
+from src.utils.archiving.main import archive_orders
+from tests.functional_tests.conftest import api_url, superuser_token
+
+
+class TestArchiving:
+    def test_archive_orders(self, db_session):
+        # Order 3 starts in March, orders 1 and 2 start in August.
+        assert archive_orders(db_session, before=dt(2022, 8, 1), batch_size=1) == 1
+
+        assert db_session.execute(select(orders_archive.c.id)).scalars().all() == [3]
+        assert db_session.execute(
+            select(orders_tables_archive.c.table_id).order_by(orders_tables_archive.c.table_id)
+        ).scalars().all() == [4, 5, 6]
+        assert db_session.query(OrderModel.id).order_by(OrderModel.id).all() == [(1,), (2,)]
+
+    def test_get_archived_orders(self, db_session, client):
+        archive_orders(db_session, before=dt(2022, 8, 1), batch_size=100)
+
+        # The range reaches the archive.
+        response = client.get(f'{api_url}/orders/?fields=id,tables&start_datetime=2022-03-08',
+                              headers=superuser_token)
+        assert response.status_code == 200
+        assert [(order['id'], [table['id'] for table in order['tables']]) for order in response.json()] == [
+            (3, [4, 5, 6]), (1, [6]), (2, [1, 2, 3])
+        ]
+        response = client.get(f'{api_url}/orders/?fields=id&tables=4', headers=superuser_token)
+        assert response.json() == [{'id': 3}]
+
+        # The range starts after the archived orders.
+        response = client.get(f'{api_url}/orders/?fields=id&start_datetime=2022-08-01', headers=superuser_token)
+        assert response.json() == [{'id': 1}, {'id': 2}]
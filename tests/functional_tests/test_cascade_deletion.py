@@ -0,0 +1,84 @@
+from datetime import datetime as dt
+
+from sqlalchemy import func, insert, select, update
+
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+from src.api.models.user import UserModel
+from src.utils.cascade_deletion.main import cascade_deletion
+from tests.functional_tests.conftest import api_url, superuser_token
+
+orders = OrderModel.__table__
+
+
+def find_table_ids(db_session) -> list[int]:
+    return sorted(db_session.execute(select(orders_tables.c.table_id).distinct()).scalars().all())
+
+
+class TestCascadeDeletion:
+    def test_cascade_user_deletion(self, db_session):
+        db_session.execute(insert(OrderModel), [
+            {'id': 4, 'start_datetime': dt(2022, 9, 1, 10), 'end_datetime': dt(2022, 9, 1, 11),
+             'status': 'processing', 'cost': 3000, 'user_id': 3},
+            {'id': 5, 'start_datetime': dt(2022, 1, 1, 10), 'end_datetime': dt(2022, 1, 1, 11),
+             'status': 'processing', 'cost': 1000, 'user_id': 3}
+        ])
+        # Not deleted users are skipped.
+        assert cascade_deletion(db_session, 'users', [3], batch_size=1) == 0
+
+        db_session.execute(update(UserModel.__table__).where(UserModel.id == 3).values(deleted_at=func.now()))
+        progress: list[int] = []
+        assert cascade_deletion(db_session, 'users', [3], batch_size=1, on_progress=progress.append) == 3
+        assert progress == [1, 2, 3, 3]
+
+        # The orders get the deletion time of the user.
+        user_deleted_at: dt = db_session.execute(
+            select(UserModel.__table__.c.deleted_at).where(UserModel.id == 3)
+        ).scalar()
+        assert db_session.execute(
+            select(orders.c.id, orders.c.deleted_at).where(orders.c.user_id == 3).order_by(orders.c.id)
+        ).all() == [(2, user_deleted_at), (4, user_deleted_at), (5, user_deleted_at)]
+        assert db_session.query(OrderModel.id).order_by(OrderModel.id).all() == [(1,), (3,)]
+
+    def test_cascade_table_deletion(self, db_session):
+        db_session.execute(update(TableModel.__table__)
+                           .where(TableModel.id.in_([4, 5]))
+                           .values(deleted_at=func.now()))
+
+        # Order tables of all deleted tables.
+        assert cascade_deletion(db_session, 'tables', None, batch_size=10) == 2
+        assert find_table_ids(db_session) == [1, 2, 3, 6]
+
+    def test_cascade_table_deletion_updates_orders(self, db_session):
+        # Tables 4 and 6 cost 4000 and 15000 per hour.
+        db_session.execute(insert(OrderModel), [
+            {'id': 4, 'start_datetime': dt(2030, 1, 1, 10), 'end_datetime': dt(2030, 1, 1, 11, 59, 59),
+             'status': 'processing', 'cost': 38000, 'user_id': 3}
+        ])
+        db_session.execute(insert(orders_tables), [
+            {'order_id': 4, 'table_id': 4, 'start_datetime': dt(2030, 1, 1, 10)},
+            {'order_id': 4, 'table_id': 6, 'start_datetime': dt(2030, 1, 1, 10)}
+        ])
+        db_session.execute(update(orders).values(updated_at=dt(2022, 1, 1)))
+        db_session.execute(update(TableModel.__table__).where(TableModel.id == 4).values(deleted_at=func.now()))
+
+        assert cascade_deletion(db_session, 'tables', [4], batch_size=10) == 2
+        # Orders of the deleted table are updated, the past order keeps its cost.
+        assert db_session.execute(
+            select(orders.c.id, orders.c.cost, orders.c.updated_at > dt(2022, 1, 1)).order_by(orders.c.id)
+        ).all() == [(1, 15000, False), (2, 7000, False), (3, 26000, True), (4, 30000, True)]
+
+    def test_delete_table(self, db_session, client):
+        response = client.delete(f'{api_url}/tables/6', headers=superuser_token)
+        assert response.status_code == 200
+        assert find_table_ids(db_session) == [1, 2, 3, 4, 5]
+
+        response = client.delete(f'{api_url}/tables/bulk?ids=1,2', headers=superuser_token)
+        assert response.status_code == 200
+        assert find_table_ids(db_session) == [3, 4, 5]
+
+        response = client.get(f'{api_url}/orders/?fields=id,tables', headers=superuser_token)
+        assert [(order['id'], [table['id'] for table in order['tables']]) for order in response.json()] == [
+            (3, [4, 5]), (1, []), (2, [3])
+        ]
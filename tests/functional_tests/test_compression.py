@@ -0,0 +1,47 @@
+import json
+
+from src.config import get_settings
+from tests.functional_tests.conftest import api_url, superuser_token
+
+settings = get_settings()
+
+
+class TestCompression:
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get(f'{api_url}/tables/1', headers={**superuser_token, 'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert len(response.content) < settings.COMPRESSION_MINIMUM_SIZE
+        assert 'content-encoding' not in response.headers
+        assert not response.headers['ETag'].endswith('-gzip"')
+
+    def test_compressed_response(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'COMPRESSION_MINIMUM_SIZE', 0)
+
+        response = client.get(f'{api_url}/tables/1', headers={**superuser_token, 'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.json()['id'] == 1
+        gzip_etag: str = response.headers['ETag']
+        assert gzip_etag.endswith('-gzip"')
+
+        # The compressed representation is validated by its own ETag.
+        response = client.get(f'{api_url}/tables/1',
+                              headers={**superuser_token, 'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == gzip_etag
+
+        # 'q=0' rejects the encoding, the uncompressed representation has the ETag without the encoding.
+        response = client.get(f'{api_url}/tables/1', headers={**superuser_token, 'Accept-Encoding': 'gzip;q=0'})
+        assert response.status_code == 200
+        assert 'content-encoding' not in response.headers
+        assert response.headers['ETag'] == gzip_etag.removesuffix('-gzip"') + '"'
+
+    def test_compressed_export_stream(self, client):
+        all_orders_response = client.get(f'{api_url}/orders/', headers=superuser_token)
+        # The stream is compressed by chunks, so its size is unknown.
+        response = client.get(f'{api_url}/orders/export', headers={**superuser_token, 'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'content-length' not in response.headers
+        assert [json.loads(line) for line in response.text.splitlines()] == all_orders_response.json()
@@ -0,0 +1,86 @@
+from datetime import datetime as dt
+
+from sqlalchemy import insert, select, update
+
+from src.api.models.order import OrderModel
+from src.api.models.user_order_stats import UserOrderStatsModel
+from src.utils.archiving.main import archive_orders
+from src.utils.order_stats.main import find_drifted_user_ids, rebuild_user_order_stats
+from tests.functional_tests.conftest import api_url, superuser_token
+
+user_order_stats = UserOrderStatsModel.__table__
+
+
+def find_stats(db_session) -> dict[int, tuple]:
+    rows = db_session.execute(select(user_order_stats).order_by(user_order_stats.c.user_id)).all()
+    return {row.user_id: (row.orders_count, row.total_spent, row.last_order_at) for row in rows}
+
+
+class TestOrderStats:
+    def test_stats_of_inserted_orders(self, db_session):
+        assert find_stats(db_session) == {
+            2: (1, 15000, dt(2022, 8, 3, 8)),
+            3: (1, 7000, dt(2022, 8, 3, 15)),
+            4: (1, 26000, dt(2022, 3, 8, 15))
+        }
+
+        db_session.execute(insert(OrderModel), [
+            {'id': 4, 'start_datetime': dt(2022, 9, 1, 10), 'end_datetime': dt(2022, 9, 1, 11),
+             'status': 'processing', 'cost': 3000, 'user_id': 3},
+            {'id': 5, 'start_datetime': dt(2022, 1, 1, 10), 'end_datetime': dt(2022, 1, 1, 11),
+             'status': 'processing', 'cost': 1000, 'user_id': 3}
+        ])
+        assert find_stats(db_session)[3] == (3, 11000, dt(2022, 9, 1, 10))
+
+    def test_stats_of_changed_orders(self, db_session, client):
+        response = client.patch(f'{api_url}/orders/2', json={'cost': 9000}, headers=superuser_token)
+        assert response.status_code == 200
+        assert find_stats(db_session)[3] == (1, 9000, dt(2022, 8, 3, 15))
+
+        # The order is moved to another user.
+        response = client.patch(f'{api_url}/orders/2', json={'user_id': 4}, headers=superuser_token)
+        assert response.status_code == 200
+        stats = find_stats(db_session)
+        assert stats[4] == (2, 35000, dt(2022, 8, 3, 15))
+        assert 3 not in stats
+
+    def test_stats_of_deleted_orders(self, db_session, client):
+        db_session.execute(insert(OrderModel), [
+            {'id': 4, 'start_datetime': dt(2022, 1, 1, 10), 'end_datetime': dt(2022, 1, 1, 11),
+             'status': 'processing', 'cost': 1000, 'user_id': 3}
+        ])
+        # The last order is deleted, so the previous one becomes the last.
+        response = client.delete(f'{api_url}/orders/2', headers=superuser_token)
+        assert response.status_code == 200
+        assert find_stats(db_session)[3] == (1, 1000, dt(2022, 1, 1, 10))
+
+        # Bulk delete and the deletion of the user.
+        response = client.delete(f'{api_url}/orders/bulk?ids=1', headers=superuser_token)
+        assert response.status_code == 200
+        response = client.delete(f'{api_url}/users/3', headers=superuser_token)
+        assert response.status_code == 200
+        assert find_stats(db_session) == {4: (1, 26000, dt(2022, 3, 8, 15))}
+
+    def test_stats_of_archived_orders(self, db_session):
+        stats: dict[int, tuple] = find_stats(db_session)
+        assert archive_orders(db_session, before=dt(2022, 8, 1), batch_size=100) == 1
+        assert find_stats(db_session) == stats
+
+    def test_repair_drifted_stats(self, db_session):
+        stats: dict[int, tuple] = find_stats(db_session)
+        db_session.execute(update(user_order_stats)
+                           .where(user_order_stats.c.user_id == 3)
+                           .values(orders_count=10))
+        db_session.execute(user_order_stats.delete().where(user_order_stats.c.user_id == 4))
+        assert find_drifted_user_ids(db_session) == [3, 4]
+
+        assert rebuild_user_order_stats(db_session, [3, 4]) == 2
+        assert find_drifted_user_ids(db_session) == []
+        assert find_stats(db_session) == stats
+
+    def test_rebuild_stats(self, db_session):
+        stats: dict[int, tuple] = find_stats(db_session)
+        db_session.execute(user_order_stats.delete())
+
+        assert rebuild_user_order_stats(db_session) == 3
+        assert find_stats(db_session) == stats
@@ -0,0 +1,24 @@
+from datetime import date
+
+from src.utils.partitioning.main import create_partitions, detach_partitions, find_partitions
+
+
+class TestPartitioning:
+    def test_create_partitions(self, db_session):
+        created_partitions = create_partitions(db_session, date(2027, 7, 15), date(2027, 8, 1))
+        assert created_partitions == ['orders_y2027m07', 'orders_y2027m08',
+                                      'orders_tables_y2027m07', 'orders_tables_y2027m08']
+        # The existing partitions are skipped.
+        assert create_partitions(db_session, date(2027, 8, 1), date(2027, 9, 1)) == ['orders_y2027m09',
+                                                                                    'orders_tables_y2027m09']
+
+    def test_create_partitions_of_months_in_default_partition(self, db_session):
+        # The test orders of August 2022 are in the default partitions.
+        assert create_partitions(db_session, date(2022, 8, 1), date(2022, 9, 1)) == ['orders_y2022m09',
+                                                                                    'orders_tables_y2022m09']
+
+    def test_detach_partitions(self, db_session):
+        create_partitions(db_session, date(2027, 7, 1), date(2027, 8, 1))
+        assert detach_partitions(db_session, date(2027, 8, 1)) == ['orders_tables_y2027m07', 'orders_y2027m07']
+        assert find_partitions(db_session, 'orders') == ['orders_default', 'orders_y2027m08']
+        assert find_partitions(db_session, 'orders_tables') == ['orders_tables_default', 'orders_tables_y2027m08']
@@ -0,0 +1,61 @@
+from datetime import datetime as dt
+
+from sqlalchemy import select, update
+
+from src.api.models.archive import orders_archive, orders_tables_archive
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.table import TableModel
+from src.api.models.user import UserModel
+from src.utils.archiving.main import archive_orders
+from src.utils.purging.main import purge_deleted_rows
+from tests.functional_tests.conftest import api_url, superuser_token
+
+orders = OrderModel.__table__
+tables = TableModel.__table__
+users = UserModel.__table__
+NOTHING_PURGED: dict[str, int] = {'orders': 0, 'orders_archive': 0, 'users': 0, 'tables': 0, 'schedules': 0}
+
+
+def mark_deleted(db_session, table, ids: list[int], deleted_at: dt = dt(2022, 1, 1)):
+    db_session.execute(update(table).where(table.c.id.in_(ids)).values(deleted_at=deleted_at))
+
+
+class TestPurging:
+    def test_purge_deleted_rows(self, db_session):
+        # Order 3 of user 4 has tables 4, 5 and 6, table 6 is booked by order 1 too.
+        mark_deleted(db_session, orders, [3])
+        mark_deleted(db_session, users, [4])
+        mark_deleted(db_session, tables, [5, 6])
+        progress: list[tuple[str, int]] = []
+
+        assert purge_deleted_rows(db_session, before=dt(2023, 1, 1), batch_size=1,
+                                  on_progress=lambda table_name, rows: progress.append((table_name, rows))) == {
+            **NOTHING_PURGED, 'orders': 1, 'users': 1, 'tables': 1
+        }
+        assert progress == [('orders', 1), ('orders', 1), ('orders_archive', 0), ('users', 1), ('users', 1),
+                            ('tables', 1), ('tables', 1), ('schedules', 0)]
+
+        assert db_session.execute(select(orders.c.id).order_by(orders.c.id)).scalars().all() == [1, 2]
+        assert db_session.execute(
+            select(orders_tables.c.table_id).order_by(orders_tables.c.table_id)
+        ).scalars().all() == [1, 2, 3, 6]
+        assert db_session.execute(select(users.c.id).where(users.c.id == 4)).scalar() is None
+        # Table 6 is kept for order 1.
+        assert db_session.execute(select(tables.c.id).where(tables.c.id.in_([5, 6]))).scalars().all() == [6]
+
+    def test_keep_recently_deleted_rows(self, db_session, client):
+        response = client.delete(f'{api_url}/users/4', headers=superuser_token)
+        assert response.status_code == 200
+
+        assert purge_deleted_rows(db_session, before=dt(2023, 1, 1), batch_size=10) == NOTHING_PURGED
+        assert db_session.execute(select(orders.c.deleted_at).where(orders.c.id == 3)).scalar() is not None
+
+    def test_purge_deleted_archived_orders(self, db_session):
+        archive_orders(db_session, before=dt(2022, 8, 1), batch_size=100)
+        mark_deleted(db_session, orders_archive, [3])
+
+        assert purge_deleted_rows(db_session, before=dt(2023, 1, 1), batch_size=10) == {
+            **NOTHING_PURGED, 'orders_archive': 1
+        }
+        assert db_session.execute(select(orders_tables_archive.c.id)).scalars().all() == []
@@ -0,0 +1,118 @@
+import re
+from datetime import date, datetime as dt
+
+import pytest
+from sqlalchemy import and_, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from src.api.models.change_tracking import exclude_deleted_rows
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.api.models.user import UserModel
+from src.api.crud_operations.order import OrderOperation
+from src.api.crud_operations.table import TableOperation
+from src.utils.partitioning.main import create_partitions
+
+
+def explain(db_session: Session, query: Query) -> str:
+    """
+    Returns the query plan as text.
+    Deleted rows are excluded like in the executed queries,
+    so the partial indexes of the not deleted rows can be used.
+    """
+    compiled = exclude_deleted_rows(query.statement).compile(dialect=postgresql.dialect(),
+                                                             compile_kwargs={'render_postcompile': True})
+    rows = db_session.connection().exec_driver_sql(f'EXPLAIN {compiled}', compiled.params).all()
+    return '\n'.join(row[0] for row in rows)
+
+
+def uses_index(db_session: Session, plan: str, index_name: str) -> bool:
+    """
+    Checks that the plan uses the index.
+    Orders are partitioned, so the plan shows the indexes of the partitions instead.
+    """
+    partition_indexes: list[str] = db_session.execute(text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE parent.relname = :index_name'
+    ), {'index_name': index_name}).scalars().all()
+    return any(re.search(rf'\b{name}\b', plan) for name in [index_name, *partition_indexes])
+
+
+@pytest.fixture(scope='function')
+def db(db_session):
+    # The test tables are tiny, so the planner would scan them sequentially anyway.
+    # Sequential scans are made too expensive to check that the indexes can be used.
+    db_session.execute(text('SET LOCAL enable_seqscan = off'))
+    return db_session
+
+
+class TestQueryPlans:
+    def test_client_orders(self, db):
+        client = UserModel(id=3, role='client')
+        query = OrderOperation(db=db, user=client)._make_query_by_params()
+        assert uses_index(db, explain(db, query), 'ix_orders_user_id_start_datetime')
+
+    def test_orders_by_past_time_range(self, db):
+        query = OrderOperation(db=db, user=None)._make_query_by_params(
+            start_datetime=dt(2022, 8, 3, 8), end_datetime=dt(2022, 8, 3, 17)
+        )
+        assert uses_index(db, explain(db, query), 'ix_orders_start_datetime_end_datetime')
+
+    def test_orders_by_future_time_range(self, db):
+        # Booking checks of the future orders use the same index as any time range.
+        query = OrderOperation(db=db, user=None)._make_query_by_params(
+            start_datetime=dt(2027, 8, 3, 8), end_datetime=dt(2027, 8, 3, 17)
+        )
+        assert uses_index(db, explain(db, query), 'ix_orders_start_datetime_end_datetime')
+
+    def test_orders_of_tables(self, db):
+        # The same query as the booking time of the tables in the bulk order creation.
+        query = (db
+                 .query(orders_tables.c.table_id, OrderModel.start_datetime, OrderModel.end_datetime)
+                 .join(OrderModel, and_(OrderModel.id == orders_tables.c.order_id,
+                                        OrderModel.start_datetime == orders_tables.c.start_datetime))
+                 .filter(orders_tables.c.table_id.in_([1, 2, 3])))
+        assert uses_index(db, explain(db, query), 'ix_orders_tables_table_id_order_id')
+
+    def test_tables_of_orders(self, db):
+        # The same query as the nested tables of the orders list.
+        query = db.query(orders_tables.c.order_id, orders_tables.c.table_id).filter(
+            orders_tables.c.order_id.in_([1, 2])
+        )
+        assert uses_index(db, explain(db, query), 'ix_orders_tables_order_id')
+
+    def test_tables_by_type_and_number_of_seats(self, db):
+        query = TableOperation(db=db, user=None)._make_query_by_params(type='vip_room', number_of_seats=6)
+        assert 'ix_tables_type_number_of_seats' in explain(db, query)
+
+
+class TestPartitionPruning:
+    @pytest.fixture(scope='function')
+    def db(self, db_session):
+        create_partitions(db_session, date(2027, 7, 1), date(2027, 9, 1))
+        return db_session
+
+    def test_orders_by_time_range(self, db):
+        query = OrderOperation(db=db, user=None)._make_query_by_params(
+            start_datetime=dt(2027, 8, 3, 8), end_datetime=dt(2027, 8, 3, 17)
+        )
+        plan: str = explain(db, query)
+        assert 'orders_y2027m08' in plan
+        assert not any(name in plan for name in ('orders_y2027m07', 'orders_y2027m09', 'orders_default'))
+
+    def test_orders_by_end(self, db):
+        query = OrderOperation(db=db, user=None)._make_query_by_params(end_datetime=date(2027, 7, 31))
+        plan: str = explain(db, query)
+        assert 'orders_y2027m07' in plan
+        assert not any(name in plan for name in ('orders_y2027m08', 'orders_y2027m09'))
+
+    def test_tables_by_booking_time(self, db):
+        query = TableOperation(db=db, user=None)._make_query_by_params(
+            start_datetime=dt(2027, 8, 3, 8), end_datetime=dt(2027, 8, 3, 17)
+        )
+        plan: str = explain(db, query)
+        assert 'orders_y2027m08' in plan and 'orders_tables_y2027m08' in plan
+        assert not any(name in plan for name in ('y2027m07', 'y2027m09', '_default'))
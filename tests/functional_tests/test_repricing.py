@@ -0,0 +1,66 @@
+from datetime import datetime as dt
+
+from sqlalchemy import insert, select
+
+from src.api.models.order import OrderModel
+from src.api.models.relationships import orders_tables
+from src.utils.repricing.main import reprice_future_orders
+from tests.functional_tests.conftest import api_url, superuser_token
+
+
+def insert_future_orders(db_session):
+    # Tables 1, 2 and 3 cost 1500, 2500 and 3000 per hour.
+    db_session.execute(insert(OrderModel), [
+        {'id': 4, 'start_datetime': dt(2030, 1, 1, 10), 'end_datetime': dt(2030, 1, 1, 11, 59, 59),
+         'status': 'processing', 'cost': 8000, 'user_id': 3},
+        {'id': 5, 'start_datetime': dt(2030, 1, 1, 15), 'end_datetime': dt(2030, 1, 1, 15, 59, 59),
+         'status': 'processing', 'cost': 2500, 'user_id': 3}
+    ])
+    db_session.execute(insert(orders_tables), [
+        {'order_id': 4, 'table_id': 1, 'start_datetime': dt(2030, 1, 1, 10)},
+        {'order_id': 4, 'table_id': 2, 'start_datetime': dt(2030, 1, 1, 10)},
+        {'order_id': 5, 'table_id': 2, 'start_datetime': dt(2030, 1, 1, 15)}
+    ])
+
+
+def find_costs(db_session) -> dict[int, float]:
+    return dict(db_session.execute(select(OrderModel.id, OrderModel.cost).order_by(OrderModel.id)).all())
+
+
+class TestRepricing:
+    def test_reprice_future_orders(self, db_session):
+        insert_future_orders(db_session)
+        costs: dict[int, float] = find_costs(db_session)
+
+        # Costs are up to date.
+        assert reprice_future_orders(db_session) == []
+        assert find_costs(db_session) == costs
+
+        db_session.execute(OrderModel.__table__.update().where(OrderModel.id == 4).values(cost=1))
+        assert reprice_future_orders(db_session, [3]) == []
+        assert reprice_future_orders(db_session, [1]) == [4]
+        assert find_costs(db_session) == costs
+
+    def test_reprice_orders_since(self, db_session):
+        insert_future_orders(db_session)
+        db_session.execute(OrderModel.__table__.update().values(cost=1))
+
+        assert reprice_future_orders(db_session, since=dt(2030, 1, 1, 12)) == [5]
+        assert find_costs(db_session)[4] == 1
+
+    def test_reprice_after_price_change(self, db_session, client):
+        insert_future_orders(db_session)
+        past_costs: dict[int, float] = {id_: cost for id_, cost in find_costs(db_session).items() if id_ < 4}
+
+        response = client.patch(f'{api_url}/tables/2', json={'price_per_hour': 3500}, headers=superuser_token)
+        assert response.status_code == 200
+        assert find_costs(db_session) == {**past_costs, 4: 10000, 5: 3500}
+
+    def test_reprice_after_bulk_price_change(self, db_session, client):
+        insert_future_orders(db_session)
+        past_costs: dict[int, float] = {id_: cost for id_, cost in find_costs(db_session).items() if id_ < 4}
+
+        response = client.patch(f'{api_url}/tables/bulk?ids=1,3', json={'price_per_hour': 2000},
+                                headers=superuser_token)
+        assert response.status_code == 200
+        assert find_costs(db_session) == {**past_costs, 4: 9000, 5: 2500}
@@ -0,0 +1,37 @@
+import gzip
+
+import pytest
+
+from src.utils.compression.main import (ENCODINGS,
+                                        add_encoding_to_etag,
+                                        choose_encoding,
+                                        compress,
+                                        remove_encoding_from_etag)
+
+
+class TestCompression:
+    @pytest.mark.parametrize('accept_encoding, encoding', [
+        (None, None),
+        ('', None),
+        ('gzip', 'gzip'),
+        ('GZIP;q=0.5', 'gzip'),
+        ('deflate, gzip;q=1.0', 'gzip'),
+        ('deflate', None),
+        ('identity', None),
+        ('*', ENCODINGS[0]),
+        # 'q=0' means the encoding is not acceptable.
+        ('gzip;q=0', None),
+        ('gzip; q=0.000, deflate', None),
+        ('br;q=0, gzip', 'gzip'),
+    ])
+    def test_choose_encoding(self, accept_encoding, encoding):
+        assert choose_encoding(accept_encoding) == encoding
+
+    def test_compress(self):
+        body: bytes = b'{"id": 1}\n' * 100
+        assert gzip.decompress(compress(body, 'gzip')) == body
+
+    def test_encoding_in_etag(self):
+        assert add_encoding_to_etag('"abc"', 'gzip') == '"abc-gzip"'
+        assert remove_encoding_from_etag('"abc-gzip"') == '"abc"'
+        assert remove_encoding_from_etag('"abc"') == '"abc"'
@@ -0,0 +1,72 @@
+import pytest
+from aiosmtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+
+from src.config import get_settings
+from src.utils.celery.celery_tasks import send_emails_batch
+from src.utils.composing_email import main
+
+settings = get_settings()
+
+USERS: list[dict] = [{'username': f'user_{number}', 'email': f'user_{number}@example.com'} for number in range(5)]
+
+
+class RetryCalled(Exception):
+    def __init__(self, kwargs: dict):
+        super().__init__()
+        self.kwargs = kwargs
+
+
+class FakeSmtpServer:
+    """Letters to the recipients of 'errors' raise the errors, the other letters are sent."""
+    def __init__(self):
+        self.errors: dict[str, Exception] = {}
+        self.sent_recipients: list[str] = []
+
+
+@pytest.fixture(scope='function')
+def smtp_server(monkeypatch) -> FakeSmtpServer:
+    server = FakeSmtpServer()
+
+    class Session:
+        async def send_message(self, message):
+            if error := server.errors.get(message['To']):
+                raise error
+            server.sent_recipients.append(message['To'])
+
+    class Connection:
+        def __init__(self, config):
+            self.session = Session()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+    def retry(exc, countdown, kwargs):
+        raise RetryCalled(kwargs)
+
+    monkeypatch.setattr(main, 'Connection', Connection)
+    monkeypatch.setattr(send_emails_batch, 'retry', retry)
+    monkeypatch.setattr(settings, 'EMAIL_BATCH_SIZE', 2)
+    return server
+
+
+class TestSendEmailsBatch:
+    def test_refused_letters_are_skipped(self, smtp_server):
+        smtp_server.errors['user_1@example.com'] = SMTPRecipientsRefused([])
+
+        assert send_emails_batch.run(users=USERS, action='confirm_email') == ['user_1@example.com']
+        assert smtp_server.sent_recipients == [user['email'] for user in USERS[:1] + USERS[2:]]
+
+    def test_unsent_users_are_retried_after_disconnect(self, smtp_server):
+        # The connection is lost in the middle of the second chunk.
+        smtp_server.errors['user_3@example.com'] = SMTPServerDisconnected('Connection lost')
+
+        with pytest.raises(RetryCalled) as retry:
+            send_emails_batch.run(users=USERS, action='confirm_email', failed_recipients=['old@example.com'])
+
+        assert smtp_server.sent_recipients == ['user_0@example.com', 'user_1@example.com', 'user_2@example.com']
+        assert retry.value.kwargs == {'users': USERS[3:],
+                                      'action': 'confirm_email',
+                                      'failed_recipients': ['old@example.com']}
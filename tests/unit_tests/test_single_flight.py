@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from src.utils.response_cache.single_flight import SingleFlight
+
+KEY: str = 'GET /orders/?fields=id'
+# Time for the other threads to start waiting for the in-flight computation.
+START_DELAY: float = 0.2
+
+
+def start_leader(single_flight: SingleFlight, executor: ThreadPoolExecutor, compute):
+    """Starts the computation of the key and waits until it is in flight."""
+    leader = executor.submit(single_flight.do, KEY, compute)
+    while KEY not in single_flight._in_flight:
+        time.sleep(0.01)
+    return leader
+
+
+class TestSingleFlight:
+    def test_coalesce_concurrent_computations(self):
+        single_flight = SingleFlight(timeout=10)
+        release = Event()
+        calls: list[int] = []
+
+        def compute() -> bytes:
+            calls.append(1)
+            release.wait()
+            return b'[]'
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = start_leader(single_flight, executor, compute)
+            followers = [executor.submit(single_flight.do, KEY, compute) for _ in range(4)]
+            time.sleep(START_DELAY)
+            release.set()
+
+            assert leader.result() == (b'[]', 'leader')
+            assert [follower.result() for follower in followers] == [(b'[]', 'coalesced')] * 4
+        assert len(calls) == 1
+        assert single_flight._in_flight == {}
+
+    def test_propagate_error_to_waiting_computations(self):
+        single_flight = SingleFlight(timeout=10)
+        release = Event()
+
+        def compute() -> bytes:
+            release.wait()
+            raise ValueError('db is down')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = start_leader(single_flight, executor, compute)
+            follower = executor.submit(single_flight.do, KEY, compute)
+            time.sleep(START_DELAY)
+            release.set()
+
+            for future in (leader, follower):
+                with pytest.raises(ValueError, match='db is down'):
+                    future.result()
+        assert single_flight._in_flight == {}
+
+    def test_compute_after_timeout(self):
+        single_flight = SingleFlight(timeout=0.05)
+        release = Event()
+
+        def compute_slowly() -> bytes:
+            release.wait()
+            return b'leader'
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = start_leader(single_flight, executor, compute_slowly)
+
+            assert single_flight.do(KEY, lambda: b'own') == (b'own', 'timeout')
+            release.set()
+            assert leader.result() == (b'leader', 'leader')
+        assert single_flight._in_flight == {}
+
+    def test_different_keys_are_not_coalesced(self):
+        single_flight = SingleFlight(timeout=10)
+
+        assert single_flight.do('first', lambda: 1) == (1, 'leader')
+        assert single_flight.do('second', lambda: 2) == (2, 'leader')
+        assert single_flight.do('first', lambda: 3) == (3, 'leader')
+        assert single_flight._in_flight == {}